@@ -0,0 +1,26 @@
+"""
+Point d'entrée de l'API HTTP/JSON (application ASGI, voir controllers/api_controller.py).
+
+Usage (depuis la racine du projet, avec un serveur ASGI tel qu'uvicorn) :
+    uvicorn api:app --host 0.0.0.0 --port 8000
+    python api.py
+"""
+import sys
+from controllers.api_controller import ApiController
+
+app = ApiController.from_config()
+
+
+def serve(host="127.0.0.1", port=8000):
+    """
+    Sert l'application avec uvicorn, s'il est installé.
+    """
+    try:
+        import uvicorn
+    except ImportError:
+        raise ValueError("Serving the API needs an ASGI server: pip install uvicorn")
+    uvicorn.run(app, host=host, port=port)
+
+
+if __name__ == "__main__":
+    sys.exit(serve())
@@ -0,0 +1,104 @@
+"""
+Débit du hachage argon2id des mots de passe (models/password_hasher.py) pour plusieurs jeux de paramètres
+(coût en temps, coût en mémoire en Kio, parallélisme) :
+
+- latency_ms : durée d'un hash, c'est-à-dire l'attente d'un utilisateur à la connexion ;
+- serial_per_s : hashes par seconde sur un seul thread ;
+- pool_per_s : hashes par seconde avec un pool de --workers threads (import de collaborateurs) ;
+- per_core_per_s : débit du pool rapporté au nombre de cœurs utilisés.
+
+Usage (depuis la racine du projet) :
+    python -m benchmarks.password_hash_benchmark
+    python -m benchmarks.password_hash_benchmark --params 2,19456,1 --params 3,65536,4 --hashes 32 --json
+
+Sans --params, mesure les paramètres de config ainsi que les profils OWASP et RFC 9106 (mémoire réduite).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import config
+from models import password_hasher
+
+"""
+Profils mesurés par défaut, en plus des paramètres de config :
+(nom, coût en temps, mémoire en Kio, parallélisme).
+"""
+PROFILES = (
+    ("owasp", 2, 19456, 1),
+    ("rfc9106-low-memory", 3, 65536, 4),
+)
+
+
+def parse_params(value):
+    """
+    Lit un jeu de paramètres "temps,mémoire,parallélisme".
+    """
+    try:
+        time_cost, memory_cost, parallelism = (int(part) for part in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected time_cost,memory_cost,parallelism (e.g. 3,65536,4)")
+    return (f"t={time_cost},m={memory_cost},p={parallelism}", time_cost, memory_cost, parallelism)
+
+
+def measure(name, time_cost, memory_cost, parallelism, hashes, workers):
+    """
+    Mesure un jeu de paramètres : `hashes` mots de passe hachés sur un thread, puis dans le pool.
+    """
+    password_hasher.configure(time_cost, memory_cost, parallelism)
+    passwords = [f"password-{i}" for i in range(hashes)]
+    password_hasher.hash_password("warm-up")
+
+    started = time.perf_counter()
+    for password in passwords:
+        password_hasher.hash_password(password)
+    serial = time.perf_counter() - started
+
+    started = time.perf_counter()
+    password_hasher.hash_passwords(passwords, workers=workers)
+    pool = time.perf_counter() - started
+
+    cores = min(workers, os.cpu_count() or 1)
+    return {
+        "params": name,
+        "time_cost": time_cost,
+        "memory_kib": memory_cost,
+        "parallelism": parallelism,
+        "latency_ms": round(serial / hashes * 1000, 1),
+        "serial_per_s": round(hashes / serial, 1),
+        "pool_per_s": round(hashes / pool, 1),
+        "per_core_per_s": round(hashes / pool / cores, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Epic Events password hashing benchmark")
+    parser.add_argument("--params", type=parse_params, action="append", help="time_cost,memory_kib,parallelism")
+    parser.add_argument("--hashes", type=int, default=16, help="Passwords hashed per measurement")
+    parser.add_argument("--workers", type=int, default=config.PASSWORD_HASH_WORKERS)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    current = ("config", config.ARGON2_TIME_COST, config.ARGON2_MEMORY_COST, config.ARGON2_PARALLELISM)
+    params = args.params or [current, *PROFILES]
+    results = [measure(*values, args.hashes, args.workers) for values in params]
+    password_hasher.configure()
+
+    if args.json:
+        print(json.dumps({"workers": args.workers, "cpus": os.cpu_count(), "results": results}, indent=2))
+    else:
+        print(f"{args.workers} worker(s), {os.cpu_count()} CPU(s)")
+        for result in results:
+            print(
+                f"{result['params']:<20} t={result['time_cost']} m={result['memory_kib']:>7} KiB"
+                f" p={result['parallelism']}  {result['latency_ms']:>7.1f} ms/hash"
+                f"  serial {result['serial_per_s']:>6.1f}/s  pool {result['pool_per_s']:>6.1f}/s"
+                f"  per core {result['per_core_per_s']:>6.1f}/s"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
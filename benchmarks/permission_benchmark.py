@@ -0,0 +1,145 @@
+"""
+Débit des contrôles de permissions (controllers/permissions.py), comparé aux contrôles écrits en ligne
+tels qu'ils l'étaient dans le DataController (`user.role.name` puis branches par rôle) :
+
+- role : droit d'un rôle sur une action (menu, création, suppression) ;
+- ownership : droit sur une entité déjà résolue (modification d'un événement par son commercial ou son support) ;
+- authorize : contrôle complet du DataController, rôle lu dans le cache des collaborateurs ;
+- scope : portefeuille d'un commercial, filtré en Python sur les contrats chargés ou par la condition SQL
+  du prédicat (une requête).
+
+Usage (depuis la racine du projet) :
+    python -m benchmarks.permission_benchmark --checks 200000
+    python -m benchmarks.permission_benchmark --json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import Session
+from controllers import permissions
+from controllers.data_controller import DataController
+from controllers.ownership import resolve_event
+from models.base_model import Base
+from models.user_model import User, Role
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from tests.stubs import StubAuthController
+
+
+def seed(engine, contracts):
+    """
+    Crée les tables, trois rôles, un collaborateur par rôle et `contracts` contrats répartis entre deux clients.
+    """
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        roles = {name: Role(name=name, description=f"{name} role") for name in ("Admin", "Commercial", "Support")}
+        users = [
+            User(employee_number=number, full_name=name, email=f"{name.lower()}@example.com", role=roles[name])
+            for number, name in enumerate(roles, start=1)
+        ]
+        db.add_all(users)
+        db.flush()
+        commercial, support = users[1], users[2]
+        db.add_all([Client(full_name="Mine", commercial_id=commercial.id), Client(full_name="Other")])
+        db.flush()
+        db.execute(
+            insert(Contract),
+            [
+                {"client_id": 1 + i % 2, "commercial_id": commercial.id if i % 2 == 0 else None, "total_amount": 10}
+                for i in range(contracts)
+            ],
+        )
+        db.add(Event(contract_id=1, client_id=1, event_name="Launch", support_id=support.id))
+        db.commit()
+
+
+def rate(check, count):
+    """
+    Exécute `check` `count` fois et retourne le nombre de contrôles par seconde.
+    """
+    started = time.perf_counter()
+    for _ in range(count):
+        check()
+    return round(count / (time.perf_counter() - started))
+
+
+def inline_event_check(user, ownership):
+    """
+    Contrôle de modification d'un événement tel qu'il était écrit dans le DataController.
+    """
+    role = user.role.name
+    return role == "Admin" or (role == "Commercial" and ownership.commercial_id == user.id) or (
+        role == "Support" and ownership.support_id == user.id
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Epic Events permission checks benchmark")
+    parser.add_argument("--checks", type=int, default=100000)
+    parser.add_argument("--contracts", type=int, default=20000)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'permissions.db')}")
+        seed(engine, args.contracts)
+        with Session(engine) as db:
+            commercial = db.query(User).filter_by(email="commercial@example.com").one()
+            ownership = resolve_event(db, 1)
+            data_controller = DataController(db, StubAuthController(commercial))
+            data_controller.current_role()
+
+            results.append(
+                {
+                    "check": "role",
+                    "inline_per_s": rate(lambda: commercial.role.name == "Admin", args.checks),
+                    "engine_per_s": rate(lambda: permissions.allows("Commercial", "delete_client"), args.checks),
+                }
+            )
+            results.append(
+                {
+                    "check": "ownership",
+                    "inline_per_s": rate(lambda: inline_event_check(commercial, ownership), args.checks),
+                    "engine_per_s": rate(
+                        lambda: permissions.allows("Commercial", "update_event", commercial.id, ownership), args.checks
+                    ),
+                }
+            )
+            results.append(
+                {
+                    "check": "authorize",
+                    "inline_per_s": None,
+                    "engine_per_s": rate(
+                        lambda: data_controller.authorize("update_event", "denied", ownership), args.checks
+                    ),
+                }
+            )
+
+            scope_runs = 5
+            inline = rate(
+                lambda: sum(1 for contract in db.query(Contract) if contract.commercial_id == commercial.id),
+                scope_runs,
+            )
+            criterion = permissions.rule("Commercial", "view_own_contracts").criterion(Contract, commercial.id)
+            engine_rate = rate(lambda: db.scalar(select(func.count(Contract.id)).where(criterion)), scope_runs)
+            results.append({"check": "scope", "inline_per_s": inline, "engine_per_s": engine_rate})
+        engine.dispose()
+
+    if args.json:
+        print(json.dumps({"checks": args.checks, "contracts": args.contracts, "results": results}, indent=2))
+    else:
+        for result in results:
+            inline = f"{result['inline_per_s']:>12,}" if result["inline_per_s"] is not None else f"{'-':>12}"
+            print(f"{result['check']:<10} inline {inline}/s  engine {result['engine_per_s']:>12,}/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
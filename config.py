@@ -9,10 +9,171 @@ Configuration de la connexion à la DB et connexion à Sentry via la Clé DSN
 
 SENTRY_DSN = os.getenv("SENTRY_DSN")
 
+"""
+Échantillonnage Sentry par environnement : taux d'erreurs envoyées (SENTRY_SAMPLE_RATE) et taux de
+transactions tracées (SENTRY_TRACES_SAMPLE_RATE). Chaque taux peut être forcé par variable d'environnement,
+sinon il dépend de SENTRY_ENVIRONMENT. Les données personnelles sont envoyées sauf si SENTRY_SEND_DEFAULT_PII
+vaut false.
+"""
+SENTRY_ENVIRONMENT = os.getenv("SENTRY_ENVIRONMENT", "production")
+SENTRY_SAMPLE_RATES = {"production": 1.0, "staging": 1.0, "development": 1.0}
+SENTRY_TRACES_SAMPLE_RATES = {"production": 0.05, "staging": 0.25, "development": 1.0}
+SENTRY_SAMPLE_RATE = float(os.getenv("SENTRY_SAMPLE_RATE", SENTRY_SAMPLE_RATES.get(SENTRY_ENVIRONMENT, 1.0)))
+SENTRY_TRACES_SAMPLE_RATE = float(
+    os.getenv("SENTRY_TRACES_SAMPLE_RATE", SENTRY_TRACES_SAMPLE_RATES.get(SENTRY_ENVIRONMENT, 0.0))
+)
+SENTRY_SEND_DEFAULT_PII = os.getenv("SENTRY_SEND_DEFAULT_PII", "true").lower() in ("1", "true", "yes")
+
+"""
+Audit des événements métier : destination ("sentry", "file", "stdout" ou "none"), fichier JSONL du sink "file",
+taille des lots, délai maximal avant envoi d'un lot (secondes) et taille maximale de la file en mémoire.
+Par défaut, les événements vont à Sentry si un DSN est configuré.
+"""
+AUDIT_SINK = os.getenv("AUDIT_SINK", "sentry" if SENTRY_DSN else "none")
+AUDIT_FILE = os.getenv("AUDIT_FILE", "audit.jsonl")
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "100"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+
 DB_USER = os.getenv("DB_USER", "adm_user")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "adm6crm")
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "5432")
 DB_NAME = os.getenv("DB_NAME", "crm_db")
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+DATABASE_URL = os.getenv("DATABASE_URL") or f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+"""
+Pool de connexions : taille, débordement autorisé, vérification des connexions avant usage (pre-ping)
+et recyclage des connexions trop anciennes (en secondes) pour ne jamais réutiliser une connexion coupée.
+"""
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+
+def create_db_engine(url=None):
+    """
+    Crée l'unique moteur SQLAlchemy de l'application avec les réglages de pool ci-dessus.
+    Les réglages de taille du pool ne s'appliquent pas à SQLite (tests et usage local).
+    """
+    from sqlalchemy import create_engine
+
+    url = url or DATABASE_URL
+    if url.startswith("sqlite"):
+        return create_engine(url, pool_pre_ping=DB_POOL_PRE_PING)
+
+    return create_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
+
+"""
+Pilotes asynchrones de l'API HTTP, par pilote synchrone de DATABASE_URL : (pilote SQLAlchemy, paquet à installer).
+asyncpg pour PostgreSQL, aiosqlite pour SQLite (tests et usage local).
+"""
+ASYNC_DRIVERS = {
+    "postgresql": ("postgresql+asyncpg", "asyncpg"),
+    "postgresql+psycopg2": ("postgresql+asyncpg", "asyncpg"),
+    "sqlite": ("sqlite+aiosqlite", "aiosqlite"),
+    "sqlite+pysqlite": ("sqlite+aiosqlite", "aiosqlite"),
+}
+
+
+def create_async_db_engine(url=None):
+    """
+    Crée le moteur SQLAlchemy asynchrone de l'API avec les mêmes réglages de pool que create_db_engine.
+    L'URL synchrone (DATABASE_URL par défaut) est convertie vers le pilote asynchrone correspondant ;
+    lève ValueError si ce pilote (ou greenlet, requis par SQLAlchemy en asynchrone) n'est pas installé.
+    """
+    from importlib.util import find_spec
+    from sqlalchemy.engine import make_url
+
+    url = make_url(url or DATABASE_URL)
+    drivername, package = ASYNC_DRIVERS.get(url.drivername, (url.drivername, None))
+    for module in ("greenlet", package):
+        if module and find_spec(module) is None:
+            raise ValueError(f"The HTTP API needs the {module} package: pip install {module}")
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = url.set(drivername=drivername)
+    if url.get_backend_name() == "sqlite":
+        return create_async_engine(url, pool_pre_ping=DB_POOL_PRE_PING)
+
+    return create_async_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
+
+"""
+Nombre de lignes affichées par page dans les listes (clients, contrats, événements).
+"""
+PAGE_SIZE = int(os.getenv("PAGE_SIZE", "20"))
+
+"""
+Source des totaux de contrats du tableau de bord : "summary" (table de synthèse contract_summaries,
+tenue à jour à chaque modification de contrat) ou "live" (agrégés sur les contrats à chaque affichage).
+"""
+DASHBOARD_SOURCE = os.getenv("DASHBOARD_SOURCE", "summary")
+
+"""
+Cache local des rôles et des collaborateurs (contrôles de permissions) : durée de vie des entrées en secondes
+(0 désactive le cache) et nombre maximal d'entrées par cache, au-delà duquel les moins récemment lues
+sont évincées.
+"""
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "300"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+
+"""
+Jetons d'authentification : durée de vie des jetons de rafraîchissement (jours), taille du cache des jetons
+vérifiés (entrées gardées jusqu'à l'expiration du jeton, 0 désactive le cache) et intervalle en secondes
+entre deux relectures de la liste de révocation par un processus. Le fichier TOKEN_FILE garde le jeton
+de la ligne de commande (un fichier par utilisateur via EPIC_TOKEN_FILE).
+"""
+REFRESH_TOKEN_EXPIRE_DAYS = float(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+TOKEN_REVOCATION_SYNC = float(os.getenv("TOKEN_REVOCATION_SYNC", "5"))
+TOKEN_FILE = os.getenv("EPIC_TOKEN_FILE", "token.txt")
+
+"""
+Hachage des mots de passe (argon2id) : coût en temps (passes), coût en mémoire (Kio) et parallélisme (voies),
+à ajuster par déploiement selon benchmarks/password_hash_benchmark.py. Les hashes calculés avec d'autres
+paramètres sont recalculés à la connexion suivante. PASSWORD_HASH_WORKERS threads hachent en parallèle
+les mots de passe d'un import de collaborateurs (nombre de cœurs par défaut).
+"""
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+
+"""
+Journal des requêtes lentes (désactivé par défaut) : toute requête plus longue que SLOW_QUERY_THRESHOLD_MS
+millisecondes est écrite dans le fichier JSONL SLOW_QUERY_FILE, avec ses paramètres (sauf si
+SLOW_QUERY_LOG_PARAMETERS vaut false), l'action en cours et son plan d'exécution. Le fichier tourne au-delà de
+SLOW_QUERY_MAX_BYTES octets (SLOW_QUERY_BACKUP_COUNT anciens fichiers gardés) ; le plan d'une même requête
+(même empreinte) est recalculé au plus toutes les SLOW_QUERY_EXPLAIN_INTERVAL secondes.
+"""
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "0"))
+SLOW_QUERY_FILE = os.getenv("SLOW_QUERY_FILE", "slow_queries.jsonl")
+SLOW_QUERY_MAX_BYTES = int(os.getenv("SLOW_QUERY_MAX_BYTES", str(10 * 1024 * 1024)))
+SLOW_QUERY_BACKUP_COUNT = int(os.getenv("SLOW_QUERY_BACKUP_COUNT", "5"))
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "300"))
+SLOW_QUERY_LOG_PARAMETERS = os.getenv("SLOW_QUERY_LOG_PARAMETERS", "true").lower() in ("1", "true", "yes")
+
+"""
+Mode debug : active les vérifications supplémentaires (chargements paresseux imprévus, etc.).
+"""
+DEBUG = os.getenv("EPIC_DEBUG", "false").lower() in ("1", "true", "yes")
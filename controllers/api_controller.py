@@ -0,0 +1,332 @@
+import asyncio
+import json
+import re
+from dataclasses import dataclass
+from urllib.parse import parse_qsl
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from controllers import tokens
+from controllers.command_controller import ACTIONS, CommandController, CommandError
+from controllers.export_controller import ExportController
+from models import password_hasher
+from models.user_model import User
+import config
+
+"""
+Routes de l'API : `/<entité>` (GET liste, POST création), `/<entité>/<id>` (GET, PATCH, DELETE)
+et `/<entité>/<id>/<action>` (POST, signature d'un contrat). Les actions sont celles de la ligne de commande.
+"""
+ROUTE = re.compile(r"^/(?P<entity>[a-z_]+)(?:/(?P<id>\d+)(?:/(?P<action>[a-z_]+))?)?/?$")
+METHODS = {
+    ("GET", False): "list",
+    ("POST", False): "create",
+    ("GET", True): "show",
+    ("PATCH", True): "update",
+    ("DELETE", True): "delete",
+}
+
+"""
+Routes d'authentification (POST) et méthode qui les traite : connexion, rafraîchissement des jetons, déconnexion.
+"""
+AUTH_ROUTES = {"/auth/login": "login", "/auth/refresh": "refresh", "/auth/logout": "logout"}
+
+"""
+Code HTTP de chaque cause d'échec d'une opération ; toute autre erreur de saisie vaut 400.
+"""
+ERROR_STATUSES = ((PermissionError, 403), (LookupError, 404))
+
+"""
+Nombre maximal de lignes d'une liste (paramètre `limit`, PAGE_SIZE par défaut) et taille maximale
+d'un corps de requête (octets).
+"""
+MAX_LIST_LIMIT = 1000
+MAX_BODY_SIZE = 1024 * 1024
+
+
+class HTTPError(Exception):
+    """
+    Erreur renvoyée au client : code HTTP et message.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class RequestAuth:
+    """
+    Authentification d'une requête : l'utilisateur du bearer token, tel qu'attendu par le DataController.
+    """
+
+    current_user: User
+
+
+class ApiController:
+    """
+    Application ASGI exposant les opérations du CRM en HTTP/JSON (`uvicorn api:app`).
+    Chaque requête ouvre sa propre session asynchrone : les E/S de la base n'occupent pas la boucle d'événements
+    et un même processus sert de nombreuses requêtes simultanées. Les opérations sont celles du CommandController
+    (mêmes permissions et règles de gestion), exécutées dans la session par run_sync ; les mots de passe sont
+    hachés dans un thread avant l'opération (voir hash_password). L'authentification repose sur les jetons
+    de controllers/tokens.py (en-tête Bearer).
+    """
+
+    def __init__(self, engine):
+        """
+        Initialise l'application avec le moteur asynchrone (voir config.create_async_db_engine),
+        libéré à l'arrêt du serveur.
+        """
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        self.engine = engine
+        self.session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    @classmethod
+    def from_config(cls, url=None):
+        """
+        Crée l'application sur la base configurée (DATABASE_URL, avec le pilote asynchrone correspondant).
+        """
+        return cls(config.create_async_db_engine(url))
+
+    async def __call__(self, scope, receive, send):
+        """
+        Point d'entrée ASGI : cycle de vie du serveur et requêtes HTTP.
+        """
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+        elif scope["type"] == "http":
+            status, payload = await self.respond(scope, receive)
+            await self.send_json(send, status, payload)
+
+    async def lifespan(self, receive, send):
+        """
+        Répond aux messages de démarrage et d'arrêt ; le pool de connexions est libéré à l'arrêt.
+        """
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def respond(self, scope, receive):
+        """
+        Traite une requête et retourne son code HTTP et son contenu JSON.
+        """
+        try:
+            method, path = scope["method"], scope["path"]
+            if method == "POST" and path.rstrip("/") in AUTH_ROUTES:
+                handler = getattr(self, AUTH_ROUTES[path.rstrip("/")])
+                return 200, await handler(scope, await self.read_json(receive))
+
+            entity, action, entity_id = self.route(method, path)
+            query = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+            values = await self.read_json(receive) if method in ("POST", "PATCH") else {}
+            async with self.session_factory() as session:
+                user = await self.authenticate(session, scope)
+                if action == "list":
+                    return 200, {"items": await self.list_records(session, user, entity, query)}
+                result = await self.run(session, user, entity, action, entity_id, values)
+                return (201 if action == "create" else 200), result
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+
+    def route(self, method, path):
+        """
+        Retourne (entité, action, identifiant) de la requête ; lève HTTPError (404 ou 405) sinon.
+        """
+        match = ROUTE.match(path)
+        if not match or match["entity"] not in ACTIONS:
+            raise HTTPError(404, f"Unknown path {path}.")
+        entity_id = int(match["id"]) if match["id"] else None
+        if match["action"]:
+            action = match["action"] if method == "POST" else None
+        else:
+            action = METHODS.get((method, entity_id is not None))
+        if action not in ACTIONS[match["entity"]]:
+            raise HTTPError(405, f"{method} is not allowed on {path}.")
+        return match["entity"], action, entity_id
+
+    async def read_json(self, receive):
+        """
+        Lit le corps de la requête et retourne l'objet JSON qu'il contient (un objet vide si le corps est vide).
+        """
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if len(body) > MAX_BODY_SIZE:
+                raise HTTPError(413, "Request body too large.")
+            if not message.get("more_body"):
+                break
+        if not body:
+            return {}
+        try:
+            values = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise HTTPError(400, "Invalid JSON body.")
+        if not isinstance(values, dict):
+            raise HTTPError(400, "The request body must be a JSON object.")
+        return values
+
+    async def login(self, scope, credentials):
+        """
+        Vérifie l'email et le mot de passe et retourne un jeton d'accès et un jeton de rafraîchissement.
+        La vérification (et le recalcul d'un hash aux anciens paramètres) est faite dans un thread
+        pour ne pas bloquer les autres requêtes.
+        """
+        email, password = credentials.get("email"), credentials.get("password")
+        if not isinstance(email, str) or not isinstance(password, str):
+            raise HTTPError(400, "An email and a password are required.")
+
+        async with self.session_factory() as session:
+            user = await session.scalar(select(User).where(User.email == email))
+            if not user or not await asyncio.to_thread(user.check_password, password):
+                raise HTTPError(401, "Authentication failed.")
+            if user.password_needs_rehash():
+                user.password_hash = await asyncio.to_thread(password_hasher.hash_password, password)
+                await session.commit()
+        return tokens.issue(user.email).as_dict()
+
+    async def refresh(self, scope, values):
+        """
+        Échange un jeton de rafraîchissement contre une nouvelle paire de jetons (l'ancien est révoqué).
+        """
+        refresh_token = values.get("refresh_token")
+        if not isinstance(refresh_token, str):
+            raise HTTPError(400, "A refresh_token is required.")
+        async with self.session_factory() as session:
+            pair = await self.verify(session, lambda db: tokens.refresh(db, refresh_token))
+            await session.commit()
+        return pair.as_dict()
+
+    async def logout(self, scope, values):
+        """
+        Révoque le bearer token de la requête et, s'il est fourni, le jeton de rafraîchissement du client.
+        """
+        token = self.bearer_token(scope)
+        refresh_token = values.get("refresh_token")
+
+        def revoke(db):
+            tokens.revoke(db, tokens.verify(db, token))
+            if isinstance(refresh_token, str):
+                tokens.revoke(db, tokens.verify(db, refresh_token, tokens.REFRESH))
+
+        async with self.session_factory() as session:
+            await self.verify(session, revoke)
+            await session.commit()
+        return {"revoked": True}
+
+    @staticmethod
+    def bearer_token(scope):
+        """
+        Retourne le jeton de l'en-tête `Authorization: Bearer` ; lève HTTPError (401) s'il est absent.
+        """
+        headers = dict(scope.get("headers", ()))
+        scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+        if scheme.lower() != "bearer" or not token.strip():
+            raise HTTPError(401, "A bearer token is required.")
+        return token.strip()
+
+    @staticmethod
+    async def verify(session, operation):
+        """
+        Exécute une opération sur les jetons dans la session ; un jeton refusé lève HTTPError (401).
+        """
+        try:
+            return await session.run_sync(operation)
+        except tokens.TokenError as e:
+            raise HTTPError(401, str(e))
+
+    async def authenticate(self, session, scope):
+        """
+        Retourne l'utilisateur du bearer token de la requête ; lève HTTPError (401) si le token est absent,
+        invalide, expiré ou révoqué, ou si l'utilisateur n'existe plus. Un token déjà vérifié par le processus
+        ne coûte qu'une recherche dans le cache des jetons (voir controllers/tokens.py).
+        """
+        token = self.bearer_token(scope)
+        principal = await self.verify(session, lambda db: tokens.verify(db, token))
+        user = await session.scalar(select(User).where(User.email == principal.email))
+        if user is None:
+            raise HTTPError(401, "Invalid token. Please log in again.")
+        return user
+
+    async def list_records(self, session, user, entity, query):
+        """
+        Retourne les enregistrements d'une liste (paramètres `view` et `limit`).
+        """
+        try:
+            limit = int(query.get("limit") or config.PAGE_SIZE)
+        except ValueError:
+            raise HTTPError(400, "'limit' must be an integer.")
+        if not 0 < limit <= MAX_LIST_LIMIT:
+            raise HTTPError(400, f"'limit' must be between 1 and {MAX_LIST_LIMIT}.")
+
+        def operation(db):
+            command_controller = CommandController(db, RequestAuth(user))
+            records = command_controller.list_records(entity, query.get("view") or None, limit)
+            return [command_controller.record(instance) for instance in records]
+
+        return await self.run_sync(session, operation)
+
+    async def run(self, session, user, entity, action, entity_id, values):
+        """
+        Exécute une opération dans la transaction de la requête, validée si elle réussit.
+        """
+
+        values = await self.hash_password(entity, values)
+
+        def operation(db):
+            return CommandController(db, RequestAuth(user)).run(entity, action, entity_id, values).as_dict()
+
+        result = await self.run_sync(session, operation)
+        if action != "show":
+            try:
+                await session.commit()
+            except IntegrityError as e:
+                await session.rollback()
+                raise HTTPError(409, str(e.orig))
+        return result
+
+    @staticmethod
+    async def hash_password(entity, values):
+        """
+        Hache dans un thread le mot de passe d'un collaborateur créé ou modifié : le hachage (argon2, coûteux
+        par construction) ne bloque pas la boucle d'événements, et run_sync reçoit le hash déjà calculé.
+        """
+        password = values.get("password")
+        if entity != "collaborators" or not isinstance(password, str) or not password:
+            return values
+        password_hash = await asyncio.to_thread(password_hasher.hash_password, password)
+        return {**values, "password": password_hasher.PasswordHash(password_hash)}
+
+    @staticmethod
+    async def run_sync(session, operation):
+        """
+        Exécute le code synchrone des contrôleurs dans la session asynchrone et traduit leurs erreurs
+        en erreurs HTTP ; la transaction est annulée en cas d'échec.
+        """
+        try:
+            return await session.run_sync(operation)
+        except CommandError as e:
+            await session.rollback()
+            status = next((code for error, code in ERROR_STATUSES if isinstance(e.__cause__, error)), 400)
+            raise HTTPError(status, str(e))
+        except IntegrityError as e:
+            await session.rollback()
+            raise HTTPError(409, str(e.orig))
+
+    @staticmethod
+    async def send_json(send, status, payload):
+        """
+        Envoie la réponse JSON (dates au format ISO, montants en texte comme dans les exports).
+        """
+        body = json.dumps(payload, default=ExportController.serialize).encode("utf-8")
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        if status == 401:
+            headers.append((b"www-authenticate", b"Bearer"))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
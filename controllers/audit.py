@@ -0,0 +1,239 @@
+import atexit
+import datetime
+import json
+import queue
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+import config
+
+
+@dataclass
+class AuditEvent:
+    """
+    Événement métier à tracer (signature d'un contrat, création d'un collaborateur, etc.).
+    """
+
+    action: str
+    message: str
+    actor: str = None
+    entity: str = None
+    entity_id: int = None
+    level: str = "info"
+    timestamp: datetime.datetime = field(default_factory=lambda: datetime.datetime.now(datetime.timezone.utc))
+
+    def as_dict(self):
+        """
+        Représentation sérialisable de l'événement (horodatage ISO 8601).
+        """
+        data = asdict(self)
+        data["timestamp"] = self.timestamp.isoformat()
+        return data
+
+
+class SentrySink:
+    """
+    Envoie chaque événement à Sentry (capture_message), avec l'action, l'entité et l'auteur en tags.
+    """
+
+    def emit(self, events):
+        import sentry_sdk
+
+        for audit_event in events:
+            sentry_sdk.capture_message(
+                audit_event.message,
+                level=audit_event.level,
+                tags={
+                    "audit.action": audit_event.action,
+                    "audit.entity": audit_event.entity,
+                    "audit.actor": audit_event.actor,
+                },
+            )
+
+
+class StreamSink:
+    """
+    Écrit les événements sur un flux texte, une ligne JSON par événement (stdout par défaut).
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def emit(self, events):
+        self.stream.write("".join(json.dumps(audit_event.as_dict()) + "\n" for audit_event in events))
+        self.stream.flush()
+
+
+class FileSink:
+    """
+    Ajoute les événements à un fichier JSONL local (remplace Sentry hors connexion).
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def emit(self, events):
+        with open(self.path, "a", encoding="utf-8") as stream:
+            StreamSink(stream).emit(events)
+
+
+class AuditQueue:
+    """
+    File d'attente des événements d'audit, vidée par lots par un thread en arrière-plan :
+    l'émission d'un événement ne fait qu'une insertion en mémoire sur le chemin de la requête.
+    Si la file est pleine, l'événement est abandonné et comptabilisé dans `dropped`.
+    """
+
+    def __init__(self, sink, batch_size=100, flush_interval=1.0, max_size=10000):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_size)
+        self.dropped = 0
+        self.errors = 0
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def emit(self, event):
+        """
+        Ajoute un événement à la file sans bloquer ; le thread d'envoi est démarré au premier événement.
+        """
+        self._start()
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """
+        Attend que tous les événements en file aient été transmis au sink.
+        """
+        if self._worker is not None:
+            self.queue.join()
+
+    def close(self):
+        """
+        Transmet les événements restants puis arrête le thread d'envoi.
+        """
+        if self._worker is None:
+            return
+        self.flush()
+        self.queue.put(None)
+        self._worker.join()
+        self._worker = None
+
+    def _start(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="audit-queue", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        """
+        Boucle du thread d'envoi : attend un premier événement, complète le lot sans attendre
+        au-delà de `flush_interval`, puis l'envoie au sink en une fois.
+        """
+        while True:
+            first = self.queue.get()
+            if first is None:
+                self.queue.task_done()
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    event = self.queue.get(timeout=timeout) if timeout > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if event is None:
+                    stop = True
+                    break
+                batch.append(event)
+
+            try:
+                self.sink.emit(batch)
+            except Exception:
+                self.errors += 1
+            finally:
+                for _ in range(len(batch) + 1 if stop else len(batch)):
+                    self.queue.task_done()
+            if stop:
+                return
+
+
+def create_sink(name, path=None):
+    """
+    Crée le sink configuré : "sentry", "file" (fichier JSONL), "stdout" ou "none" (aucun envoi).
+    """
+    if name == "sentry":
+        return SentrySink()
+    if name == "file":
+        return FileSink(path or config.AUDIT_FILE)
+    if name == "stdout":
+        return StreamSink()
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown audit sink '{name}'. Expected one of: sentry, file, stdout, none")
+
+
+_audit_queue = None
+
+
+def get_audit_queue():
+    """
+    Retourne la file d'audit de l'application, créée à la première utilisation selon la configuration
+    (None si l'audit est désactivé). Les événements restants sont transmis à la sortie du programme.
+    """
+    global _audit_queue
+    if _audit_queue is None:
+        sink = create_sink(config.AUDIT_SINK)
+        if sink is None:
+            return None
+        _audit_queue = AuditQueue(
+            sink,
+            batch_size=config.AUDIT_BATCH_SIZE,
+            flush_interval=config.AUDIT_FLUSH_INTERVAL,
+            max_size=config.AUDIT_QUEUE_SIZE,
+        )
+        atexit.register(_audit_queue.close)
+    return _audit_queue
+
+
+def record(db: Session, action, message, actor=None, entity=None, entity_id=None, level="info"):
+    """
+    Trace un événement métier. L'événement est mis en attente dans la session et n'est émis
+    (de façon asynchrone) qu'une fois la transaction validée : une opération annulée n'est pas tracée.
+    """
+    if not db.in_transaction():
+        db.begin()
+    db.info.setdefault("audit_events", []).append(
+        AuditEvent(action=action, message=message, actor=actor, entity=entity, entity_id=entity_id, level=level)
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def emit_committed_events(session):
+    """
+    Transmet à la file d'audit les événements des opérations validées.
+    """
+    events = session.info.pop("audit_events", None)
+    audit_queue = get_audit_queue() if events else None
+    if audit_queue is not None:
+        for audit_event in events:
+            audit_queue.emit(audit_event)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def discard_rolled_back_events(session, previous_transaction):
+    """
+    Abandonne les événements des opérations annulées (annulation de la transaction principale).
+    """
+    if not previous_transaction.nested:
+        session.info.pop("audit_events", None)
@@ -0,0 +1,97 @@
+import datetime
+import decimal
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.orm import Session
+from models.audit_log_model import AuditLog
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User
+
+"""
+Entités journalisées (modèle -> nom d'entité) et champs dont la valeur n'est jamais recopiée dans le journal.
+"""
+AUDITED = {Client: "clients", Contract: "contracts", Event: "events", User: "users"}
+MASKED = {"password_hash"}
+
+
+def set_actor(db: Session, user):
+    """
+    Déclare l'utilisateur à l'origine des modifications de la session : seules les sessions
+    ayant un acteur sont journalisées.
+    """
+    db.info["audit_actor"] = (user.id, user.email) if user is not None else None
+
+
+@event.listens_for(Session, "after_flush")
+def write_audit_log(session, flush_context):
+    """
+    Ajoute au journal une ligne par entité créée, modifiée ou supprimée pendant le flush, avec le détail
+    des champs modifiés. Les lignes sont insérées en une seule fois (executemany), dans la même transaction.
+    """
+    actor = session.info.get("audit_actor")
+    if actor is None:
+        return
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    rows = []
+    for action, instances in (("create", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for instance in instances:
+            entity = AUDITED.get(type(instance))
+            if entity is None:
+                continue
+            changes = diff(instance, action)
+            if not changes:
+                continue
+            rows.append(
+                {
+                    "created_at": now,
+                    "actor_id": actor[0],
+                    "actor_email": actor[1],
+                    "action": action,
+                    "entity": entity,
+                    "entity_id": instance.id,
+                    "changes": changes,
+                }
+            )
+
+    if rows:
+        session.connection().execute(insert(AuditLog.__table__), rows)
+
+
+def diff(instance, action):
+    """
+    Retourne les champs modifiés de l'instance : {"champ": [ancienne valeur, nouvelle valeur]}.
+    Une création n'a pas d'ancienne valeur, une suppression pas de nouvelle.
+    """
+    state = inspect(instance)
+    changes = {}
+    for attribute in state.mapper.column_attrs:
+        key = attribute.key
+        if action == "create":
+            old, new = None, state.dict.get(key)
+        elif action == "delete":
+            old, new = state.dict.get(key), None
+        else:
+            history = state.attrs[key].history
+            if not history.added and not history.deleted:
+                continue
+            old = history.deleted[0] if history.deleted else None
+            new = history.added[0] if history.added else None
+        if old is None and new is None:
+            continue
+        if key in MASKED:
+            old, new = ("***" if old is not None else None), ("***" if new is not None else None)
+        changes[key] = [serialize(old), serialize(new)]
+    return changes
+
+
+def serialize(value):
+    """
+    Convertit une valeur en type JSON (dates au format ISO 8601, montants décimaux en texte).
+    """
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
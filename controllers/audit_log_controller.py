@@ -0,0 +1,56 @@
+import datetime
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from controllers import permissions
+from models.audit_log_model import AuditLog
+
+
+class AuditLogController:
+    """
+    Recherche dans le journal d'audit (Admins uniquement), du plus récent au plus ancien.
+    Chaque critère correspond à un index : période, entité (et identifiant), ou acteur.
+    """
+
+    DEFAULT_LIMIT = 100
+
+    def __init__(self, db: Session, user):
+        """
+        Initialise le contrôleur avec la session et l'utilisateur connecté.
+        """
+        self.db = db
+        self.user = user
+
+    def search(self, entity=None, entity_id=None, actor=None, action=None, since=None, until=None, limit=None):
+        """
+        Construit la recherche ; `since` et `until` sont des dates incluses. Lève PermissionError si
+        l'utilisateur n'est pas Admin.
+        """
+        role = self.user.role.name if self.user and self.user.role else None
+        permissions.require(role, "read_audit_log", "Permission denied. Only Admins can read the audit log.")
+
+        query = select(AuditLog)
+        if entity is not None:
+            query = query.where(AuditLog.entity == entity)
+        if entity_id is not None:
+            query = query.where(AuditLog.entity_id == entity_id)
+        if actor is not None:
+            query = query.where(AuditLog.actor_email == actor)
+        if action is not None:
+            query = query.where(AuditLog.action == action)
+        if since is not None:
+            start = datetime.datetime.combine(since, datetime.time.min, datetime.timezone.utc)
+            query = query.where(AuditLog.created_at >= start)
+        if until is not None:
+            next_day = datetime.datetime.combine(
+                until + datetime.timedelta(days=1), datetime.time.min, datetime.timezone.utc
+            )
+            query = query.where(AuditLog.created_at < next_day)
+
+        query = query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        return query.limit(limit or self.DEFAULT_LIMIT)
+
+    def entries(self, query):
+        """
+        Exécute la recherche et retourne les lignes du journal.
+        """
+        return self.db.scalars(query).all()
@@ -1,16 +1,21 @@
-import jwt
 import datetime
-from models.user_model import User, Role
+from models.user_model import User
 from sqlalchemy.orm import Session
 from views.auth_view import AuthView
+from controllers.auth_session import AuthSession
+from controllers import principal_cache, tokens
 import config
 from rich.console import Console
 import os
 
 
-SECRET_KEY = "epic-events-secret-key"
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 45
+def create_access_token(data: dict, expires_delta: datetime.timedelta = None):
+    """
+    Crée un jeton d'accès JWT avec une durée d'expiration optionnelle (15 minutes par défaut).
+    Schéma commun au menu interactif, à la ligne de commande et à l'API HTTP (voir controllers/tokens.py).
+    """
+    expires_in = expires_delta.total_seconds() if expires_delta else None
+    return tokens.encode(data, tokens.ACCESS, expires_in)
 
 
 class AuthController:
@@ -18,22 +23,32 @@ class AuthController:
     Gère l'authentification des utilisateurs et la gestion des rôles.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, session_factory=None):
         """
         Initialise le contrôleur d'authentification avec la base de données et la vue associée.
+        La fabrique de sessions (sessionmaker), si elle est fournie, est transmise au contrôleur de données
+        pour qu'il ouvre une session courte par action.
         """
         self.db = db
+        self.session_factory = session_factory
         self.auth_view = AuthView()
         self.console = Console()
         self.token = None
         self.current_user = None
+        self.auth_session = AuthSession(config.TOKEN_FILE)
+
+    @property
+    def principal(self):
+        """
+        Identité de l'utilisateur connecté, mise en cache par la session authentifiée (None si déconnecté).
+        """
+        return self.auth_session.principal
 
     def start(self):
         """
         Démarre le processus d'authentification avec un menu principal.
+        Le schéma et les rôles par défaut sont préparés au lancement (voir controllers/startup.py).
         """
-        self.create_default_roles()
-
         while True:
             choice = self.auth_view.display_menu()
 
@@ -51,84 +66,55 @@ class AuthController:
             else:
                 self.console.print("[bold red]Invalid choice. Please try again.[/bold red]")
 
-    def create_default_roles(self):
-        """
-        Crée les rôles par défaut dans la base de données s'ils n'existent pas.
-        """
-        roles = ["Admin", "Commercial", "Support"]
-        for role_name in roles:
-            role = self.db.query(Role).filter(Role.name == role_name).first()
-            if not role:
-                role = Role(name=role_name, description=f"{role_name} role")
-                self.db.add(role)
-                self.db.commit()
-                self.console.print(f"[bold green]Role '{role_name}' was created/verified successfully.[/bold green]")
-            else:
-                self.console.print(f"[bold yellow]Everything is ok ![/bold yellow]")
-
     def create_access_token(self, data: dict, expires_delta: datetime.timedelta = None):
         """
         Crée un jeton d'accès JWT avec une durée d'expiration optionnelle.
         """
-        to_encode = data.copy()
-        if expires_delta:
-            expire = datetime.datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.datetime.utcnow() + datetime.timedelta(minutes=15)
-
-        # self.console.print(f"[bold yellow]Token will expire at: {expire}[/bold yellow]")
-
-        to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-        return encoded_jwt
+        return create_access_token(data, expires_delta)
 
     def authenticate_user(self, email: str, password: str):
         """
-        Authentifie un utilisateur en vérifiant son email et son mot de passe.
+        Authentifie un utilisateur en vérifiant son email et son mot de passe. Un hash calculé avec d'anciens
+        paramètres argon2 est recalculé avec les paramètres courants (le mot de passe en clair n'est connu qu'ici).
         """
         user = self.db.query(User).filter(User.email == email).first()
-        if user and user.check_password(password):
-            return user
-        return None
+        if not user or not user.check_password(password):
+            return None
+        if user.password_needs_rehash():
+            user.set_password(password)
+            self.db.commit()
+        return user
 
     def verify_token(self, token: str):
         """
         Vérifie la validité duu token JWT.
         """
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            email = payload.get("sub")
-            if email is None:
-                return None
-            return email
-        except jwt.ExpiredSignatureError:
-            self.console.print("[bold red]Token expired. You need to log in again.[/bold red]")
-            self.delete_token()
-            return None
-        except jwt.InvalidTokenError:
-            self.console.print("[bold red]Invalid token. Please log in again.[/bold red]")
+            return tokens.verify(self.db, token).email
+        except tokens.TokenError as e:
+            self.console.print(f"[bold red]{e}[/bold red]")
             self.delete_token()
             return None
 
     def get_user_permissions(self, email: str):
         """
-        Récupère le rôle de l'utilisateur à partir de son email.
+        Récupère le rôle de l'utilisateur à partir de son email (lu dans le cache des collaborateurs).
         """
-        user = self.db.query(User).filter(User.email == email).first()
-        if user:
-            return user.role.name
-        return None
+        principal = principal_cache.principal(self.db, email)
+        return principal.role if principal else None
 
-    def signup_user(self, employee_number, full_name, email, department, role_name, password):
+    def signup_user(self, employee_number, full_name, email, department, role_name, password, db: Session = None):
         """
-        Crée un nouvel utilisateur avec les informations fournies.
+        Crée un nouvel utilisateur avec les informations fournies
+        (dans la session fournie, ou à défaut dans celle du contrôleur).
         """
-        existing_user = self.db.query(User).filter(User.email == email).first()
+        db = db or self.db
+        existing_user = db.query(User).filter(User.email == email).first()
         if existing_user:
             self.console.print(f"[bold red]User with email {email} already exists.[/bold red]")
             return None
 
-        role = self.db.query(Role).filter(Role.name == role_name).first()
+        role = principal_cache.get_role(db, role_name)
         if not role:
             self.console.print("[bold red]Role not found.[/bold red]")
             return None
@@ -137,24 +123,24 @@ class AuthController:
             employee_number=employee_number, full_name=full_name, email=email, department=department, role=role
         )
         new_user.set_password(password)
-        self.db.add(new_user)
-        self.db.commit()
+        db.add(new_user)
+        db.commit()
         self.console.print(f"[bold green]User '{full_name}' created successfully.[/bold green]")
 
         return new_user
 
     def login_user(self, email: str, password: str):
         """
-        Authentifie un utilisateur et génère un jeton d'accès en cas de succès (dans un fichier texte en local).
+        Authentifie un utilisateur et génère un jeton d'accès en cas de succès (dans le fichier config.TOKEN_FILE).
         """
         user = self.authenticate_user(email, password)
         if user:
-            access_token_expires = datetime.timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-            access_token = self.create_access_token(data={"sub": user.email}, expires_delta=access_token_expires)
-            with open("token.txt", "w") as token_file:
+            access_token = tokens.issue(user.email).access_token
+            with open(self.auth_session.token_path, "w") as token_file:
                 token_file.write(access_token)
             self.current_user = user
             self.token = access_token
+            self.auth_session.check()
             self.console.print("[bold green]Login successful[/bold green]")
             return access_token
         else:
@@ -164,28 +150,57 @@ class AuthController:
     def is_authenticated(self):
         """
         Vérifie si un utilisateur est authentifié en validant son token.
+        Le token n'est relu et redécodé que si le fichier a changé, sinon seule l'expiration est contrôlée,
+        ainsi que la liste de révocation (copie locale, voir controllers/tokens.py).
         """
-        try:
-            with open("token.txt", "r") as token_file:
-                self.token = token_file.read().strip()
-                self.console.print("[bold cyan]Token loaded from file, verifying...[/bold cyan]")
-        except FileNotFoundError:
-            self.console.print("[bold red]Token file not found.[/bold red]")
+        status = self.auth_session.check()
+        if self.auth_session.reloaded:
+            self.console.print("[bold cyan]Token loaded from file, verifying...[/bold cyan]")
+
+        if status == AuthSession.VALID and self.is_revoked(self.auth_session.principal):
+            self.console.print("[bold red]Token revoked. Please log in again.[/bold red]")
+            self.delete_token()
             return False
 
-        if self.token:
-            email = self.verify_token(self.token)
-            if email:
+        if status == AuthSession.VALID:
+            self.token = self.auth_session.token
+            if self.auth_session.reloaded:
                 self.console.print("[bold green]User authenticated.[/bold green]")
-                return True
-            else:
-                # self.console.print("[bold red]Token expired or invalid.[/bold red]")
-                self.delete_token()
-                return False
-        else:
+            return True
+
+        if status == AuthSession.MISSING:
+            self.console.print("[bold red]Token file not found.[/bold red]")
+        elif status == AuthSession.EMPTY:
             self.console.print("[bold red]No token found.[/bold red]")
+        elif status == AuthSession.EXPIRED:
+            self.console.print("[bold red]Token expired. You need to log in again.[/bold red]")
+            self.delete_token()
+        else:
+            self.console.print("[bold red]Invalid token. Please log in again.[/bold red]")
+            self.delete_token()
         return False
 
+    def is_revoked(self, principal):
+        """
+        Indique si le token a été révoqué ; la liste de révocation est lue dans une session courte
+        si une fabrique de sessions est fournie, pour ne garder aucune connexion ouverte dans le menu.
+        """
+        if self.session_factory is None:
+            return tokens.is_revoked(self.db, principal)
+        with self.session_factory() as db:
+            return tokens.is_revoked(db, principal)
+
+    def logout(self):
+        """
+        Déconnecte l'utilisateur : son token est révoqué (refusé partout, même copié ailleurs)
+        puis le fichier token est supprimé.
+        """
+        if self.auth_session.check() == AuthSession.VALID:
+            tokens.revoke(self.db, self.auth_session.principal)
+            self.db.commit()
+        self.delete_token()
+        self.current_user = None
+
     def access_data_menu(self):
         """
         Accède au menu de gestion des données après authentification.
@@ -196,15 +211,29 @@ class AuthController:
 
         from controllers.data_controller import DataController
 
-        data_controller = DataController(self.db, self)
+        self.release_session()
+        data_controller = DataController(self.db, self, session_factory=self.session_factory)
         data_controller.start()
 
+    def release_session(self):
+        """
+        Libère la session d'authentification avant d'entrer dans le menu des données :
+        l'utilisateur connecté (et son rôle) reste lisible, mais aucune connexion n'est gardée ouverte
+        pendant que les actions utilisent leurs propres sessions.
+        """
+        if self.session_factory is None:
+            return
+        if self.current_user is not None:
+            self.db.refresh(self.current_user, ["role"])
+        self.db.close()
+
     def delete_token(self):
         """
         Supprime le fichier contenant le token d'accès.
         """
+        self.auth_session.clear()
         try:
-            os.remove("token.txt")
+            os.remove(self.auth_session.token_path)
             self.console.print("[bold yellow]Token deleted.[/bold yellow]")
         except FileNotFoundError:
             pass
@@ -0,0 +1,82 @@
+import os
+import time
+from controllers import tokens
+
+
+class AuthSession:
+    """
+    Session authentifiée en mémoire : le token est vérifié une seule fois et ses claims sont gardés en cache.
+    Les vérifications suivantes se limitent à une comparaison d'horloge avec l'expiration,
+    le fichier n'étant relu (et le JWT redécodé) que si sa date de modification change.
+    """
+
+    VALID = "valid"
+    MISSING = "missing"
+    EMPTY = "empty"
+    EXPIRED = "expired"
+    INVALID = "invalid"
+
+    def __init__(self, token_path="token.txt", clock=time.time):
+        """
+        Initialise la session avec le chemin du fichier token.
+        """
+        self.token_path = token_path
+        self.clock = clock
+        self.token = None
+        self.principal = None
+        self.reloaded = False
+        self._signature = None
+
+    def check(self):
+        """
+        Retourne l'état de la session (VALID, MISSING, EMPTY, EXPIRED ou INVALID).
+        L'attribut `reloaded` indique si le fichier a dû être relu pour répondre.
+        """
+        self.reloaded = False
+        try:
+            stat = os.stat(self.token_path)
+        except FileNotFoundError:
+            self.clear()
+            return self.MISSING
+
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if signature != self._signature:
+            status = self._reload()
+            self._signature = signature
+            if status != self.VALID:
+                return status
+
+        if self.principal is None:
+            return self.INVALID
+        if self.clock() >= self.principal.expires_at:
+            self.principal = None
+            return self.EXPIRED
+        return self.VALID
+
+    def clear(self):
+        """
+        Oublie le token et les claims en cache.
+        """
+        self.token = None
+        self.principal = None
+        self._signature = None
+
+    def _reload(self):
+        """
+        Relit le fichier token et vérifie le JWT (signature et expiration).
+        """
+        self.reloaded = True
+        self.principal = None
+        with open(self.token_path, "r") as token_file:
+            self.token = token_file.read().strip()
+
+        if not self.token:
+            return self.EMPTY
+
+        try:
+            self.principal = tokens.decode(self.token)
+        except tokens.TokenExpired:
+            return self.EXPIRED
+        except tokens.TokenError:
+            return self.INVALID
+        return self.VALID
@@ -0,0 +1,269 @@
+import json
+from dataclasses import dataclass
+from sqlalchemy.orm import Session
+from controllers import profiling
+from controllers.auth_controller import AuthController
+from controllers.data_controller import DataController
+from controllers.ownership import resolve_client, resolve_contract, resolve_event
+from controllers.query_layer import listing_query
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+
+"""
+Actions disponibles en ligne de commande pour chaque entité (`epic <entité> <action>`).
+"""
+ACTIONS = {
+    "clients": ("list", "show", "create", "update", "delete"),
+    "contracts": ("list", "show", "create", "update", "sign", "delete"),
+    "events": ("list", "show", "create", "update", "delete"),
+    "collaborators": ("create", "update", "delete"),
+}
+
+"""
+Vues filtrées de l'action `list` (option --view), reprises des entrées du menu interactif.
+"""
+VIEWS = {
+    "clients": {"mine": "my_clients"},
+    "contracts": {"mine": "my_contracts", "unsigned": "unsigned_contracts", "amount-due": "contracts_with_amount_due"},
+    "events": {"upcoming": "my_upcoming_events", "without-support": "events_without_support"},
+}
+
+MODELS = {"clients": Client, "contracts": Contract, "events": Event}
+
+
+class CommandError(Exception):
+    """
+    Erreur d'une opération de la ligne de commande ; `line` indique la ligne fautive d'un lot.
+    """
+
+    def __init__(self, message, line=None):
+        super().__init__(message)
+        self.line = line
+
+
+@dataclass
+class CommandResult:
+    """
+    Résultat d'une opération : l'entité, l'action, l'identifiant concerné et l'enregistrement obtenu.
+    """
+
+    entity: str
+    action: str
+    id: int = None
+    record: dict = None
+
+    def as_dict(self):
+        """
+        Représentation sérialisable du résultat (une ligne JSON par opération).
+        """
+        result = {"entity": self.entity, "action": self.action, "id": self.id}
+        if self.record is not None:
+            result["record"] = self.record
+        return result
+
+
+class CommandController:
+    """
+    Exécute les opérations du CRM sans saisie interactive, pour les scripts et les traitements par lots.
+    Les permissions et les règles de gestion sont celles du DataController : seules les saisies changent.
+    L'utilisateur est authentifié une seule fois, à partir du token enregistré.
+    """
+
+    def __init__(self, db: Session, auth_controller: AuthController):
+        """
+        Initialise le contrôleur avec la session et un contrôleur d'authentification déjà authentifié.
+        """
+        self.db = db
+        self.auth_controller = auth_controller
+        self.data_controller = DataController(db, auth_controller)
+
+    def list_records(self, entity, view=None, limit=None):
+        """
+        Retourne la requête de la liste demandée (entité, vue filtrée), triée comme dans le menu.
+        """
+        if entity not in MODELS:
+            raise CommandError(f"Listing is not available for {entity}.")
+        try:
+            query, keys = self.list_query(entity, view)
+        except PermissionError as e:
+            raise CommandError(str(e)) from e
+        query = query.order_by(*keys)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    def list_query(self, entity, view):
+        """
+        Construit la requête de la vue demandée à partir des requêtes du DataController.
+        """
+        if view is None:
+            return listing_query(self.db, entity), (MODELS[entity].id,)
+        name = VIEWS.get(entity, {}).get(view)
+        if name is None:
+            raise CommandError(f"Unknown view '{view}' for {entity}. Expected one of: {', '.join(VIEWS[entity])}")
+        if name == "my_upcoming_events":
+            return self.data_controller.upcoming_events_query()
+        if name == "events_without_support":
+            return self.data_controller.events_without_support_query()
+        return self.data_controller.portfolio_query(name)
+
+    def run(self, entity, action, entity_id=None, values=None):
+        """
+        Exécute une opération (hors `list`) et retourne son résultat. Les modifications sont envoyées
+        à la base (flush) mais pas validées : l'appelant valide ou annule la transaction.
+        """
+        if action not in ACTIONS.get(entity, ()) or action == "list":
+            raise CommandError(f"Unknown action '{action}' for {entity}.")
+        if action != "create" and entity_id is None:
+            raise CommandError(f"'{entity} {action}' needs an ID.")
+        values = values or {}
+
+        handler = getattr(self, f"{action}_{entity}", None) or getattr(self, action)
+        try:
+            with profiling.action(f"{entity} {action}"):
+                return handler(entity, entity_id, values)
+        except (LookupError, PermissionError, ValueError) as e:
+            raise CommandError(str(e)) from e
+
+    def run_batch(self, lines):
+        """
+        Exécute un lot d'opérations (une opération JSON par ligne) dans une seule transaction.
+        Au premier échec, tout le lot est annulé et une CommandError indiquant la ligne est levée.
+        """
+        results = []
+        try:
+            for number, line in enumerate(lines, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                entity, action, entity_id, values = self.parse_operation(line, number)
+                try:
+                    results.append(self.run(entity, action, entity_id, values))
+                except CommandError as e:
+                    raise CommandError(str(e), line=number)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return results
+
+    def parse_operation(self, line, number):
+        """
+        Lit une opération du lot : {"entity": ..., "action": ..., "id": ..., "values": {...}}.
+        """
+        try:
+            operation = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise CommandError(f"invalid JSON ({e.msg})", line=number)
+        if not isinstance(operation, dict) or "entity" not in operation or "action" not in operation:
+            raise CommandError("an operation needs an 'entity' and an 'action'", line=number)
+        values = operation.get("values") or {}
+        if not isinstance(values, dict):
+            raise CommandError("'values' must be an object", line=number)
+        return operation["entity"], operation["action"], operation.get("id"), values
+
+    def show(self, entity, entity_id, values):
+        """
+        Retourne un client, un contrat ou un événement (consultables par tous les rôles).
+        """
+        resolver = {"clients": resolve_client, "contracts": resolve_contract, "events": resolve_event}[entity]
+        ownership = resolver(self.db, entity_id)
+        if not ownership:
+            raise LookupError(f"{entity[:-1].capitalize()} not found.")
+        return self.result(entity, "show", ownership.entity)
+
+    def create(self, entity, entity_id, values):
+        """
+        Crée un client, un contrat, un événement ou un collaborateur.
+        """
+        add = {
+            "clients": self.data_controller.add_client,
+            "contracts": self.data_controller.add_contract,
+            "events": self.data_controller.add_event,
+            "collaborators": self.data_controller.add_collaborator,
+        }[entity]
+        return self.result(entity, "create", add(values))
+
+    def update_clients(self, entity, entity_id, values):
+        """
+        Met à jour un client du commercial connecté.
+        """
+        client = self.data_controller.authorize_client_update(entity_id).client
+        return self.result(entity, "update", self.data_controller.edit_client(client, values))
+
+    def update_contracts(self, entity, entity_id, values):
+        """
+        Met à jour un contrat (Admins, ou le commercial de son client).
+        """
+        contract = self.data_controller.authorize_contract_update(entity_id).contract
+        return self.result(entity, "update", self.data_controller.edit_contract(contract, values))
+
+    def update_events(self, entity, entity_id, values):
+        """
+        Met à jour un événement, dans la limite des champs autorisés pour le rôle de l'utilisateur.
+        """
+        ownership, fields = self.data_controller.authorize_event_update(entity_id)
+        return self.result(entity, "update", self.data_controller.edit_event(ownership.entity, values, fields))
+
+    def update_collaborators(self, entity, entity_id, values):
+        """
+        Met à jour un collaborateur (Admins uniquement).
+        """
+        user = self.data_controller.authorize_collaborator_change(entity_id)
+        return self.result(entity, "update", self.data_controller.edit_collaborator(user, values))
+
+    def sign_contracts(self, entity, entity_id, values):
+        """
+        Signe un contrat (Admins, ou le commercial de son client).
+        """
+        return self.result(entity, "sign", self.data_controller.sign_contract(entity_id))
+
+    def delete_clients(self, entity, entity_id, values):
+        """
+        Supprime un client (Admins uniquement).
+        """
+        client = self.data_controller.authorize_client_deletion(entity_id).client
+        self.data_controller.remove(client)
+        return CommandResult(entity=entity, action="delete", id=client.id)
+
+    def delete_contracts(self, entity, entity_id, values):
+        """
+        Supprime un contrat (Admins uniquement).
+        """
+        contract = self.data_controller.authorize_admin_deletion(resolve_contract, entity_id, "Contract").contract
+        self.data_controller.remove(contract)
+        return CommandResult(entity=entity, action="delete", id=contract.id)
+
+    def delete_events(self, entity, entity_id, values):
+        """
+        Supprime un événement (Admins uniquement).
+        """
+        event = self.data_controller.authorize_admin_deletion(resolve_event, entity_id, "Event").entity
+        self.data_controller.remove(event)
+        return CommandResult(entity=entity, action="delete", id=event.id)
+
+    def delete_collaborators(self, entity, entity_id, values):
+        """
+        Supprime un collaborateur (Admins uniquement).
+        """
+        user = self.data_controller.authorize_collaborator_change(entity_id)
+        self.data_controller.remove_collaborator(user)
+        return CommandResult(entity=entity, action="delete", id=user.id)
+
+    def result(self, entity, action, instance):
+        """
+        Construit le résultat d'une opération à partir de l'instance obtenue.
+        """
+        return CommandResult(entity=entity, action=action, id=instance.id, record=self.record(instance))
+
+    @staticmethod
+    def record(instance):
+        """
+        Convertit une instance en dictionnaire de ses colonnes (le hachage du mot de passe est exclu).
+        """
+        return {
+            column.name: getattr(instance, column.key)
+            for column in instance.__table__.columns
+            if column.name != "password_hash"
+        }
@@ -0,0 +1,215 @@
+import datetime
+import decimal
+from sqlalchemy import case, delete, event, func, insert, inspect, literal, or_, select, update
+from sqlalchemy.orm import Session
+from models.base_model import dialect_insert
+from models.client_model import Client
+from models.contract_model import Contract
+from models.contract_summary_model import ContractSummary
+
+"""
+Colonnes des contrats qui entrent dans la synthèse (clé commercial / client et valeurs agrégées).
+"""
+SUMMARY_COLUMNS = ("commercial_id", "client_id", "total_amount", "amount_due", "signed", "creation_date")
+
+
+@event.listens_for(Session, "before_flush")
+def capture_previous_values(session, flush_context, instances):
+    """
+    Relit en une requête, avant qu'elles ne soient écrites, les valeurs enregistrées des contrats modifiés
+    ou supprimés : ce sont elles qu'il faut retirer de la synthèse, même si l'instance avait expiré.
+    Les contrats d'un client supprimé sont relus aussi : le flush met leur client_id à NULL sans qu'ils
+    passent par la session (contrats non chargés).
+    """
+    modified = [instance for instance in session.dirty if session.is_modified(instance)]
+    ids = [
+        instance.id
+        for instance in modified + list(session.deleted)
+        if isinstance(instance, Contract) and instance.id is not None
+    ]
+    client_ids = [
+        instance.id for instance in session.deleted if isinstance(instance, Client) and instance.id is not None
+    ]
+    previous, orphaned = {}, set()
+    if ids or client_ids:
+        table = Contract.__table__
+        query = select(table.c.id, *[table.c[name] for name in SUMMARY_COLUMNS]).where(
+            or_(table.c.id.in_(ids), table.c.client_id.in_(client_ids))
+        )
+        for row in session.connection().execute(query):
+            previous[row.id] = {name: row._mapping[name] for name in SUMMARY_COLUMNS}
+            if row.client_id in client_ids:
+                orphaned.add(row.id)
+    session.info["contract_summary_previous"] = previous
+    session.info["contract_summary_orphaned"] = orphaned
+
+
+@event.listens_for(Session, "after_flush")
+def update_contract_summaries(session, flush_context):
+    """
+    Reporte dans la synthèse les contrats créés, modifiés (montants, signature, commercial ou client) ou supprimés
+    pendant le flush : chaque couple (commercial, client) touché reçoit la différence, dans la même transaction.
+    Les contrats d'un client supprimé qui ne sont pas passés par la session passent au couple (commercial, NULL).
+    """
+    previous = session.info.pop("contract_summary_previous", {})
+    orphaned = session.info.pop("contract_summary_orphaned", set())
+    deltas = {}
+    for instance in session.new:
+        if isinstance(instance, Contract):
+            add(deltas, current_values(instance, {}), 1)
+    for instance in session.dirty:
+        if isinstance(instance, Contract) and instance.id in previous:
+            orphaned.discard(instance.id)
+            values = current_values(instance, previous[instance.id])
+            if values != previous[instance.id]:
+                add(deltas, previous[instance.id], -1)
+                add(deltas, values, 1)
+    for instance in session.deleted:
+        if isinstance(instance, Contract) and instance.id in previous:
+            orphaned.discard(instance.id)
+            add(deltas, previous[instance.id], -1)
+    for contract_id in orphaned:
+        add(deltas, previous[contract_id], -1)
+        add(deltas, {**previous[contract_id], "client_id": None}, 1)
+
+    connection = session.connection()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for key, delta in deltas.items():
+        apply(connection, key, delta, now)
+
+
+def current_values(instance, previous):
+    """
+    Valeurs du contrat après le flush ; un attribut non chargé n'a pas été modifié et garde sa valeur en base.
+    """
+    state = inspect(instance)
+    return {name: state.dict.get(name, previous.get(name)) for name in SUMMARY_COLUMNS}
+
+
+def add(deltas, values, sign):
+    """
+    Ajoute (sign=1) ou retire (sign=-1) un contrat aux différences de son couple (commercial, client).
+    """
+    key = (values["commercial_id"], values["client_id"])
+    delta = deltas.setdefault(key, {"count": 0, "signed": 0, "total": 0, "due": 0, "latest": None, "removed": False})
+    signed = values["signed"] is True
+    delta["count"] += sign
+    delta["signed"] += sign if signed else 0
+    delta["total"] += sign * amount(values["total_amount"]) if signed else 0
+    delta["due"] += sign * amount(values["amount_due"])
+    if values["creation_date"] is not None:
+        if sign > 0:
+            delta["latest"] = max(filter(None, (delta["latest"], values["creation_date"])))
+        else:
+            delta["removed"] = True
+
+
+def amount(value):
+    """
+    Montant exact d'un contrat (Decimal), y compris lorsqu'il a été affecté en float ou en entier.
+    """
+    return decimal.Decimal(str(value)) if value is not None else decimal.Decimal(0)
+
+
+def key_filter(column, value):
+    """
+    Condition d'égalité sur une colonne de la clé, NULL compris (contrat sans commercial ou sans client).
+    """
+    return column.is_(None) if value is None else column == value
+
+
+def apply(connection, key, delta, now):
+    """
+    Met à jour la ligne du couple (commercial, client) ou la crée ; une ligne sans contrat est supprimée.
+    La dernière activité ne peut que croître par ajout : elle est relue sur les contrats du couple
+    seulement si un contrat daté en est retiré. Sur PostgreSQL et SQLite, la ligne est écrite par un seul
+    INSERT ... ON CONFLICT DO UPDATE : deux transactions qui créent le même couple ne se heurtent pas à l'index
+    unique. Une clé contenant NULL n'est pas arbitrée par l'index (NULL distincts) : elle reste mise à jour,
+    ou créée si elle n'existe pas.
+    """
+    if not any((delta["count"], delta["signed"], delta["total"], delta["due"], delta["latest"], delta["removed"])):
+        return
+    commercial_id, client_id = key
+    where = (
+        key_filter(ContractSummary.commercial_id, commercial_id),
+        key_filter(ContractSummary.client_id, client_id),
+    )
+    if delta["removed"]:
+        last_activity = (
+            select(func.max(Contract.creation_date))
+            .where(key_filter(Contract.commercial_id, commercial_id), key_filter(Contract.client_id, client_id))
+            .scalar_subquery()
+        )
+    elif delta["latest"] is not None:
+        last_activity = case(
+            (ContractSummary.last_activity >= delta["latest"], ContractSummary.last_activity),
+            else_=delta["latest"],
+        )
+    else:
+        last_activity = ContractSummary.last_activity
+
+    changes = {
+        "contract_count": ContractSummary.contract_count + delta["count"],
+        "signed_count": ContractSummary.signed_count + delta["signed"],
+        "signed_total": ContractSummary.signed_total + delta["total"],
+        "amount_due": ContractSummary.amount_due + delta["due"],
+        "last_activity": last_activity,
+        "updated_at": now,
+    }
+    row = {
+        "commercial_id": commercial_id,
+        "client_id": client_id,
+        "contract_count": delta["count"],
+        "signed_count": delta["signed"],
+        "signed_total": delta["total"],
+        "amount_due": delta["due"],
+        "last_activity": delta["latest"],
+        "updated_at": now,
+    }
+    upsert = dialect_insert(connection, ContractSummary)
+    if upsert is not None and None not in key:
+        connection.execute(
+            upsert.values(**row).on_conflict_do_update(index_elements=["commercial_id", "client_id"], set_=changes)
+        )
+    elif connection.execute(update(ContractSummary).where(*where).values(**changes)).rowcount == 0:
+        connection.execute(insert(ContractSummary).values(**row))
+    if delta["count"] < 0:
+        connection.execute(delete(ContractSummary).where(*where, ContractSummary.contract_count <= 0))
+
+
+def rebuild(db: Session):
+    """
+    Recalcule entièrement la synthèse en deux instructions (suppression puis INSERT ... SELECT groupé
+    par commercial et client), sans lire les contrats en Python. Sert à la réparer, et après un import
+    en masse qui écrit les contrats sans passer par l'ORM. Retourne le nombre de lignes écrites ;
+    la validation (commit) est laissée à l'appelant.
+    """
+    signed = Contract.signed.is_(True)
+    totals = select(
+        Contract.commercial_id,
+        Contract.client_id,
+        func.count(Contract.id),
+        func.count(case((signed, Contract.id))),
+        func.coalesce(func.sum(case((signed, Contract.total_amount), else_=0)), 0),
+        func.coalesce(func.sum(Contract.amount_due), 0),
+        func.max(Contract.creation_date),
+        literal(datetime.datetime.now(datetime.timezone.utc), ContractSummary.updated_at.type),
+    ).group_by(Contract.commercial_id, Contract.client_id)
+
+    db.execute(delete(ContractSummary))
+    result = db.execute(
+        insert(ContractSummary).from_select(
+            [
+                "commercial_id",
+                "client_id",
+                "contract_count",
+                "signed_count",
+                "signed_total",
+                "amount_due",
+                "last_activity",
+                "updated_at",
+            ],
+            totals,
+        )
+    )
+    return result.rowcount
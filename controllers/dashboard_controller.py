@@ -0,0 +1,146 @@
+import datetime
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from controllers import contract_summary, permissions
+from models.contract_model import Contract
+from models.contract_summary_model import ContractSummary
+from models.event_model import Event
+from models.user_model import User
+import config
+
+"""
+Sources possibles des totaux de contrats : les contrats eux-mêmes, ou la table de synthèse `contract_summaries`,
+tenue à jour à chaque flush (voir controllers/contract_summary.py) et lue en O(commerciaux × clients).
+"""
+LIVE = "live"
+SUMMARY = "summary"
+SOURCES = (LIVE, SUMMARY)
+
+
+class DashboardController:
+    """
+    Calcule les indicateurs du tableau de bord (Admins uniquement) : chiffre d'affaires signé, reste à payer,
+    contrats par commercial et événements à venir par support. Tout est agrégé en SQL (GROUP BY et fonctions
+    de fenêtrage) : seules les lignes agrégées, une par commercial ou par support, sont lues.
+    """
+
+    def __init__(self, db: Session, user, source=None):
+        """
+        Initialise le contrôleur avec la session, l'utilisateur connecté et la source des totaux de contrats
+        (config.DASHBOARD_SOURCE par défaut).
+        """
+        self.db = db
+        self.user = user
+        self.source = source or config.DASHBOARD_SOURCE
+        if self.source not in SOURCES:
+            raise ValueError(f"Unknown dashboard source '{self.source}'. Expected one of: {', '.join(SOURCES)}")
+
+    def require_admin(self):
+        """
+        Lève PermissionError si l'utilisateur connecté n'est pas Admin.
+        """
+        role = self.user.role.name if self.user and self.user.role else None
+        permissions.require(role, "view_dashboard", "Permission denied. Only Admins can view the dashboard.")
+
+    def contract_columns(self):
+        """
+        Retourne la table lue et les agrégats (commercial, nombre de contrats, contrats signés, chiffre d'affaires
+        signé, reste à payer) selon la source : calculés sur les contrats ou additionnés depuis la synthèse.
+        """
+        if self.source == SUMMARY:
+            return (
+                ContractSummary,
+                ContractSummary.commercial_id,
+                func.coalesce(func.sum(ContractSummary.contract_count), 0),
+                func.coalesce(func.sum(ContractSummary.signed_count), 0),
+                func.coalesce(func.sum(ContractSummary.signed_total), 0),
+                func.coalesce(func.sum(ContractSummary.amount_due), 0),
+            )
+        signed = Contract.signed.is_(True)
+        return (
+            Contract,
+            Contract.commercial_id,
+            func.count(Contract.id),
+            func.count(case((signed, Contract.id))),
+            func.coalesce(func.sum(case((signed, Contract.total_amount), else_=0)), 0),
+            func.coalesce(func.sum(Contract.amount_due), 0),
+        )
+
+    def totals(self):
+        """
+        Retourne les totaux globaux en une requête : nombre de contrats, contrats signés, chiffre d'affaires signé,
+        reste à payer et nombre d'événements à venir.
+        """
+        self.require_admin()
+        source, _, contracts, signed, revenue, amount_due = self.contract_columns()
+        upcoming = (
+            select(func.count(Event.id)).where(Event.event_date_start >= datetime.date.today()).scalar_subquery()
+        )
+        query = select(
+            contracts.label("contracts"),
+            signed.label("signed_contracts"),
+            revenue.label("signed_revenue"),
+            amount_due.label("amount_due"),
+            upcoming.label("upcoming_events"),
+        ).select_from(source)
+        return self.db.execute(query).one()
+
+    def commercials_query(self):
+        """
+        Construit la requête des totaux par commercial, classés par chiffre d'affaires signé, avec leur rang
+        et leur part du chiffre d'affaires total (fonctions de fenêtrage sur les agrégats).
+        """
+        self.require_admin()
+        source, commercial_id, contracts, signed, revenue, amount_due = self.contract_columns()
+        return (
+            select(
+                commercial_id.label("commercial_id"),
+                User.full_name.label("commercial"),
+                contracts.label("contracts"),
+                signed.label("signed_contracts"),
+                revenue.label("signed_revenue"),
+                amount_due.label("amount_due"),
+                func.rank().over(order_by=revenue.desc()).label("rank"),
+                (revenue * 100.0 / func.nullif(func.sum(revenue).over(), 0)).label("revenue_share"),
+            )
+            .select_from(source)
+            .outerjoin(User, User.id == commercial_id)
+            .group_by(commercial_id, User.full_name)
+            .order_by(revenue.desc(), commercial_id)
+        )
+
+    def supports_query(self):
+        """
+        Construit la requête des événements à venir par support (nombre, participants attendus, prochaine date),
+        classés par charge ; les événements sans support forment une ligne à part.
+        """
+        self.require_admin()
+        events = func.count(Event.id)
+        return (
+            select(
+                Event.support_id.label("support_id"),
+                User.full_name.label("support"),
+                events.label("upcoming_events"),
+                func.coalesce(func.sum(Event.attendees), 0).label("attendees"),
+                func.min(Event.event_date_start).label("next_event"),
+                func.rank().over(order_by=events.desc()).label("rank"),
+            )
+            .outerjoin(User, User.id == Event.support_id)
+            .where(Event.event_date_start >= datetime.date.today())
+            .group_by(Event.support_id, User.full_name)
+            .order_by(events.desc(), Event.support_id)
+        )
+
+    def rows(self, query):
+        """
+        Exécute une requête agrégée et retourne ses lignes.
+        """
+        return self.db.execute(query).all()
+
+    def refresh_summary(self):
+        """
+        Recalcule entièrement la table de synthèse (réparation) et retourne le nombre de lignes écrites.
+        La validation (commit) est laissée à l'appelant : les lecteurs voient l'ancienne ou la nouvelle synthèse.
+        """
+        self.require_admin()
+        return contract_summary.rebuild(self.db)
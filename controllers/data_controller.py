@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from sqlalchemy.orm import Session
 from models.client_model import Client
 from models.contract_model import Contract
@@ -5,9 +6,45 @@ from models.event_model import Event
 from views.data_view import DataView
 from models.user_model import User, Role
 from controllers.auth_controller import AuthController
+from controllers.pagination import KeysetPaginator
+from controllers.query_layer import listing_query, rendering
+from controllers.ownership import resolve_client, resolve_contract, resolve_event
+from controllers.import_controller import convert_value
+from controllers import audit, audit_log, permissions, principal_cache, profiling, tokens
+from controllers.search import search
+from controllers.dashboard_controller import DashboardController
 from rich.console import Console
 from rich.prompt import Prompt
-import sentry_sdk
+import config
+import datetime
+
+
+"""
+Champs modifiables par entité, pour le menu interactif comme pour la ligne de commande.
+Le support ne modifie que le nom et le lieu de ses événements ; `role` et `password` d'un collaborateur
+sont traités à part (nom du rôle, mot de passe haché).
+"""
+CLIENT_FIELDS = ("full_name", "email", "phone", "company_name", "last_contact_date")
+CONTRACT_FIELDS = ("total_amount", "amount_due", "creation_date", "signed")
+EVENT_FIELDS = (
+    "event_name",
+    "event_date_start",
+    "event_date_end",
+    "location",
+    "support_contact",
+    "attendees",
+    "notes",
+    "client_contact",
+)
+SUPPORT_EVENT_FIELDS = ("event_name", "location")
+COLLABORATOR_FIELDS = ("employee_number", "full_name", "email", "department")
+
+PORTFOLIO_EMPTY_MESSAGES = {
+    "my_clients": "You have no clients.",
+    "my_contracts": "You have no contracts.",
+    "unsigned_contracts": "You have no unsigned contracts.",
+    "contracts_with_amount_due": "You have no contracts with an amount due.",
+}
 
 
 class DataController:
@@ -15,152 +52,356 @@ class DataController:
     Gère les opérations sur les données liées aux clients, contrats et événements.
     """
 
-    def __init__(self, db: Session, auth_controller: AuthController):
+    def __init__(self, db: Session, auth_controller: AuthController, session_factory=None):
         """
         Initialise le contrôleur de données avec la base de données et le contrôleur d'authentification.
+        Si une fabrique de sessions (sessionmaker) est fournie, chaque action du menu utilise une session dédiée.
+        Les modifications faites dans ces sessions sont journalisées au nom de l'utilisateur connecté.
         """
         self.db = db
+        self.session_factory = session_factory
         self.data_view = DataView()
         self.auth_controller = auth_controller
         self.console = Console()
+        self.page_size = config.PAGE_SIZE
+        audit_log.set_actor(self.db, auth_controller.current_user)
 
     def start(self):
         """
         Démarre le menu principal pour gérer les opérations sur les données selon les permissions de l'utilisateur
                                     (affichage du menu dynamique selon rôle.).
+        Chaque action s'exécute dans sa propre session, fermée à la fin de l'action, et ses requêtes sont mesurées
+        si un profileur est attaché (voir controllers/profiling.py).
         """
         while True:
 
-            role = self.auth_controller.current_user.role.name
-            action = self.data_view.display_data_menu(role)
+            role = self.current_role()
+            action = self.data_view.display_data_menu(permissions.menu_options(role))
 
-            if action == "view_clients":
-                if not self.auth_controller.is_authenticated():
-                    return
-                self.view_clients()
-            elif action == "view_contracts":
-                if not self.auth_controller.is_authenticated():
-                    return
-                self.view_contracts()
-            elif action == "view_events":
-                if not self.auth_controller.is_authenticated():
-                    return
-                self.view_events()
-            elif action == "create_client":
-                if not self.auth_controller.is_authenticated():
-                    return
-                self.create_client()
-            elif action == "create_contract":
-                if not self.auth_controller.is_authenticated():
-                    return
-                self.create_contract()
-            elif action == "create_event":
-                if not self.auth_controller.is_authenticated():
-                    return
-                self.create_event()
-            elif action == "update_client":
-                if not self.auth_controller.is_authenticated():
-                    return
-                client_id = Prompt.ask("Enter Client ID to update")
-                self.update_client(client_id)
-            elif action == "update_contract":
-                if not self.auth_controller.is_authenticated():
-                    return
-                contract_id = Prompt.ask("Enter Contract ID to update")
-                self.update_contract(contract_id)
-            elif action == "update_event":
-                if not self.auth_controller.is_authenticated():
-                    return
-                event_id = Prompt.ask("Enter Event ID to update")
-                self.update_event(event_id)
-            elif action == "create_collaborator":
-                if not self.auth_controller.is_authenticated():
-                    return
-                self.create_collaborator()
-            elif action == "update_collaborator":
-                if not self.auth_controller.is_authenticated():
-                    return
-                collaborator_id = Prompt.ask("Enter Collaborator ID to update")
-                self.update_collaborator(collaborator_id)
-            elif action == "delete_collaborator":
-                if not self.auth_controller.is_authenticated():
-                    return
-                collaborator_id = Prompt.ask("Enter Collaborator ID to delete")
-                self.delete_collaborator(collaborator_id)
-            elif action == "delete_client":
-                if not self.auth_controller.is_authenticated():
-                    return
-                client_id = Prompt.ask("Enter Client ID to delete")
-                self.delete_client(client_id)
-            elif action == "delete_contract":
-                if not self.auth_controller.is_authenticated():
-                    return
-                contract_id = Prompt.ask("Enter Contract ID to delete")
-                self.delete_contract(contract_id)
-            elif action == "delete_event":
-                if not self.auth_controller.is_authenticated():
-                    return
-                event_id = Prompt.ask("Enter Event ID to delete")
-                self.delete_event(event_id)
-            elif action == "filter_events_without_support":
-                if not self.auth_controller.is_authenticated():
-                    return
-                self.filter_events_without_support()
-            elif action == "update_any_contract":
-                if not self.auth_controller.is_authenticated():
-                    return
-                contract_id = Prompt.ask("Enter Contract ID to update")
-                self.update_contract(contract_id)
-            elif action == "update_any_event":
-                if not self.auth_controller.is_authenticated():
-                    return
-                event_id = Prompt.ask("Enter Event ID to update")
-                self.update_event(event_id)
-            elif action == "return_to_main":
+            if action == "return_to_main":
                 break
-            else:
-                self.data_view.console.print(
-                    "[bold red]Invalid choice or permission denied. Please try again.[/bold red]"
-                )
+
+            with self.session_scope(), profiling.action(action):
+                if not self.run_action(action):
+                    return
+
+    @contextmanager
+    def session_scope(self):
+        """
+        Ouvre une session courte pour la durée d'une action (si une fabrique de sessions est fournie),
+        puis la ferme : les modifications non validées sont annulées et la carte d'identité est libérée.
+        """
+        if self.session_factory is None:
+            yield self.db
+            return
+
+        previous_db = self.db
+        self.db = self.session_factory()
+        audit_log.set_actor(self.db, self.auth_controller.current_user)
+        try:
+            yield self.db
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            self.db.close()
+            self.db = previous_db
+
+    def run_action(self, action):
+        """
+        Exécute l'action choisie dans le menu.
+        Retourne False si l'utilisateur n'est plus authentifié.
+        """
+        if action == "view_clients":
+            if not self.auth_controller.is_authenticated():
+                return False
+            self.view_clients()
+        elif action == "view_contracts":
+            if not self.auth_controller.is_authenticated():
+                return False
+            self.view_contracts()
+        elif action == "view_events":
+            if not self.auth_controller.is_authenticated():
+                return False
+            self.view_events()
+        elif action == "search":
+            if not self.auth_controller.is_authenticated():
+                return False
+            entity, term = self.data_view.prompt_search()
+            self.search_records(entity, term)
+        elif action == "create_client":
+            if not self.auth_controller.is_authenticated():
+                return False
+            self.create_client()
+        elif action == "create_contract":
+            if not self.auth_controller.is_authenticated():
+                return False
+            self.create_contract()
+        elif action == "create_event":
+            if not self.auth_controller.is_authenticated():
+                return False
+            self.create_event()
+        elif action == "update_client":
+            if not self.auth_controller.is_authenticated():
+                return False
+            client_id = Prompt.ask("Enter Client ID to update")
+            self.update_client(client_id)
+        elif action == "update_contract":
+            if not self.auth_controller.is_authenticated():
+                return False
+            contract_id = Prompt.ask("Enter Contract ID to update")
+            self.update_contract(contract_id)
+        elif action == "update_event":
+            if not self.auth_controller.is_authenticated():
+                return False
+            event_id = Prompt.ask("Enter Event ID to update")
+            self.update_event(event_id)
+        elif action == "create_collaborator":
+            if not self.auth_controller.is_authenticated():
+                return False
+            self.create_collaborator()
+        elif action == "update_collaborator":
+            if not self.auth_controller.is_authenticated():
+                return False
+            collaborator_id = Prompt.ask("Enter Collaborator ID to update")
+            self.update_collaborator(collaborator_id)
+        elif action == "delete_collaborator":
+            if not self.auth_controller.is_authenticated():
+                return False
+            collaborator_id = Prompt.ask("Enter Collaborator ID to delete")
+            self.delete_collaborator(collaborator_id)
+        elif action == "delete_client":
+            if not self.auth_controller.is_authenticated():
+                return False
+            client_id = Prompt.ask("Enter Client ID to delete")
+            self.delete_client(client_id)
+        elif action == "delete_contract":
+            if not self.auth_controller.is_authenticated():
+                return False
+            contract_id = Prompt.ask("Enter Contract ID to delete")
+            self.delete_contract(contract_id)
+        elif action == "delete_event":
+            if not self.auth_controller.is_authenticated():
+                return False
+            event_id = Prompt.ask("Enter Event ID to delete")
+            self.delete_event(event_id)
+        elif action == "filter_events_without_support":
+            if not self.auth_controller.is_authenticated():
+                return False
+            self.filter_events_without_support()
+        elif action in ("my_clients", "my_contracts", "unsigned_contracts", "contracts_with_amount_due"):
+            if not self.auth_controller.is_authenticated():
+                return False
+            self.view_portfolio(action)
+        elif action == "my_upcoming_events":
+            if not self.auth_controller.is_authenticated():
+                return False
+            self.view_my_upcoming_events()
+        elif action == "update_any_contract":
+            if not self.auth_controller.is_authenticated():
+                return False
+            contract_id = Prompt.ask("Enter Contract ID to update")
+            self.update_contract(contract_id)
+        elif action == "update_any_event":
+            if not self.auth_controller.is_authenticated():
+                return False
+            event_id = Prompt.ask("Enter Event ID to update")
+            self.update_event(event_id)
+        elif action == "dashboard":
+            if not self.auth_controller.is_authenticated():
+                return False
+            self.view_dashboard()
         else:
-            self.console.print("[bold yellow]You must be logged in to view this information.[/bold yellow]")
+            self.data_view.console.print("[bold red]Invalid choice or permission denied. Please try again.[/bold red]")
+        return True
 
     def view_clients(self):
         """
-        Affiche la liste des clients.
+        Affiche la liste des clients, page par page.
         """
-        clients = self.db.query(Client).all()
-        self.data_view.display_clients(clients)
+        self.browse(listing_query(self.db, "clients"), (Client.id,), self.data_view.display_clients)
 
     def view_contracts(self):
         """
-        Affiche la liste des contrats.
+        Affiche la liste des contrats, page par page.
         """
-        contracts = self.db.query(Contract).all()
-        self.data_view.display_contracts(contracts)
+        self.browse(listing_query(self.db, "contracts"), (Contract.id,), self.data_view.display_contracts)
 
     def view_events(self):
         """
-        Affiche la liste des événements.
+        Affiche la liste des événements, page par page.
         """
-        events = self.db.query(Event).all()
-        self.data_view.display_events(events)
+        self.browse(listing_query(self.db, "events"), (Event.id,), self.data_view.display_events)
+
+    def search_records(self, entity, term):
+        """
+        Affiche les clients ou les événements correspondant au texte recherché, les plus pertinents en premier.
+        """
+        try:
+            results = search(self.db, entity, term)
+        except ValueError as e:
+            self.print_error(e)
+            return
+
+        if not results:
+            self.data_view.console.print(f"[bold yellow]No {entity} found for '{term}'.[/bold yellow]")
+        elif entity == "clients":
+            self.data_view.display_clients(results)
+        else:
+            self.data_view.display_events(results)
+
+    def view_dashboard(self):
+        """
+        Affiche le tableau de bord (Admins uniquement) : chiffre d'affaires, reste à payer, charge par support.
+        """
+        dashboard = DashboardController(self.db, self.auth_controller.current_user)
+        try:
+            totals = dashboard.totals()
+            commercials = dashboard.rows(dashboard.commercials_query())
+            supports = dashboard.rows(dashboard.supports_query())
+        except PermissionError as e:
+            self.print_error(e)
+            return
+        self.data_view.display_dashboard(totals, commercials, supports)
+
+    def view_portfolio(self, name):
+        """
+        Affiche le portefeuille du commercial connecté (mes clients, mes contrats,
+        mes contrats non signés ou non soldés). Le filtre est appliqué en SQL, sur des index composites.
+        """
+        try:
+            query, keys = self.portfolio_query(name)
+        except PermissionError as e:
+            self.print_error(e)
+            return
+
+        if name == "my_clients":
+            self.browse(query, keys, self.data_view.display_clients, empty_message=PORTFOLIO_EMPTY_MESSAGES[name])
+        else:
+            self.browse(query, keys, self.data_view.display_contracts, empty_message=PORTFOLIO_EMPTY_MESSAGES[name])
+
+    def portfolio_query(self, name):
+        """
+        Construit la requête du portefeuille demandé pour le commercial connecté
+        et retourne (requête, clés de tri). Lève PermissionError pour les autres rôles.
+        """
+        message = "Permission denied. Only Commercials have a portfolio."
+        if name == "my_clients":
+            query = self.restrict(listing_query(self.db, "clients"), "view_own_clients", Client, message)
+            return query, (Client.id,)
+
+        query = self.restrict(listing_query(self.db, "contracts"), "view_own_contracts", Contract, message)
+        if name == "unsigned_contracts":
+            query = query.filter(Contract.signed.isnot(True))
+        elif name == "contracts_with_amount_due":
+            query = query.filter(Contract.amount_due > 0)
+        return query, (Contract.id,)
+
+    def view_my_upcoming_events(self):
+        """
+        Affiche les événements à venir du support connecté, triés par date de début.
+        """
+        try:
+            query, keys = self.upcoming_events_query()
+        except PermissionError as e:
+            self.print_error(e)
+            return
+
+        self.browse(
+            query,
+            keys,
+            self.data_view.display_events,
+            empty_message="You have no upcoming events.",
+            jump_label="date (YYYY-MM-DD)",
+            jump_parser=datetime.date.fromisoformat,
+        )
+
+    def upcoming_events_query(self):
+        """
+        Construit la requête des événements à venir du support connecté et retourne (requête, clés de tri).
+        """
+        query = self.restrict(
+            listing_query(self.db, "events"),
+            "view_assigned_events",
+            Event,
+            "Permission denied. Only Support collaborators have assigned events.",
+        ).filter(Event.event_date_start >= datetime.date.today())
+        return query, (Event.event_date_start, Event.id)
+
+    def events_without_support_query(self):
+        """
+        Construit la requête des événements sans contact support (Admins uniquement) et retourne (requête, clés).
+        """
+        self.authorize(
+            "filter_events_without_support",
+            "Permission denied. Only Admins can filter events without support contact.",
+        )
+        return listing_query(self.db, "events").filter(Event.support_id == None), (Event.id,)
+
+    def browse(self, query, keys, display, empty_message=None, jump_label="ID", jump_parser=int):
+        """
+        Affiche une requête page par page (pagination keyset) et gère la navigation
+        suivant / précédent / saut vers une clé (l'ID par défaut) / taille de page.
+        Retourne la première page affichée.
+        """
+        paginator = KeysetPaginator(query, keys, self.page_size)
+        first_page = page = paginator.first()
+
+        if not page.items and empty_message:
+            self.data_view.console.print(f"[bold yellow]{empty_message}[/bold yellow]")
+            return first_page
+
+        while True:
+            with rendering(self.db):
+                display(page.items)
+            if not page.has_next and not page.has_previous:
+                return first_page
+
+            action = self.data_view.prompt_page_navigation(page, paginator.page_size, jump_label)
+            if action == "next":
+                page = paginator.next(page)
+            elif action == "previous":
+                page = paginator.previous(page)
+            elif action == "jump":
+                target = self.data_view.prompt_jump_target(jump_label)
+                try:
+                    value = jump_parser(target.strip())
+                except ValueError:
+                    self.data_view.console.print(f"[bold red]Invalid {jump_label}.[/bold red]")
+                    continue
+                page = paginator.jump(value)
+            elif action == "size":
+                size = self.data_view.prompt_page_size(paginator.page_size)
+                if not size.isdigit() or int(size) < 1:
+                    self.data_view.console.print("[bold red]Invalid page size.[/bold red]")
+                    continue
+                self.page_size = paginator.page_size = int(size)
+                page = paginator.jump(page.first_key[0]) if page.first_key else paginator.first()
+            else:
+                return first_page
+
+    def print_error(self, error):
+        """
+        Affiche un message d'erreur (refus de permission, entité introuvable, saisie invalide).
+        """
+        self.data_view.console.print(f"[bold red]{error}[/bold red]")
 
     def create_client(self):
         """
         Crée un nouveau client, accessible uniquement aux commerciaux.
         """
-        if self.auth_controller.current_user.role.name != "Commercial":
-            self.data_view.console.print(
-                "[bold red]Permission denied. Only Commercials can create clients.[/bold red]"
-            )
+        try:
+            self.authorize("create_client", "Permission denied. Only Commercials can create clients.")
+        except PermissionError as e:
+            self.print_error(e)
             return
 
-        full_name = Prompt.ask("Enter full name")
-        email = Prompt.ask("Enter email")
-        phone = Prompt.ask("Enter phone number")
-        company_name = Prompt.ask("Enter company name")
-        commercial_contact = self.auth_controller.current_user.full_name
+        values = {
+            "full_name": Prompt.ask("Enter full name"),
+            "email": Prompt.ask("Enter email"),
+            "phone": Prompt.ask("Enter phone number"),
+            "company_name": Prompt.ask("Enter company name"),
+        }
 
         # Faire une demande de confirmation avant l'envoi
         confirmation = Prompt.ask("Are you sure the information is correct? (yes/no)", choices=["yes", "no"])
@@ -169,40 +410,33 @@ class DataController:
             self.auth_controller.console.print("[bold yellow]Action canceled.[/bold yellow]")
             return
 
-        new_client = Client(
-            full_name=full_name,
-            email=email,
-            phone=phone,
-            company_name=company_name,
-            commercial_contact=commercial_contact,
-        )
-        self.db.add(new_client)
+        try:
+            client = self.add_client(values)
+        except (PermissionError, ValueError) as e:
+            self.print_error(e)
+            return
         self.db.commit()
-        self.data_view.console.print(f"[bold green]Client '{full_name}' created successfully.[/bold green]")
+        self.data_view.console.print(f"[bold green]Client '{client.full_name}' created successfully.[/bold green]")
 
     def update_client(self, client_id):
         """
         Met à jour les informations d'un client existant.
         """
-        client = self.db.query(Client).filter_by(id=client_id).first()
-        if not client:
-            self.data_view.console.print("[bold red]Client not found.[/bold red]")
-            return
-
-        if (
-            self.auth_controller.current_user.role.name != "Commercial"
-            or client.commercial_contact != self.auth_controller.current_user.full_name
-        ):
-            self.data_view.console.print(
-                "[bold red]Permission denied. You can only update clients you are responsible for.[/bold red]"
-            )
+        try:
+            client = self.authorize_client_update(client_id).client
+        except (LookupError, PermissionError) as e:
+            self.print_error(e)
             return
 
-        client.full_name = Prompt.ask("Enter full name", default=client.full_name)
-        client.email = Prompt.ask("Enter email", default=client.email)
-        client.phone = Prompt.ask("Enter phone number", default=client.phone)
-        client.company_name = Prompt.ask("Enter company name", default=client.company_name)
-        client.last_contact_date = Prompt.ask("Enter last contact date", default=str(client.last_contact_date))
+        values = {
+            "full_name": Prompt.ask("Enter full name", default=client.full_name),
+            "email": Prompt.ask("Enter email", default=client.email),
+            "phone": Prompt.ask("Enter phone number", default=client.phone),
+            "company_name": Prompt.ask("Enter company name", default=client.company_name),
+            "last_contact_date": Prompt.ask(
+                "Enter last contact date", default=str(client.last_contact_date or "")
+            ),
+        }
 
         # Faire une demande de confirmation avant l'envoi
         confirmation = Prompt.ask("Are you sure the information is correct? (yes/no)", choices=["yes", "no"])
@@ -211,6 +445,12 @@ class DataController:
             self.auth_controller.console.print("[bold yellow]Action canceled.[/bold yellow]")
             return
 
+        try:
+            self.edit_client(client, values)
+        except ValueError as e:
+            self.db.rollback()
+            self.print_error(e)
+            return
         self.db.commit()
         self.data_view.console.print(f"[bold green]Client '{client.full_name}' updated successfully.[/bold green]")
 
@@ -218,17 +458,10 @@ class DataController:
         """
         Supprime un client.
         """
-
-        if not self.auth_controller.current_user.role.name == "Admin":
-            self.auth_controller.console.print(
-                "[bold red]Deleting clients is not allowed according to the business rules.[/bold red]"
-            )
-            return
-
-        client = self.db.query(Client).filter_by(id=client_id).first()
-
-        if not client:
-            self.auth_controller.console.print("[bold red]Client not found.[/bold red]")
+        try:
+            client = self.authorize_client_deletion(client_id).client
+        except (LookupError, PermissionError) as e:
+            self.print_error(e)
             return
 
         # Faire une demande de confirmation avant l'envoi
@@ -249,25 +482,21 @@ class DataController:
         """
         Crée un nouveau contrat pour un client, accessible uniquement aux commerciaux.
         """
-        if self.auth_controller.current_user.role.name != "Commercial":
-            self.data_view.console.print(
-                "[bold red]Permission denied. Only Commercials can create contracts.[/bold red]"
-            )
-            return
-
-        client_id = Prompt.ask("Enter client ID")
-        client = self.db.query(Client).filter_by(id=client_id).first()
-        if not client or client.commercial_contact != self.auth_controller.current_user.full_name:
-            self.data_view.console.print(
-                "[bold red]Permission denied. You can only create contracts for your own clients.[/bold red]"
-            )
+        try:
+            self.authorize("create_contract", "Permission denied. Only Commercials can create contracts.")
+            client_id = Prompt.ask("Enter client ID")
+            self.authorize_contract_creation(client_id)
+        except PermissionError as e:
+            self.print_error(e)
             return
 
-        # description = Prompt.ask("Enter contract description")
-        total_amount = Prompt.ask("Enter total amount")
-        amount_due = Prompt.ask("Enter amount due")
-        creation_date = Prompt.ask("Enter creation date (YYYY-MM-DD)")
-        is_signed = Prompt.ask("Is the contract signed? (yes/no)") == "yes"
+        values = {
+            "client_id": client_id,
+            "total_amount": Prompt.ask("Enter total amount"),
+            "amount_due": Prompt.ask("Enter amount due"),
+            "creation_date": Prompt.ask("Enter creation date (YYYY-MM-DD)"),
+            "signed": Prompt.ask("Is the contract signed? (yes/no)") == "yes",
+        }
 
         # Faire une demande de confirmation avant l'envoi
         confirmation = Prompt.ask("Are you sure the information is correct? (yes/no)", choices=["yes", "no"])
@@ -276,18 +505,11 @@ class DataController:
             self.auth_controller.console.print("[bold yellow]Action canceled.[/bold yellow]")
             return
 
-        new_contract = Contract(
-            client_id=client_id,
-            # description=description,
-            commercial_contact=self.auth_controller.current_user.full_name,
-            total_amount=float(total_amount),
-            amount_due=float(amount_due),
-            creation_date=creation_date,
-            signed=is_signed,
-            user_id=self.auth_controller.current_user.id,
-        )
-
-        self.db.add(new_contract)
+        try:
+            self.add_contract(values)
+        except (PermissionError, ValueError) as e:
+            self.print_error(e)
+            return
         self.db.commit()
         self.data_view.console.print(
             f"[bold green]Contract for client ID '{client_id}' created successfully.[/bold green]"
@@ -297,39 +519,34 @@ class DataController:
         """
         Met à jour un contrat existant.
         """
-        contract = self.db.query(Contract).filter_by(id=contract_id).first()
-        if not contract:
-            self.data_view.console.print("[bold red]Contract not found.[/bold red]")
+        try:
+            contract = self.authorize_contract_update(contract_id).contract
+        except (LookupError, PermissionError) as e:
+            self.print_error(e)
             return
 
-        client = self.db.query(Client).filter_by(id=contract.client_id).first()
-
         # Vérification si l'utilisateur est un admin
-        if self.auth_controller.current_user.role.name == "Admin":
+        if permissions.rule(self.current_role(), "update_contract") is permissions.ANY:
             self.data_view.console.print(
                 "[bold green]Admin privileges granted. You can update any contract.[/bold green]"
             )
-        else:
-            # Si l'utilisateur est un commercial, vérifier s'il est autorisé à modifier le contrat de ses clients
-            if client.commercial_contact != self.auth_controller.current_user.full_name:
-                self.data_view.console.print(
-                    "[bold red]Permission denied. You can only update contracts for your own clients.[/bold red]"
-                )
-                return
 
-        new_total_amount = Prompt.ask(
-            f"Enter new total amount (current: {contract.total_amount})", default=str(contract.total_amount)
-        )
-        new_amount_due = Prompt.ask(
-            f"Enter new amount due (current: {contract.amount_due})", default=str(contract.amount_due)
-        )
-        new_creation_date = Prompt.ask(
-            f"Enter new creation date (YYYY-MM-DD) (current: {contract.creation_date})",
-            default=str(contract.creation_date),
-        )
-        new_signed_status = (
-            Prompt.ask(f"Is the contract signed? (yes/no) (current: {'yes' if contract.signed else 'no'})") == "yes"
-        )
+        values = {
+            "total_amount": Prompt.ask(
+                f"Enter new total amount (current: {contract.total_amount})", default=str(contract.total_amount)
+            ),
+            "amount_due": Prompt.ask(
+                f"Enter new amount due (current: {contract.amount_due})", default=str(contract.amount_due)
+            ),
+            "creation_date": Prompt.ask(
+                f"Enter new creation date (YYYY-MM-DD) (current: {contract.creation_date})",
+                default=str(contract.creation_date or ""),
+            ),
+            "signed": Prompt.ask(
+                f"Is the contract signed? (yes/no) (current: {'yes' if contract.signed else 'no'})"
+            )
+            == "yes",
+        }
 
         # Faire une demande de confirmation avant l'envoi
         confirmation = Prompt.ask("Are you sure the information is correct? (yes/no)", choices=["yes", "no"])
@@ -338,11 +555,12 @@ class DataController:
             self.auth_controller.console.print("[bold yellow]Action canceled.[/bold yellow]")
             return
 
-        contract.total_amount = float(new_total_amount)
-        contract.amount_due = float(new_amount_due)
-        contract.creation_date = new_creation_date
-        contract.signed = new_signed_status
-
+        try:
+            self.edit_contract(contract, values)
+        except ValueError as e:
+            self.db.rollback()
+            self.print_error(e)
+            return
         self.db.commit()
         self.data_view.console.print(f"[bold green]Contract '{contract.id}' updated successfully.[/bold green]")
 
@@ -350,9 +568,10 @@ class DataController:
         """
         Supprime un contrat existant.
         """
-        contract = self.db.query(Contract).filter_by(id=contract_id).first()
-        if not contract:
-            self.data_view.console.print("[bold red]Contract not found.[/bold red]")
+        try:
+            contract = self.authorize_admin_deletion(resolve_contract, contract_id, "Contract").contract
+        except (LookupError, PermissionError) as e:
+            self.print_error(e)
             return
 
         # Faire une demande de confirmation avant l'envoi
@@ -370,28 +589,28 @@ class DataController:
         """
         Crée un événement lié à un contrat, accessible uniquement aux commerciaux.
         """
-        if self.auth_controller.current_user.role.name != "Commercial":
-            self.data_view.console.print("[bold red]Permission denied. Only Commercials can create events.[/bold red]")
-            return
-
-        contract_id = Prompt.ask("Enter contract ID")
-        contract = self.db.query(Contract).filter_by(id=contract_id).first()
-        client = self.db.query(Client).filter_by(id=contract.client_id).first()
-        if not contract or client.commercial_contact != self.auth_controller.current_user.full_name:
-            self.data_view.console.print(
-                "[bold red]Permission denied. You can only create events for contracts of your own clients.[/bold red]"
-            )
+        try:
+            self.authorize("create_event", "Permission denied. Only Commercials can create events.")
+            contract_id = Prompt.ask("Enter contract ID")
+            ownership = self.authorize_event_creation(contract_id)
+        except PermissionError as e:
+            self.print_error(e)
             return
 
-        event_name = Prompt.ask("Enter event name")
-        event_date_start = Prompt.ask("Enter event start date (YYYY-MM-DD)")
-        event_date_end = Prompt.ask("Enter event end date (YYYY-MM-DD)")
-        location = Prompt.ask("Enter event location")
-        support_contact = Prompt.ask("Enter support contact")
-        attendees = Prompt.ask("Enter number of attendees")
-        notes = Prompt.ask("Enter notes (optional)", default="")
-        client_id = Prompt.ask("Enter client id")
-        client_contact = Prompt.ask("Enter client contact")
+        values = {
+            "contract_id": contract_id,
+            "event_name": Prompt.ask("Enter event name"),
+            "event_date_start": Prompt.ask("Enter event start date (YYYY-MM-DD)"),
+            "event_date_end": Prompt.ask("Enter event end date (YYYY-MM-DD)"),
+            "location": Prompt.ask("Enter event location"),
+            "support_contact": Prompt.ask(
+                "Enter support contact (ID or full name, leave empty if none)", default=""
+            ),
+            "attendees": Prompt.ask("Enter number of attendees"),
+            "notes": Prompt.ask("Enter notes (optional)", default=""),
+            "client_id": Prompt.ask("Enter client id", default=str(ownership.client.id)),
+            "client_contact": Prompt.ask("Enter client contact"),
+        }
 
         # Faire une demande de confirmation avant l'envoi
         confirmation = Prompt.ask("Are you sure the information is correct? (yes/no)", choices=["yes", "no"])
@@ -400,68 +619,38 @@ class DataController:
             self.auth_controller.console.print("[bold yellow]Action canceled.[/bold yellow]")
             return
 
-        new_event = Event(
-            contract_id=contract_id,
-            event_name=event_name,
-            client_id=client_id,
-            event_date_start=event_date_start,
-            event_date_end=event_date_end,
-            location=location,
-            support_contact=support_contact,
-            attendees=attendees,
-            notes=notes,
-            client_contact=client_contact,
-            user_id=self.auth_controller.current_user.id,
-        )
-
-        self.db.add(new_event)
+        try:
+            event = self.add_event(values)
+        except (LookupError, PermissionError, ValueError) as e:
+            self.print_error(e)
+            return
         self.db.commit()
-        self.data_view.console.print(f"[bold green]Event '{event_name}' created successfully.[/bold green]")
+        self.data_view.console.print(f"[bold green]Event '{event.event_name}' created successfully.[/bold green]")
 
     def update_event(self, event_id):
         """
         Met à jour un événement existant.
+        Les Admins et le commercial du client modifient tous les champs, le support uniquement le nom et le lieu.
         """
-        event = self.db.query(Event).filter_by(id=event_id).first()
-        if not event:
-            self.data_view.console.print("[bold red]Event not found.[/bold red]")
+        try:
+            ownership, fields = self.authorize_event_update(event_id)
+        except (LookupError, PermissionError) as e:
+            self.print_error(e)
             return
 
-        contract = self.db.query(Contract).filter_by(id=event.contract_id).first()
-        client = self.db.query(Client).filter_by(id=contract.client_id).first()
-        # Vérification si l'utilisateur est un admin
-        if self.auth_controller.current_user.role.name == "Admin":
-            event.event_name = Prompt.ask("Enter event name", default=event.event_name)
-            event.location = Prompt.ask("Enter event location", default=event.location)
-            event.support_contact = Prompt.ask("Enter support contact", default=event.support_contact)
-            event.event_date_start = Prompt.ask("Enter event start date", default=str(event.event_date_start))
-            event.event_date_end = Prompt.ask("Enter event end date", default=str(event.event_date_end))
-
-        # Si l'utilisateur est commercial :
-        elif (
-            self.auth_controller.current_user.role.name == "Commercial"
-            and client.commercial_contact == self.auth_controller.current_user.full_name
-        ):
-            event.event_name = Prompt.ask("Enter event name", default=event.event_name)
-            event.location = Prompt.ask("Enter event location", default=event.location)
-            event.support_contact = Prompt.ask("Enter support contact", default=event.support_contact)
-            event.event_date_start = Prompt.ask("Enter event start date", default=str(event.event_date_start))
-            event.event_date_end = Prompt.ask("Enter event end date", default=str(event.event_date_end))
-
-        # Si l'utilisateur est support :
-        elif (
-            self.auth_controller.current_user.role.name == "Support"
-            and event.support_contact == self.auth_controller.current_user.full_name
-        ):
-            event.event_name = Prompt.ask("Enter event name", default=event.event_name)
-            event.location = Prompt.ask("Enter event location", default=event.location)
-
-        # Si l'utilisateur n'a pas les droits requis
-        else:
-            self.data_view.console.print(
-                "[bold red]Permission denied. You can only update events you are responsible for.[/bold red]"
+        event = ownership.entity
+        values = {
+            "event_name": Prompt.ask("Enter event name", default=event.event_name),
+            "location": Prompt.ask("Enter event location", default=event.location),
+        }
+        if "support_contact" in fields:
+            values["support_contact"] = Prompt.ask(
+                "Enter support contact (ID or full name, leave empty if none)", default=event.support_contact or ""
             )
-            return
+            values["event_date_start"] = Prompt.ask(
+                "Enter event start date", default=str(event.event_date_start or "")
+            )
+            values["event_date_end"] = Prompt.ask("Enter event end date", default=str(event.event_date_end or ""))
 
         # Faire une demande de confirmation avant l'envoi
         confirmation = Prompt.ask("Are you sure the information is correct? (yes/no)", choices=["yes", "no"])
@@ -470,6 +659,12 @@ class DataController:
             self.auth_controller.console.print("[bold yellow]Action canceled.[/bold yellow]")
             return
 
+        try:
+            self.edit_event(event, values, fields)
+        except (LookupError, ValueError) as e:
+            self.db.rollback()
+            self.print_error(e)
+            return
         self.db.commit()
         self.data_view.console.print(f"[bold green]Event '{event.event_name}' updated successfully.[/bold green]")
 
@@ -477,9 +672,10 @@ class DataController:
         """
         Supprime un événement existant.
         """
-        event = self.db.query(Event).filter_by(id=event_id).first()
-        if not event:
-            self.data_view.console.print("[bold red]Event not found.[/bold red]")
+        try:
+            event = self.authorize_admin_deletion(resolve_event, event_id, "Event").entity
+        except (LookupError, PermissionError) as e:
+            self.print_error(e)
             return
 
         # Faire une demande de confirmation avant l'envoi
@@ -493,36 +689,20 @@ class DataController:
         self.db.commit()
         self.data_view.console.print(f"[bold green]Event '{event.event_name}' deleted successfully.[/bold green]")
 
-    def sign_contract(self, contract_id):
-        """
-        Signe un contrat existant et enregistre l'événement.
-        """
-        try:
-            contract = self.db.query(Contract).filter(Contract.id == contract_id).first()
-            if contract:
-                contract.signed = True
-                self.db.commit()
-                sentry_sdk.capture_message(
-                    f"Contract {contract_id} signed by {self.auth_controller.current_user.email}", level="info"
-                )
-            else:
-                self.data_view.console.print(f"[bold red]Contract {contract_id} not found.[/bold red]")
-        except Exception as e:
-            sentry_sdk.capture_exception(e)
-        raise
-
     def create_collaborator(self):
         """
         Crée un nouveau collaborateur (utilisateur) dans le système.
         """
         try:
             self.data_view.console.print("[bold green]Create a New Collaborator[/bold green]")
-            employee_number = Prompt.ask("Enter employee number")
-            full_name = Prompt.ask("Enter full name")
-            email = Prompt.ask("Enter email")
-            department = Prompt.ask("Enter department")
-            role_name = Prompt.ask("Enter role (Admin/Commercial/Support)")
-            password = Prompt.ask("Enter password", password=True)
+            values = {
+                "employee_number": Prompt.ask("Enter employee number"),
+                "full_name": Prompt.ask("Enter full name"),
+                "email": Prompt.ask("Enter email"),
+                "department": Prompt.ask("Enter department"),
+                "role": Prompt.ask("Enter role (Admin/Commercial/Support)"),
+                "password": Prompt.ask("Enter password", password=True),
+            }
 
             # Faire une demande de confirmation avant l'envoi
             confirmation = Prompt.ask("Are you sure the information is correct? (yes/no)", choices=["yes", "no"])
@@ -532,25 +712,19 @@ class DataController:
                 return
 
             # Création d'un collaborateur
-            result = self.auth_controller.signup_user(
-                employee_number=employee_number,
-                full_name=full_name,
-                email=email,
-                department=department,
-                role_name=role_name,
-                password=password,
-            )
-
-            if result:
-                self.data_view.console.print(
-                    f"[bold green]Collaborator {full_name} created successfully![/bold green]"
-                )
-            else:
-                self.data_view.console.print(f"[bold red]Failed to create collaborator. Please try again.[/bold red]")
-            sentry_sdk.capture_message(
-                f"Collaborator {full_name} created by {self.auth_controller.current_user.email}", level="info"
+            try:
+                user = self.add_collaborator(values)
+            except (LookupError, PermissionError, ValueError) as e:
+                self.print_error(e)
+                self.data_view.console.print("[bold red]Failed to create collaborator. Please try again.[/bold red]")
+                return
+            self.db.commit()
+            self.data_view.console.print(
+                f"[bold green]Collaborator {user.full_name} created successfully![/bold green]"
             )
         except Exception as e:
+            import sentry_sdk
+
             sentry_sdk.capture_exception(e)
             raise
 
@@ -561,16 +735,19 @@ class DataController:
         try:
             self.data_view.console.print("[bold green]Update Collaborator Information[/bold green]")
 
-            user = self.db.query(User).filter(User.id == collaborator_id).first()
-            if not user:
-                self.data_view.console.print(f"[bold red]Collaborator with ID {collaborator_id} not found.[/bold red]")
+            try:
+                user = self.authorize_collaborator_change(collaborator_id)
+            except (LookupError, PermissionError) as e:
+                self.print_error(e)
                 return
 
-            full_name = Prompt.ask(f"Enter full name [{user.full_name}]") or user.full_name
-            email = Prompt.ask(f"Enter email [{user.email}]") or user.email
-            department = Prompt.ask(f"Enter department [{user.department}]") or user.department
-            role_name = Prompt.ask(f"Enter role [{user.role.name}]") or user.role.name
-            password = Prompt.ask("Enter new password (leave empty to keep current)", password=True) or None
+            values = {
+                "full_name": Prompt.ask(f"Enter full name [{user.full_name}]") or user.full_name,
+                "email": Prompt.ask(f"Enter email [{user.email}]") or user.email,
+                "department": Prompt.ask(f"Enter department [{user.department}]") or user.department,
+                "role": Prompt.ask(f"Enter role [{user.role.name}]") or user.role.name,
+                "password": Prompt.ask("Enter new password (leave empty to keep current)", password=True) or None,
+            }
 
             # Faire une demande de confirmation avant l'envoi
             confirmation = Prompt.ask("Are you sure the information is correct? (yes/no)", choices=["yes", "no"])
@@ -580,20 +757,19 @@ class DataController:
                 return
 
             # Mise à jour des informations d'un collaborateur
-            user.full_name = full_name
-            user.email = email
-            user.department = department
-            user.role = self.db.query(Role).filter(Role.name == role_name).first()
-
-            if password:
-                user.set_password(password)
-
+            try:
+                self.edit_collaborator(user, values)
+            except (LookupError, ValueError) as e:
+                self.db.rollback()
+                self.print_error(e)
+                return
             self.db.commit()
-            self.data_view.console.print(f"[bold green]Collaborator {full_name} updated successfully![/bold green]")
-            sentry_sdk.capture_message(
-                f"Collaborator {user.full_name} updated by {self.auth_controller.current_user.email}", level="info"
+            self.data_view.console.print(
+                f"[bold green]Collaborator {user.full_name} updated successfully![/bold green]"
             )
         except Exception as e:
+            import sentry_sdk
+
             sentry_sdk.capture_exception(e)
             raise
 
@@ -604,9 +780,10 @@ class DataController:
         try:
             self.data_view.console.print("[bold red]Delete Collaborator[/bold red]")
 
-            user = self.db.query(User).filter(User.id == collaborator_id).first()
-            if not user:
-                self.data_view.console.print(f"[bold red]Collaborator with ID {collaborator_id} not found.[/bold red]")
+            try:
+                user = self.authorize_collaborator_change(collaborator_id)
+            except (LookupError, PermissionError) as e:
+                self.print_error(e)
                 return
 
             # Faire une demande de confirmation avant l'envoi
@@ -616,13 +793,12 @@ class DataController:
                 self.auth_controller.console.print("[bold yellow]Action canceled.[/bold yellow]")
                 return
 
-            self.db.delete(user)
+            self.remove_collaborator(user)
             self.db.commit()
             self.data_view.console.print(f"[bold red]Collaborator {user.full_name} deleted successfully![/bold red]")
-            sentry_sdk.capture_message(
-                f"Collaborator {user.full_name} deleted by {self.auth_controller.current_user.email}", level="info"
-            )
         except Exception as e:
+            import sentry_sdk
+
             sentry_sdk.capture_exception(e)
             raise
 
@@ -630,15 +806,336 @@ class DataController:
         """
         Filtrer les événements qui n'ont pas de contact support assigné. Accessible uniquement aux Admins.
         """
-        if self.auth_controller.current_user.role.name != "Admin":
-            self.data_view.console.print(
-                "[bold red]Permission denied. Only Admins can filter events without support contact.[/bold red]"
-            )
+        try:
+            query, keys = self.events_without_support_query()
+        except PermissionError as e:
+            self.print_error(e)
             return
 
-        events_without_support = self.db.query(Event).filter(Event.support_contact == None).all()
+        self.browse(
+            query,
+            keys,
+            self.data_view.display_events,
+            empty_message="No events found without support contact.",
+        )
+
+    # Opérations sans saisie : partagées par le menu interactif et la ligne de commande (CommandController).
+    # Elles vérifient les permissions, valident les valeurs et modifient la session sans la valider (commit) :
+    # l'appelant décide de la transaction. Les erreurs sont levées (PermissionError, LookupError, ValueError).
+
+    def authorize(self, action, message, ownership=None):
+        """
+        Vérifie dans la table des permissions (voir controllers/permissions.py) que l'utilisateur connecté peut
+        effectuer l'action, sur l'entité résolue si elle est fournie ; sinon lève PermissionError avec le message
+        fourni. Retourne le prédicat de propriété appliqué.
+        """
+        user = self.auth_controller.current_user
+        return permissions.require(self.current_role(), action, message, user.id if user else None, ownership)
+
+    def restrict(self, query, action, model, message):
+        """
+        Restreint une liste aux entités sur lesquelles l'utilisateur connecté peut effectuer l'action,
+        par une condition SQL ; lève PermissionError avec le message fourni si l'action n'est pas autorisée.
+        """
+        user = self.auth_controller.current_user
+        return permissions.restrict(query, self.current_role(), action, model, user.id if user else None, message)
+
+    def current_role(self):
+        """
+        Retourne le nom du rôle de l'utilisateur connecté (None s'il n'est pas connecté ou n'a pas de rôle),
+        lu dans le cache des collaborateurs (voir controllers/principal_cache.py) plutôt qu'en base.
+        """
+        return principal_cache.role_of(self.db, self.auth_controller.current_user)
+
+    def parse_values(self, model, values, fields):
+        """
+        Vérifie que seuls des champs modifiables sont fournis et convertit les valeurs vers le type des colonnes.
+        """
+        unknown = [name for name in values if name not in fields]
+        if unknown:
+            raise ValueError(f"Unknown or read-only field(s) for {model.__tablename__}: {', '.join(unknown)}")
+        table = model.__table__
+        return {
+            name: convert_value(table.c[name].type, value) if name in table.c else value
+            for name, value in values.items()
+        }
+
+    def authorize_client_update(self, client_id):
+        """
+        Charge un client modifiable par l'utilisateur connecté (son commercial uniquement).
+        """
+        ownership = resolve_client(self.db, client_id)
+        if not ownership:
+            raise LookupError("Client not found.")
+        self.authorize(
+            "update_client", "Permission denied. You can only update clients you are responsible for.", ownership
+        )
+        return ownership
+
+    def authorize_client_deletion(self, client_id):
+        """
+        Charge un client supprimable par l'utilisateur connecté (Admins uniquement).
+        """
+        self.authorize("delete_client", "Deleting clients is not allowed according to the business rules.")
+        ownership = resolve_client(self.db, client_id)
+        if not ownership:
+            raise LookupError("Client not found.")
+        return ownership
+
+    def authorize_admin_deletion(self, resolver, entity_id, label):
+        """
+        Charge un contrat ou un événement supprimable par l'utilisateur connecté (Admins uniquement).
+        """
+        self.authorize(f"delete_{label.lower()}", f"Permission denied. Only Admins can delete {label.lower()}s.")
+        ownership = resolver(self.db, entity_id)
+        if not ownership:
+            raise LookupError(f"{label} not found.")
+        return ownership
+
+    def authorize_contract_creation(self, client_id):
+        """
+        Charge le client pour lequel le commercial connecté crée un contrat (ses propres clients uniquement).
+        """
+        message = "Permission denied. You can only create contracts for your own clients."
+        ownership = resolve_client(self.db, client_id)
+        if not ownership:
+            raise PermissionError(message)
+        self.authorize("create_contract", message, ownership)
+        return ownership
+
+    def authorize_contract_update(self, contract_id):
+        """
+        Charge un contrat modifiable par l'utilisateur connecté (Admins, ou le commercial de son client).
+        """
+        ownership = resolve_contract(self.db, contract_id)
+        if not ownership:
+            raise LookupError("Contract not found.")
+        self.authorize(
+            "update_contract", "Permission denied. You can only update contracts for your own clients.", ownership
+        )
+        return ownership
+
+    def authorize_event_creation(self, contract_id):
+        """
+        Charge le contrat pour lequel le commercial connecté crée un événement
+        (contrats de ses clients uniquement).
+        """
+        message = "Permission denied. You can only create events for contracts of your own clients."
+        ownership = resolve_contract(self.db, contract_id)
+        if not ownership:
+            raise PermissionError(message)
+        self.authorize("create_event", message, ownership)
+        return ownership
+
+    def authorize_event_update(self, event_id):
+        """
+        Charge un événement modifiable par l'utilisateur connecté et retourne (ownership, champs modifiables).
+        """
+        ownership = resolve_event(self.db, event_id)
+        if not ownership:
+            raise LookupError("Event not found.")
+        predicate = self.authorize(
+            "update_event", "Permission denied. You can only update events you are responsible for.", ownership
+        )
+        return ownership, SUPPORT_EVENT_FIELDS if predicate is permissions.SUPPORT else EVENT_FIELDS
+
+    def authorize_collaborator_change(self, collaborator_id):
+        """
+        Charge un collaborateur modifiable ou supprimable par l'utilisateur connecté (Admins uniquement).
+        """
+        self.authorize("manage_collaborators", "Permission denied. Only Admins can manage collaborators.")
+        user = self.db.query(User).filter(User.id == collaborator_id).first()
+        if not user:
+            raise LookupError(f"Collaborator with ID {collaborator_id} not found.")
+        return user
 
-        if not events_without_support:
-            self.data_view.console.print("[bold yellow]No events found without support contact.[/bold yellow]")
+    def add_client(self, values):
+        """
+        Ajoute un client dont le commercial est l'utilisateur connecté.
+        """
+        self.authorize("create_client", "Permission denied. Only Commercials can create clients.")
+        user = self.auth_controller.current_user
+        client = Client(
+            **self.parse_values(Client, values, CLIENT_FIELDS),
+            commercial_contact=user.full_name,
+            commercial_id=user.id,
+        )
+        self.db.add(client)
+        self.db.flush()
+        return client
+
+    def edit_client(self, client, values):
+        """
+        Applique les valeurs fournies à un client déjà autorisé (voir authorize_client_update).
+        """
+        for name, value in self.parse_values(Client, values, CLIENT_FIELDS).items():
+            setattr(client, name, value)
+        self.db.flush()
+        return client
+
+    def add_contract(self, values):
+        """
+        Ajoute un contrat pour l'un des clients du commercial connecté.
+        """
+        self.authorize("create_contract", "Permission denied. Only Commercials can create contracts.")
+        values = dict(values)
+        ownership = self.authorize_contract_creation(values.pop("client_id", None))
+        user = self.auth_controller.current_user
+        contract = Contract(
+            **self.parse_values(Contract, values, CONTRACT_FIELDS),
+            client_id=ownership.client.id,
+            commercial_contact=user.full_name,
+            commercial_id=user.id,
+            user_id=user.id,
+        )
+        self.db.add(contract)
+        self.db.flush()
+        return contract
+
+    def edit_contract(self, contract, values):
+        """
+        Applique les valeurs fournies à un contrat déjà autorisé (voir authorize_contract_update).
+        """
+        for name, value in self.parse_values(Contract, values, CONTRACT_FIELDS).items():
+            setattr(contract, name, value)
+        self.db.flush()
+        return contract
+
+    def sign_contract(self, contract_id):
+        """
+        Signe un contrat existant et enregistre l'événement.
+        """
+        contract = self.authorize_contract_update(contract_id).contract
+        contract.signed = True
+        self.db.flush()
+        self.audit("contract.signed", "contracts", contract.id, f"Contract {contract_id} signed")
+        return contract
+
+    def add_event(self, values):
+        """
+        Ajoute un événement pour un contrat de l'un des clients du commercial connecté.
+        Le client de l'événement est, par défaut, celui du contrat.
+        """
+        self.authorize("create_event", "Permission denied. Only Commercials can create events.")
+        values = dict(values)
+        ownership = self.authorize_event_creation(values.pop("contract_id", None))
+        client_id = values.pop("client_id", None) or ownership.client.id
+        event = Event(contract_id=ownership.contract.id, user_id=self.auth_controller.current_user.id)
+        event.client_id = convert_value(Event.__table__.c.client_id.type, client_id)
+        self.apply_event_values(event, self.parse_values(Event, values, EVENT_FIELDS))
+        self.db.add(event)
+        self.db.flush()
+        return event
+
+    def edit_event(self, event, values, fields=None):
+        """
+        Applique les valeurs fournies à un événement déjà autorisé, limitées aux champs
+        retournés par authorize_event_update.
+        """
+        self.apply_event_values(event, self.parse_values(Event, values, fields or EVENT_FIELDS))
+        self.db.flush()
+        return event
+
+    def apply_event_values(self, event, values):
+        """
+        Affecte les valeurs converties à l'événement ; le contact support (ID ou nom complet)
+        est résolu vers le collaborateur Support correspondant.
+        """
+        if "support_contact" in values:
+            support = self.resolve_support_contact(values.pop("support_contact"))
+            event.support_id = support.id if support else None
+            event.support_contact = support.full_name if support else None
+        for name, value in values.items():
+            setattr(event, name, value)
+
+    def resolve_support_contact(self, value):
+        """
+        Retrouve le collaborateur Support à partir de son ID ou de son nom complet.
+        Retourne None si aucun contact n'est saisi et lève LookupError si le collaborateur est introuvable.
+        """
+        value = str(value or "").strip()
+        if not value:
+            return None
+
+        query = self.db.query(User).join(User.role).filter(Role.name == "Support")
+        if value.isdigit():
+            support = query.filter(User.id == int(value)).first()
         else:
-            self.data_view.display_events(events_without_support)
+            support = query.filter(User.full_name == value).order_by(User.id).first()
+
+        if not support:
+            raise LookupError(f"Support collaborator '{value}' not found.")
+        return support
+
+    def remove(self, entity):
+        """
+        Supprime une entité déjà autorisée (client, contrat ou événement).
+        """
+        self.db.delete(entity)
+        self.db.flush()
+
+    def add_collaborator(self, values):
+        """
+        Ajoute un collaborateur (Admins uniquement) ; l'email doit être unique et le rôle exister.
+        """
+        self.authorize("manage_collaborators", "Permission denied. Only Admins can manage collaborators.")
+        values = dict(values)
+        missing = [name for name in ("full_name", "email", "role", "password") if not values.get(name)]
+        if missing:
+            raise ValueError(f"Missing field(s) for the collaborator: {', '.join(missing)}")
+        if self.db.query(User).filter(User.email == values["email"]).first():
+            raise ValueError(f"User with email {values['email']} already exists.")
+
+        user = User()
+        self.apply_collaborator_values(user, values)
+        self.db.add(user)
+        self.db.flush()
+        principal_cache.invalidate_on_commit(self.db, user.email)
+        self.audit("collaborator.created", "users", user.id, f"Collaborator {user.full_name} created")
+        return user
+
+    def edit_collaborator(self, user, values):
+        """
+        Applique les valeurs fournies à un collaborateur déjà autorisé ; un mot de passe vide est conservé.
+        """
+        previous_email = user.email
+        self.apply_collaborator_values(user, values)
+        self.db.flush()
+        principal_cache.invalidate_on_commit(self.db, previous_email, user.email)
+        self.audit("collaborator.updated", "users", user.id, f"Collaborator {user.full_name} updated")
+        return user
+
+    def apply_collaborator_values(self, user, values):
+        """
+        Affecte les valeurs d'un collaborateur : le rôle est donné par son nom et le mot de passe est haché.
+        """
+        values = dict(values)
+        role_name = values.pop("role", None)
+        password = values.pop("password", None)
+        for name, value in self.parse_values(User, values, COLLABORATOR_FIELDS).items():
+            setattr(user, name, value)
+        if role_name:
+            role = principal_cache.get_role(self.db, role_name)
+            if not role:
+                raise LookupError("Role not found.")
+            user.role = role
+        if password:
+            user.set_password(password)
+
+    def audit(self, action, entity, entity_id, description):
+        """
+        Trace un événement métier de l'utilisateur connecté ("<description> by <email>").
+        L'événement est émis en arrière-plan, après validation de la transaction.
+        """
+        actor = self.auth_controller.current_user.email
+        audit.record(self.db, action, f"{description} by {actor}", actor=actor, entity=entity, entity_id=entity_id)
+
+    def remove_collaborator(self, user):
+        """
+        Supprime un collaborateur déjà autorisé ; tous ses jetons sont révoqués avec la suppression.
+        """
+        self.db.delete(user)
+        self.db.flush()
+        principal_cache.invalidate_on_commit(self.db, user.email)
+        tokens.revoke_subject(self.db, user.email)
+        self.audit("collaborator.deleted", "users", user.id, f"Collaborator {user.full_name} deleted")
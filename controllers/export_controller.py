@@ -0,0 +1,208 @@
+import csv
+import datetime
+import json
+import time
+from dataclasses import dataclass
+from sqlalchemy import Boolean, Date, Float, Integer, Numeric, select
+from sqlalchemy.orm import Session
+from controllers import permissions
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """
+    Décrit l'export d'une table : le modèle et la colonne de date utilisée par le filtre --since.
+    """
+
+    model: type
+    since_column: str
+
+
+SPECS = {
+    "clients": ExportSpec(model=Client, since_column="last_contact_date"),
+    "contracts": ExportSpec(model=Contract, since_column="creation_date"),
+    "events": ExportSpec(model=Event, since_column="event_date_start"),
+}
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+
+@dataclass
+class ExportReport:
+    """
+    Bilan d'un export : nombre de lignes écrites et durée.
+    """
+
+    entity: str
+    rows: int = 0
+    elapsed: float = 0.0
+
+
+class ExportController:
+    """
+    Exporte en flux les clients, contrats ou événements vers CSV, JSONL ou Parquet.
+    Les lignes sont lues par lots via un curseur côté serveur (yield_per / stream_results) et écrites
+    au fil de l'eau : la mémoire utilisée ne dépend pas de la taille de la table.
+    """
+
+    DEFAULT_BATCH_SIZE = 1000
+
+    def __init__(self, db: Session, user, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Initialise le contrôleur d'export avec la session, l'utilisateur connecté et la taille des lots.
+        """
+        self.db = db
+        self.user = user
+        self.batch_size = batch_size
+
+    def build_query(self, entity, columns=None, since=None, mine=False):
+        """
+        Construit la requête d'export en appliquant les règles de visibilité des listes (actions `view_<entité>`
+        de la table des permissions), la sélection de colonnes et le filtre de date ; l'option `mine` restreint
+        l'export au portefeuille de l'utilisateur (actions `view_own_<entité>`). Lève PermissionError
+        ou ValueError si la demande n'est pas valide.
+        """
+        if entity not in SPECS:
+            raise ValueError(f"Unknown entity '{entity}'. Expected one of: {', '.join(SPECS)}")
+        role = self.user.role.name if self.user and self.user.role else None
+        permissions.require(role, f"view_{entity}", f"Permission denied. You cannot export {entity}.")
+
+        spec = SPECS[entity]
+        table = spec.model.__table__
+        names = columns or [column.name for column in table.columns]
+        unknown = [name for name in names if name not in table.c]
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {entity}: {', '.join(unknown)}")
+
+        query = select(*[table.c[name] for name in names]).order_by(table.c.id)
+        if since is not None:
+            query = query.where(table.c[spec.since_column] >= since)
+        if mine:
+            message = f"There is no personal portfolio of {entity} for the {role} role."
+            query = permissions.restrict(query, role, f"view_own_{entity}", spec.model, self.user.id, message)
+        return query
+
+    def stream(self, query):
+        """
+        Exécute la requête avec un curseur côté serveur et produit les lignes par lots.
+        """
+        result = self.db.execute(query.execution_options(yield_per=self.batch_size, stream_results=True))
+        try:
+            for partition in result.partitions():
+                yield partition
+        finally:
+            result.close()
+
+    def export(self, entity, output, file_format="csv", columns=None, since=None, mine=False):
+        """
+        Exporte l'entité vers `output` (chemin de fichier, ou flux texte pour CSV / JSONL) et retourne le bilan.
+        """
+        if file_format not in FORMATS:
+            raise ValueError(f"Unsupported format '{file_format}'. Expected one of: {', '.join(FORMATS)}")
+
+        query = self.build_query(entity, columns, since, mine)
+        report = ExportReport(entity=entity)
+        started = time.perf_counter()
+
+        writer = {"csv": self.write_csv, "jsonl": self.write_jsonl, "parquet": self.write_parquet}[file_format]
+        report.rows = writer(query, output)
+
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def write_csv(self, query, output):
+        """
+        Écrit les lignes au format CSV, avec une ligne d'en-tête.
+        """
+        with self.open_text(output) as stream:
+            writer = csv.writer(stream)
+            writer.writerow([column.name for column in query.selected_columns])
+            count = 0
+            for partition in self.stream(query):
+                writer.writerows(partition)
+                count += len(partition)
+            return count
+
+    def write_jsonl(self, query, output):
+        """
+        Écrit une ligne JSON par enregistrement.
+        """
+        names = [column.name for column in query.selected_columns]
+        with self.open_text(output) as stream:
+            count = 0
+            for partition in self.stream(query):
+                for row in partition:
+                    stream.write(json.dumps(dict(zip(names, row)), default=self.serialize) + "\n")
+                count += len(partition)
+            return count
+
+    def write_parquet(self, query, output):
+        """
+        Écrit un fichier Parquet, un groupe de lignes par lot (nécessite pyarrow).
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet export requires the 'pyarrow' package (pip install pyarrow).")
+        if not isinstance(output, str):
+            raise ValueError("Parquet export needs an output file path.")
+
+        schema = pa.schema([(column.name, self.arrow_type(pa, column.type)) for column in query.selected_columns])
+
+        count = 0
+        with pq.ParquetWriter(output, schema) as writer:
+            for partition in self.stream(query):
+                columns = list(zip(*partition))
+                writer.write_table(pa.Table.from_arrays([list(values) for values in columns], schema=schema))
+                count += len(partition)
+        return count
+
+    @staticmethod
+    def arrow_type(pa, column_type):
+        """
+        Type Arrow d'une colonne ; les montants (Numeric) restent exacts en decimal128.
+        Float est testé avant Numeric, dont il hérite.
+        """
+        if isinstance(column_type, Float):
+            return pa.float64()
+        if isinstance(column_type, Numeric):
+            return pa.decimal128(column_type.precision or 38, column_type.scale or 0)
+        types = {Integer: pa.int64(), Boolean: pa.bool_(), Date: pa.date32()}
+        return next((arrow for sql, arrow in types.items() if isinstance(column_type, sql)), pa.string())
+
+    def open_text(self, output):
+        """
+        Ouvre la destination en écriture texte ; un flux déjà ouvert (stdout) est utilisé tel quel.
+        """
+        if isinstance(output, str):
+            return open(output, "w", newline="", encoding="utf-8")
+        return _KeepOpen(output)
+
+    @staticmethod
+    def serialize(value):
+        """
+        Sérialise les dates (et tout autre type non JSON) pour l'export JSONL.
+        """
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.isoformat()
+        return str(value)
+
+
+class _KeepOpen:
+    """
+    Enveloppe un flux déjà ouvert pour l'utiliser dans un bloc `with` sans le fermer.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __enter__(self):
+        return self.stream
+
+    def __exit__(self, *exc):
+        self.stream.flush()
+        return False
@@ -0,0 +1,170 @@
+import datetime
+import decimal
+from dataclasses import dataclass
+from sqlalchemy import BigInteger, cast, false, func, literal_column, select
+from sqlalchemy.orm import Session
+from models.contract_model import Contract
+
+"""
+Rapports financiers vectorisés (nécessite numpy) : les colonnes des contrats sont lues en bloc dans des tableaux
+NumPy, les montants en centimes entiers (int64, donc exacts), puis agrégés sans boucle Python par contrat.
+"""
+
+"""
+Bornes (en jours depuis la création du contrat) des tranches d'ancienneté des restes à payer.
+"""
+AGEING_BOUNDS = (30, 60, 90)
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def require_numpy():
+    """
+    Importe numpy, dépendance optionnelle réservée aux rapports.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ValueError("Financial reports require the 'numpy' package (pip install numpy).")
+    return numpy
+
+
+def cents(column):
+    """
+    Expression SQL d'un montant en centimes entiers (0 si absent).
+    """
+    return cast(func.round(func.coalesce(column, 0) * 100), BigInteger)
+
+
+def epoch_days(db, column):
+    """
+    Expression SQL d'une date en nombre de jours depuis le 1970-01-01, la représentation de datetime64[D] ;
+    une date absente vaut le plus petit int64, c'est-à-dire NaT. Évite de construire un objet date par contrat.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        days = column.op("-")(literal_column("DATE '1970-01-01'"))
+    else:
+        days = func.julianday(column) - 2440587.5
+    return func.coalesce(cast(days, BigInteger), -(2**63))
+
+
+def to_amount(value):
+    """
+    Convertit un nombre de centimes en montant exact (Decimal à deux décimales).
+    """
+    return decimal.Decimal(int(value)).scaleb(-2)
+
+
+@dataclass
+class ContractColumns:
+    """
+    Colonnes des contrats chargées en tableaux NumPy, une case par contrat : client et commercial (-1 si absent),
+    montant total et reste à payer en centimes, signature et date de création (NaT si absente).
+    """
+
+    client_id: object
+    commercial_id: object
+    total_cents: object
+    due_cents: object
+    signed: object
+    creation_date: object
+
+    def __len__(self):
+        return len(self.client_id)
+
+
+def load_columns(db: Session, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Lit les colonnes utiles de tous les contrats par lots (une seule requête) et les retourne en tableaux NumPy.
+    """
+    np = require_numpy()
+    query = select(
+        func.coalesce(Contract.client_id, -1),
+        func.coalesce(Contract.commercial_id, -1),
+        cents(Contract.total_amount),
+        cents(Contract.amount_due),
+        func.coalesce(Contract.signed, false()),
+        epoch_days(db, Contract.creation_date),
+    ).execution_options(yield_per=batch_size)
+
+    chunks = [[] for _ in range(6)]
+    for partition in db.connection().execute(query).partitions():
+        for chunk, values in zip(chunks, zip(*partition)):
+            chunk.append(np.fromiter(values, dtype="int64", count=len(values)))
+
+    arrays = [np.concatenate(chunk) if chunk else np.array([], dtype="int64") for chunk in chunks]
+    arrays[4] = arrays[4].astype(bool)
+    arrays[5] = arrays[5].astype("datetime64[D]")
+    return ContractColumns(*arrays)
+
+
+def totals(columns):
+    """
+    Totaux globaux : nombre de contrats, contrats signés, chiffre d'affaires signé et reste à payer.
+    """
+    return {
+        "contracts": len(columns),
+        "signed_contracts": int(columns.signed.sum()),
+        "signed_revenue": to_amount(columns.total_cents[columns.signed].sum()),
+        "amount_due": to_amount(columns.due_cents.sum()),
+    }
+
+
+def ageing(columns, today=None, bounds=AGEING_BOUNDS):
+    """
+    Répartit les contrats ayant un reste à payer par ancienneté (jours depuis leur création) :
+    une tranche par intervalle de `bounds`, plus une tranche pour les contrats sans date.
+    """
+    np = require_numpy()
+    today = np.datetime64(today or datetime.date.today(), "D")
+    unpaid = columns.due_cents > 0
+    dated = unpaid & ~np.isnat(columns.creation_date)
+    age = (today - columns.creation_date[dated]).astype("int64")
+    bucket = np.searchsorted(np.array(bounds), age, side="left")
+
+    counts = np.bincount(bucket, minlength=len(bounds) + 1)
+    amounts = np.zeros(len(bounds) + 1, dtype="int64")
+    np.add.at(amounts, bucket, columns.due_cents[dated])
+
+    labels = [f"0-{bounds[0]}"] + [f"{low + 1}-{high}" for low, high in zip(bounds, bounds[1:])]
+    labels.append(f">{bounds[-1]}")
+    buckets = [
+        {"bucket": label, "contracts": int(count), "amount_due": to_amount(amount)}
+        for label, count, amount in zip(labels, counts, amounts)
+    ]
+    undated = unpaid & ~dated
+    undated_due = to_amount(columns.due_cents[undated].sum())
+    buckets.append({"bucket": "undated", "contracts": int(undated.sum()), "amount_due": undated_due})
+    return buckets
+
+
+def client_rollup(columns):
+    """
+    Totaux par client (contrats, contrats signés, chiffre d'affaires signé, reste à payer), triés par client ;
+    les contrats sans client sont regroupés sous l'identifiant None. Les sommes sont faites en int64 (exactes).
+    """
+    np = require_numpy()
+    if not len(columns):
+        return []
+    order = np.argsort(columns.client_id, kind="stable")
+    client_id = columns.client_id[order]
+    starts = np.flatnonzero(np.r_[True, client_id[1:] != client_id[:-1]])
+
+    signed = columns.signed[order]
+    contracts = np.diff(np.r_[starts, len(client_id)])
+    signed_contracts = np.add.reduceat(signed.astype("int64"), starts)
+    revenue = np.add.reduceat(np.where(signed, columns.total_cents[order], 0), starts)
+    amount_due = np.add.reduceat(columns.due_cents[order], starts)
+
+    return [
+        {
+            "client_id": int(client) if client >= 0 else None,
+            "contracts": int(count),
+            "signed_contracts": int(signed_count),
+            "signed_revenue": to_amount(revenue_cents),
+            "amount_due": to_amount(due_cents),
+        }
+        for client, count, signed_count, revenue_cents, due_cents in zip(
+            client_id[starts], contracts, signed_contracts, revenue, amount_due
+        )
+    ]
@@ -0,0 +1,555 @@
+import csv
+import datetime
+import decimal
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from sqlalchemy import Boolean, Date, Float, Integer, Numeric, func, insert, select, text
+from sqlalchemy.orm import Session
+from controllers import contract_summary, principal_cache
+from controllers.ownership import sync_contract_commercials
+from models.base_model import dialect_insert
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User, Role
+from models import password_hasher
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    """
+    Décrit l'import d'une table : colonnes acceptées, colonnes obligatoires, clé d'upsert
+    et colonnes de propriétaire (clé étrangère vers users, nom affiché correspondant et rôle attendu).
+    """
+
+    model: type
+    columns: tuple
+    required: tuple
+    conflict_key: str
+    owner_id: str = None
+    owner_name: str = None
+    owner_role: str = None
+
+
+SPECS = {
+    "clients": ImportSpec(
+        model=Client,
+        columns=(
+            "full_name",
+            "email",
+            "phone",
+            "company_name",
+            "first_contact_date",
+            "last_contact_date",
+            "commercial_contact",
+            "commercial_id",
+        ),
+        required=("full_name", "email"),
+        conflict_key="email",
+        owner_id="commercial_id",
+        owner_name="commercial_contact",
+        owner_role="Commercial",
+    ),
+    "contracts": ImportSpec(
+        model=Contract,
+        columns=(
+            "id",
+            "client_id",
+            "commercial_contact",
+            "commercial_id",
+            "total_amount",
+            "amount_due",
+            "creation_date",
+            "signed",
+        ),
+        required=("client_id",),
+        conflict_key="id",
+        owner_id="commercial_id",
+        owner_name="commercial_contact",
+        owner_role="Commercial",
+    ),
+    "events": ImportSpec(
+        model=Event,
+        columns=(
+            "id",
+            "contract_id",
+            "client_id",
+            "event_name",
+            "event_date_start",
+            "event_date_end",
+            "support_contact",
+            "support_id",
+            "location",
+            "attendees",
+            "notes",
+            "client_contact",
+        ),
+        required=("contract_id", "event_name"),
+        conflict_key="id",
+        owner_id="support_id",
+        owner_name="support_contact",
+        owner_role="Support",
+    ),
+    # `role` (nom du rôle) et `password` (en clair) ne sont pas des colonnes : ils deviennent role_id
+    # et password_hash au chargement, les mots de passe étant hachés en parallèle (voir models/password_hasher.py).
+    "collaborators": ImportSpec(
+        model=User,
+        columns=("employee_number", "full_name", "email", "department", "role", "password"),
+        required=("full_name", "email", "role", "password"),
+        conflict_key="email",
+    ),
+}
+
+
+@dataclass
+class ImportReport:
+    """
+    Bilan d'un import : lignes lues, lignes chargées, erreurs par ligne et débit.
+    """
+
+    entity: str
+    total: int = 0
+    imported: int = 0
+    errors: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        """
+        Débit de l'import en lignes chargées par seconde.
+        """
+        return self.imported / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def convert_value(column_type, value):
+    """
+    Convertit une valeur saisie (fichier, ligne de commande ou menu) vers le type de la colonne.
+    """
+    if value is None or (isinstance(value, str) and value.strip() == ""):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+
+    try:
+        if isinstance(column_type, Boolean):
+            if isinstance(value, bool):
+                return value
+            lowered = str(value).lower()
+            if lowered in ("yes", "true", "1", "y"):
+                return True
+            if lowered in ("no", "false", "0", "n"):
+                return False
+            raise ValueError
+        if isinstance(column_type, Integer):
+            return int(value)
+        if isinstance(column_type, Float):
+            return float(value)
+        if isinstance(column_type, Numeric):
+            return parse_decimal(value, column_type.precision, column_type.scale)
+        if isinstance(column_type, Date):
+            return datetime.date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError, decimal.InvalidOperation):
+        raise ValueError(f"invalid value '{value}' for a {column_type.__class__.__name__.lower()} column")
+    return str(value)
+
+
+def parse_decimal(value, precision, scale):
+    """
+    Convertit un montant en Decimal exact, arrondi à `scale` décimales (au centime pour les montants).
+    Les valeurs non finies (NaN, infini) et celles qui dépassent la précision de la colonne sont refusées.
+    """
+    amount = decimal.Decimal(str(value))
+    if not amount.is_finite():
+        raise ValueError
+    if scale is not None:
+        amount = amount.quantize(decimal.Decimal(1).scaleb(-scale), rounding=decimal.ROUND_HALF_UP)
+    if precision is not None and amount and amount.adjusted() >= precision - (scale or 0):
+        raise ValueError
+    return amount
+
+
+def text_value(value):
+    """
+    Valeur d'un champ qui n'est pas une colonne (nom de rôle, mot de passe) : texte tel quel, None si vide.
+    """
+    return str(value) if value not in (None, "") else None
+
+
+class ImportController:
+    """
+    Importe en masse des clients, contrats, événements ou collaborateurs depuis un fichier CSV ou JSONL.
+    Le fichier est lu en flux et traité par lots : chaque lot est validé (types, champs obligatoires,
+    clés étrangères) puis chargé par COPY dans une table temporaire et fusionné (upsert) sur PostgreSQL,
+    ou par executemany sur les autres bases (SQLite pour les tests).
+    """
+
+    DEFAULT_BATCH_SIZE = 1000
+
+    def __init__(self, db: Session, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Initialise le contrôleur d'import avec la session et la taille des lots.
+        """
+        self.db = db
+        self.batch_size = batch_size
+        self._users_by_id = None
+        self._users_by_name = None
+
+    def import_file(self, entity, path, file_format=None):
+        """
+        Importe le fichier `path` dans la table `entity` (clients, contracts, events ou collaborators)
+        et retourne le bilan.
+        Le format est déduit de l'extension si non précisé (csv ou jsonl).
+        """
+        if entity not in SPECS:
+            raise ValueError(f"Unknown entity '{entity}'. Expected one of: {', '.join(SPECS)}")
+        file_format = file_format or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+
+        with open(path, newline="", encoding="utf-8") as source:
+            return self.import_rows(entity, self.read_rows(source, file_format))
+
+    def import_rows(self, entity, rows):
+        """
+        Importe un itérable de couples (numéro de ligne, dictionnaire) par lots et retourne le bilan.
+        """
+        spec = SPECS[entity]
+        report = ImportReport(entity=entity)
+        started = time.perf_counter()
+        moved_contracts = 0
+
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            report.total += len(batch)
+
+            valid = self.validate_batch(spec, batch, report)
+            if not valid:
+                continue
+            try:
+                self.load_batch(spec, valid)
+                if spec.model is Client:
+                    moved_contracts += self.follow_client_commercials(valid)
+                self.db.commit()
+                report.imported += len(valid)
+            except ValueError:
+                # Base non prise en charge (voir executemany_upsert) : l'import entier est interrompu
+                self.db.rollback()
+                raise
+            except Exception as e:
+                self.db.rollback()
+                message = str(e).splitlines()[0]
+                report.errors.extend((line, f"batch rejected by the database: {message}") for line, _ in valid)
+
+        if report.imported and self.db.get_bind().dialect.name == "postgresql" and spec.conflict_key == "id":
+            self.reset_sequence(spec)
+            self.db.commit()
+
+        # Les lots sont écrits sans passer par l'ORM : la synthèse des contrats est recalculée une fois à la fin
+        if (report.imported and spec.model is Contract) or moved_contracts:
+            contract_summary.rebuild(self.db)
+            self.db.commit()
+
+        # Les collaborateurs réimportés ont pu changer de rôle : le cache des permissions est vidé
+        if report.imported and spec.model is User:
+            principal_cache.get_cache(self.db).principals.clear()
+
+        report.errors.sort(key=lambda error: error[0])
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def read_rows(self, source, file_format):
+        """
+        Lit le fichier en flux et produit des couples (numéro de ligne, dictionnaire).
+        """
+        if file_format == "jsonl":
+            for line_number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, {"__error__": f"invalid JSON: {e.msg}"}
+        elif file_format == "csv":
+            reader = csv.DictReader(source)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            raise ValueError(f"Unsupported format '{file_format}'. Expected csv or jsonl.")
+
+    def validate_batch(self, spec, batch, report):
+        """
+        Convertit et valide un lot de lignes. Les lignes invalides sont ajoutées au bilan,
+        les lignes valides sont retournées sous forme de couples (numéro de ligne, valeurs).
+        """
+        table = spec.model.__table__
+        valid = []
+        seen_keys = {}
+
+        for line, raw in batch:
+            if not isinstance(raw, dict):
+                report.errors.append((line, "a row must be an object"))
+                continue
+            if "__error__" in raw:
+                report.errors.append((line, raw["__error__"]))
+                continue
+
+            unknown = sorted(str(name) for name in set(raw) - set(spec.columns))
+            if unknown:
+                report.errors.append((line, f"unknown column(s): {', '.join(unknown)}"))
+                continue
+
+            try:
+                values = {
+                    name: (
+                        self.convert(table.c[name].type, raw.get(name))
+                        if name in table.c
+                        else text_value(raw.get(name))
+                    )
+                    for name in spec.columns
+                }
+            except ValueError as e:
+                report.errors.append((line, str(e)))
+                continue
+
+            missing = [name for name in spec.required if values[name] is None]
+            if missing:
+                report.errors.append((line, f"missing required field(s): {', '.join(missing)}"))
+                continue
+
+            error = self.resolve_owner(spec, values)
+            if error:
+                report.errors.append((line, error))
+                continue
+
+            key = values.get(spec.conflict_key)
+            if key is not None and key in seen_keys:
+                report.errors.append(
+                    (line, f"duplicate {spec.conflict_key} '{key}' (already on line {seen_keys[key]})")
+                )
+                continue
+            if key is not None:
+                seen_keys[key] = line
+
+            valid.append((line, values))
+
+        return self.check_references(spec, valid, report)
+
+    def convert(self, column_type, value):
+        """
+        Convertit une valeur lue dans le fichier vers le type de la colonne.
+        """
+        return convert_value(column_type, value)
+
+    def resolve_owner(self, spec, values):
+        """
+        Complète le propriétaire (commercial ou support) : l'identifiant à partir du nom, ou le nom à partir
+        de l'identifiant, et vérifie qu'il a le rôle attendu (un support ne suit pas de client, un commercial
+        n'est pas affecté à un événement). Les collaborateurs et leurs rôles sont chargés une fois par import.
+        """
+        if spec.owner_id is None:
+            return None
+        if self._users_by_id is None:
+            users = self.db.execute(select(User.id, User.full_name, Role.name).outerjoin(User.role)).all()
+            self._users_by_id = {user_id: (name, role) for user_id, name, role in users}
+            self._users_by_name = {}
+            for user_id, name, _ in sorted(users, key=lambda user: user[0], reverse=True):
+                self._users_by_name[name] = user_id
+
+        owner_id = values.get(spec.owner_id)
+        owner_name = values.get(spec.owner_name)
+        if owner_id is not None:
+            if owner_id not in self._users_by_id:
+                return f"unknown collaborator id {owner_id} for {spec.owner_id}"
+        elif owner_name is not None:
+            if owner_name not in self._users_by_name:
+                return f"unknown collaborator '{owner_name}' for {spec.owner_name}"
+            owner_id = self._users_by_name[owner_name]
+        else:
+            return None
+
+        name, role = self._users_by_id[owner_id]
+        if spec.owner_role is not None and role != spec.owner_role:
+            return f"collaborator {owner_id} ({name}) is not a {spec.owner_role} and cannot be the {spec.owner_id}"
+        values[spec.owner_id], values[spec.owner_name] = owner_id, name
+        return None
+
+    def check_references(self, spec, valid, report):
+        """
+        Vérifie en une requête par lot que les clients et contrats référencés existent.
+        Un contrat prend le commercial de son client (une ligne qui en désigne un autre est rejetée) ;
+        pour les événements, le client est déduit du contrat s'il n'est pas fourni.
+        """
+        if not valid:
+            return valid
+        if spec.model is Contract:
+            client_ids = {values["client_id"] for _, values in valid}
+            owners = {
+                client_id: (commercial_id, commercial_contact)
+                for client_id, commercial_id, commercial_contact in self.db.execute(
+                    select(Client.id, Client.commercial_id, Client.commercial_contact).where(Client.id.in_(client_ids))
+                )
+            }
+            checked = []
+            for line, values in valid:
+                if values["client_id"] not in owners:
+                    report.errors.append((line, f"unknown client_id {values['client_id']}"))
+                    continue
+                commercial_id, commercial_contact = owners[values["client_id"]]
+                if values["commercial_id"] is not None and values["commercial_id"] != commercial_id:
+                    report.errors.append(
+                        (
+                            line,
+                            f"commercial_id {values['commercial_id']} is not the commercial of client "
+                            f"{values['client_id']} ({commercial_id})",
+                        )
+                    )
+                    continue
+                values["commercial_id"], values["commercial_contact"] = commercial_id, commercial_contact
+                checked.append((line, values))
+            return checked
+
+        if spec.model is Event:
+            contract_ids = {values["contract_id"] for _, values in valid}
+            clients_by_contract = dict(
+                self.db.execute(select(Contract.id, Contract.client_id).where(Contract.id.in_(contract_ids))).all()
+            )
+            checked = []
+            for line, values in valid:
+                if values["contract_id"] not in clients_by_contract:
+                    report.errors.append((line, f"unknown contract_id {values['contract_id']}"))
+                    continue
+                if values["client_id"] is None:
+                    values["client_id"] = clients_by_contract[values["contract_id"]]
+                checked.append((line, values))
+            return checked
+
+        if spec.model is User:
+            role_ids = dict(self.db.execute(select(Role.name, Role.id)).all())
+            checked = []
+            for line, values in valid:
+                if values["role"] not in role_ids:
+                    report.errors.append((line, f"unknown role '{values['role']}'"))
+                    continue
+                values["role_id"] = role_ids[values.pop("role")]
+                checked.append((line, values))
+            return checked
+
+        return valid
+
+    def load_batch(self, spec, valid):
+        """
+        Charge un lot validé dans la table cible.
+        """
+        rows = [values for _, values in valid]
+        if spec.model is User:
+            self.hash_passwords(rows)
+        load = self.copy_and_upsert if self.db.get_bind().dialect.name == "postgresql" else self.executemany_upsert
+
+        # Les lignes avec identifiant sont fusionnées sur cet identifiant, les autres sont insérées
+        with_id = [row for row in rows if row.get("id") is not None]
+        without_id = [row for row in rows if row.get("id") is None]
+        for group in (with_id, without_id):
+            if group:
+                load(spec, group)
+
+    def follow_client_commercials(self, valid):
+        """
+        Les contrats des clients importés (éventuellement réaffectés à un autre commercial) suivent
+        le commercial de leur client. Retourne le nombre de contrats modifiés.
+        """
+        emails = [values["email"] for _, values in valid]
+        client_ids = self.db.scalars(select(Client.id).where(Client.email.in_(emails))).all()
+        return sync_contract_commercials(self.db, client_ids)
+
+    def hash_passwords(self, rows):
+        """
+        Remplace le mot de passe en clair de chaque collaborateur par son hash argon2,
+        calculé dans un pool de threads pour tout le lot.
+        """
+        hashes = password_hasher.hash_passwords([row.pop("password") for row in rows])
+        for row, password_hash in zip(rows, hashes):
+            row["password_hash"] = password_hash
+
+    def columns_for(self, spec, rows):
+        """
+        Colonnes à écrire, celles de la table présentes dans les lignes : l'identifiant n'est envoyé
+        que s'il est fourni pour les lignes du groupe.
+        """
+        table = spec.model.__table__
+        columns = [name for name in rows[0] if name != "id" and name in table.c]
+        if "id" in spec.columns and rows[0]["id"] is not None:
+            columns.insert(0, "id")
+        return columns
+
+    def copy_and_upsert(self, spec, rows):
+        """
+        PostgreSQL : COPY du lot dans une table temporaire, puis INSERT ... SELECT ... ON CONFLICT vers la table cible.
+        """
+        table = spec.model.__table__.name
+        staging = f"staging_{table}"
+        columns = self.columns_for(spec, rows)
+        column_list = ", ".join(columns)
+
+        self.db.execute(
+            text(f"CREATE TEMP TABLE IF NOT EXISTS {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS")
+        )
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(["\\N" if row[name] is None else row[name] for name in columns])
+        buffer.seek(0)
+
+        copy_sql = f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        cursor = self.db.connection().connection.cursor()
+        try:
+            if hasattr(cursor, "copy_expert"):
+                cursor.copy_expert(copy_sql, buffer)
+            else:
+                with cursor.copy(copy_sql) as copy:
+                    copy.write(buffer.getvalue())
+        finally:
+            cursor.close()
+
+        upsert = f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging}"
+        if spec.conflict_key in columns:
+            updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in columns if name != spec.conflict_key)
+            upsert += f" ON CONFLICT ({spec.conflict_key}) DO UPDATE SET {updates}"
+        self.db.execute(text(upsert))
+        self.db.execute(text(f"TRUNCATE {staging}"))
+
+    def executemany_upsert(self, spec, rows):
+        """
+        Autres bases (SQLite) : upsert du lot par un seul executemany. Sans clé d'upsert dans le lot,
+        une base sans ON CONFLICT reçoit un INSERT simple ; avec, l'import est refusé (ValueError).
+        """
+        table = spec.model.__table__
+        columns = self.columns_for(spec, rows)
+        statement = dialect_insert(self.db, table)
+        if statement is None:
+            if spec.conflict_key in columns:
+                dialect = self.db.get_bind().dialect.name
+                raise ValueError(f"Upsert on {spec.conflict_key} requires PostgreSQL or SQLite, not {dialect}")
+            statement = insert(table)
+        elif spec.conflict_key in columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=[spec.conflict_key],
+                set_={name: statement.excluded[name] for name in columns if name != spec.conflict_key},
+            )
+        self.db.execute(statement, [{name: row[name] for name in columns} for row in rows])
+
+    def reset_sequence(self, spec):
+        """
+        PostgreSQL : réaligne la séquence de l'identifiant après l'import d'identifiants explicites.
+        """
+        table = spec.model.__table__.name
+        max_id = self.db.scalar(select(func.max(spec.model.id)))
+        if max_id:
+            self.db.execute(
+                text("SELECT setval(pg_get_serial_sequence(:table, 'id'), :max_id)"),
+                {"table": table, "max_id": max_id},
+            )
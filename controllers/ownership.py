@@ -0,0 +1,175 @@
+from dataclasses import dataclass
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import Session, aliased, contains_eager
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User
+
+
+@dataclass(frozen=True)
+class Ownership:
+    """
+    Résultat de la résolution d'autorisation : l'entité ciblée, son contrat et son client,
+    et les collaborateurs qui en sont responsables (commercial et support).
+    """
+
+    entity: object
+    contract: Contract = None
+    client: Client = None
+    commercial: User = None
+    support: User = None
+
+    @property
+    def commercial_id(self):
+        """
+        Identifiant du commercial responsable de l'entité.
+        """
+        return self.commercial.id if self.commercial else None
+
+    @property
+    def support_id(self):
+        """
+        Identifiant du support responsable de l'entité (événements uniquement).
+        """
+        return self.support.id if self.support else None
+
+
+def resolve_client(db: Session, client_id):
+    """
+    Charge un client et son commercial en une seule requête.
+    """
+    commercial = aliased(User)
+    row = db.execute(
+        select(Client, commercial)
+        .outerjoin(commercial, commercial.id == Client.commercial_id)
+        .where(Client.id == client_id)
+    ).first()
+    if row is None:
+        return None
+    client, commercial_user = row
+    return Ownership(entity=client, client=client, commercial=commercial_user)
+
+
+def resolve_contract(db: Session, contract_id):
+    """
+    Charge un contrat, son client et son commercial en une seule requête.
+    """
+    commercial = aliased(User)
+    row = db.execute(
+        select(Contract, commercial)
+        .outerjoin(Contract.client)
+        .outerjoin(commercial, commercial.id == Contract.commercial_id)
+        .options(contains_eager(Contract.client))
+        .where(Contract.id == contract_id)
+    ).first()
+    if row is None:
+        return None
+    contract, commercial_user = row
+    return Ownership(entity=contract, contract=contract, client=contract.client, commercial=commercial_user)
+
+
+def resolve_event(db: Session, event_id):
+    """
+    Charge un événement avec son contrat, le client du contrat, le commercial de ce client
+    et le support de l'événement, en une seule requête.
+    """
+    commercial = aliased(User)
+    support = aliased(User)
+    row = db.execute(
+        select(Event, commercial, support)
+        .outerjoin(Event.contract)
+        .outerjoin(Contract.client)
+        .outerjoin(commercial, commercial.id == Client.commercial_id)
+        .outerjoin(support, support.id == Event.support_id)
+        .options(contains_eager(Event.contract).contains_eager(Contract.client))
+        .where(Event.id == event_id)
+    ).first()
+    if row is None:
+        return None
+    event, commercial_user, support_user = row
+    contract = event.contract
+    return Ownership(
+        entity=event,
+        contract=contract,
+        client=contract.client if contract else None,
+        commercial=commercial_user,
+        support=support_user,
+    )
+
+
+@event.listens_for(Session, "before_flush", insert=True)
+def follow_client_commercial(session, flush_context, instances):
+    """
+    Maintient le commercial de chaque contrat égal à celui de son client : c'est la clé de propriété
+    des contrats et de leurs événements (permissions, portefeuilles, tableau de bord, synthèse).
+    Un contrat créé, rattaché à un autre client ou affecté directement à un autre commercial reprend
+    le commercial de son client, et les contrats d'un client réaffecté le suivent. Placé avant les autres
+    écouteurs (synthèse des contrats), qui voient ainsi les contrats modifiés.
+    """
+    contracts = {
+        id(instance): instance
+        for instance in list(session.new) + list(session.dirty)
+        if isinstance(instance, Contract) and (instance in session.new or owner_changed(instance))
+    }
+    reassigned = [
+        instance.id
+        for instance in session.dirty
+        if isinstance(instance, Client)
+        and instance.id is not None
+        and inspect(instance).attrs.commercial_id.history.has_changes()
+    ]
+    if reassigned:
+        for contract in session.scalars(select(Contract).where(Contract.client_id.in_(reassigned))):
+            contracts.setdefault(id(contract), contract)
+    if not contracts:
+        return
+
+    clients = {}
+    client_ids = {contract.client_id for contract in contracts.values() if contract_client(contract) is None}
+    client_ids.discard(None)
+    if client_ids:
+        clients = {client.id: client for client in session.scalars(select(Client).where(Client.id.in_(client_ids)))}
+    for contract in contracts.values():
+        client = contract_client(contract) or clients.get(contract.client_id)
+        if client is not None and contract.commercial_id != client.commercial_id:
+            contract.commercial_id = client.commercial_id
+            contract.commercial_contact = client.commercial_contact
+
+
+def owner_changed(contract):
+    """
+    Indique si le client ou le commercial du contrat a été modifié depuis son chargement.
+    """
+    attributes = inspect(contract).attrs
+    changed = (attributes.client_id, attributes.client, attributes.commercial_id)
+    return any(attribute.history.has_changes() for attribute in changed)
+
+
+def contract_client(contract):
+    """
+    Client du contrat s'il est déjà chargé ou affecté (objet en mémoire, éventuellement pas encore écrit).
+    """
+    return inspect(contract).dict.get("client")
+
+
+def sync_contract_commercials(db: Session, client_ids):
+    """
+    Aligne en une instruction le commercial des contrats des clients donnés sur celui de leur client,
+    pour les écritures faites sans l'ORM (import en masse). Retourne le nombre de contrats modifiés ;
+    la synthèse des contrats est alors à recalculer (contract_summary.rebuild).
+    """
+    if not client_ids:
+        return 0
+    contracts = Contract.__table__
+    client = Client.__table__
+    commercial_id = select(client.c.commercial_id).where(client.c.id == contracts.c.client_id).scalar_subquery()
+    commercial_contact = (
+        select(client.c.commercial_contact).where(client.c.id == contracts.c.client_id).scalar_subquery()
+    )
+    result = db.execute(
+        update(contracts)
+        .where(contracts.c.client_id.in_(client_ids), contracts.c.commercial_id.is_distinct_from(commercial_id))
+        .values(commercial_id=commercial_id, commercial_contact=commercial_contact)
+    )
+    return result.rowcount
@@ -0,0 +1,113 @@
+from dataclasses import dataclass, field
+from sqlalchemy import tuple_
+
+
+@dataclass
+class Page:
+    """
+    Représente une page de résultats obtenue par pagination par curseur (keyset).
+    """
+
+    items: list = field(default_factory=list)
+    first_key: tuple = None
+    last_key: tuple = None
+    has_next: bool = False
+    has_previous: bool = False
+
+
+class KeysetPaginator:
+    """
+    Pagine une requête SQLAlchemy par curseur sur une ou plusieurs colonnes indexées (l'identifiant par défaut).
+    Chaque page est obtenue par un `WHERE clé > curseur ORDER BY clé LIMIT n` : son coût reste
+    le même qu'il s'agisse de la première page ou de la cinq millième.
+    """
+
+    def __init__(self, query, keys, page_size):
+        """
+        Initialise le paginateur avec la requête de base, les colonnes de tri et la taille de page.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be a positive integer")
+        self.query = query
+        self.keys = tuple(keys)
+        self.page_size = page_size
+
+    def first(self):
+        """
+        Retourne la première page.
+        """
+        return self._fetch(None, forward=True, has_previous=False)
+
+    def next(self, page):
+        """
+        Retourne la page qui suit la page fournie.
+        """
+        if page.last_key is None:
+            return self.first()
+        return self._fetch(page.last_key, forward=True, has_previous=True)
+
+    def previous(self, page):
+        """
+        Retourne la page qui précède la page fournie.
+        """
+        if page.first_key is None:
+            return self.first()
+        return self._fetch(page.first_key, forward=False)
+
+    def jump(self, value):
+        """
+        Retourne la page qui commence à la première ligne dont la clé principale est >= value.
+        """
+        lead = self.keys[0]
+        rows = self.query.filter(lead >= value).order_by(*self.keys).limit(self.page_size + 1).all()
+        has_previous = self.query.filter(lead < value).with_entities(lead).limit(1).first() is not None
+        return self._build(rows, has_next=len(rows) > self.page_size, has_previous=has_previous)
+
+    def _fetch(self, cursor, forward, has_previous=True):
+        """
+        Exécute la requête keyset à partir du curseur, dans un sens ou dans l'autre.
+        Une ligne supplémentaire est lue pour savoir s'il existe une page au-delà.
+        """
+        query = self.query
+        if cursor is not None:
+            query = query.filter(self._compare(cursor, forward))
+
+        if forward:
+            rows = query.order_by(*self.keys).limit(self.page_size + 1).all()
+            return self._build(rows, has_next=len(rows) > self.page_size, has_previous=has_previous)
+
+        rows = query.order_by(*[key.desc() for key in self.keys]).limit(self.page_size + 1).all()
+        more_before = len(rows) > self.page_size
+        rows = list(reversed(rows[: self.page_size]))
+        return self._build(rows, has_next=True, has_previous=more_before)
+
+    def _compare(self, cursor, forward):
+        """
+        Construit la condition de comparaison entre les colonnes de tri et le curseur.
+        """
+        if len(self.keys) == 1:
+            return self.keys[0] > cursor[0] if forward else self.keys[0] < cursor[0]
+        columns = tuple_(*self.keys)
+        values = tuple_(*cursor)
+        return columns > values if forward else columns < values
+
+    def _build(self, rows, has_next, has_previous):
+        """
+        Construit l'objet Page à partir des lignes lues.
+        """
+        items = list(rows[: self.page_size])
+        if not items:
+            return Page(items=[], has_next=False, has_previous=has_previous)
+        return Page(
+            items=items,
+            first_key=self._key_of(items[0]),
+            last_key=self._key_of(items[-1]),
+            has_next=has_next,
+            has_previous=has_previous,
+        )
+
+    def _key_of(self, item):
+        """
+        Extrait la valeur du curseur d'une ligne.
+        """
+        return tuple(getattr(item, key.key) for key in self.keys)
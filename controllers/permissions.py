@@ -0,0 +1,221 @@
+from dataclasses import dataclass
+from sqlalchemy import false, select, true
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+
+"""
+Moteur de permissions déclaratif : une seule table (rôle × action -> prédicat de propriété) sert au menu,
+aux contrôles des contrôleurs et au filtrage des listes. Chaque prédicat se vérifie sur une entité déjà résolue
+(voir controllers/ownership.py) ou se traduit en condition SQL, pour restreindre une liste dans la requête même.
+La table est compilée au chargement du module : un contrôle est une recherche dans un dictionnaire.
+"""
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """
+    Prédicat de propriété : `check(ownership, user_id)` le vérifie sur une entité résolue et `criteria`
+    associe à chaque modèle une fonction `user_id -> condition SQL`.
+    """
+
+    name: str
+    check: object
+    criteria: dict
+
+    def criterion(self, model, user_id):
+        """
+        Condition SQL du prédicat sur le modèle donné (toujours fausse si le modèle n'est pas concerné).
+        """
+        build = self.criteria.get(model)
+        return build(user_id) if build is not None else false()
+
+
+def commercial_contracts(user_id):
+    """
+    Sous-requête des contrats du commercial donné, servie par l'index ix_contracts_commercial_id_id
+    (le commercial d'un contrat est toujours celui de son client, voir ownership.follow_client_commercial).
+    """
+    return select(Contract.id).where(Contract.commercial_id == user_id)
+
+
+def client_commercial_id(ownership):
+    """
+    Commercial du client de l'entité résolue (None si elle n'a pas de client).
+    """
+    return ownership.client.commercial_id if ownership.client is not None else None
+
+
+"""
+Prédicats disponibles : toute entité, entité suivie par l'utilisateur en tant que commercial (un événement
+appartient au commercial du client de son contrat), entité dont le client est suivi par l'utilisateur,
+événement dont l'utilisateur est le support.
+"""
+ANY = Predicate(
+    name="any",
+    check=lambda ownership, user_id: True,
+    criteria={Client: lambda user_id: true(), Contract: lambda user_id: true(), Event: lambda user_id: true()},
+)
+COMMERCIAL = Predicate(
+    name="commercial",
+    check=lambda ownership, user_id: user_id is not None and ownership.commercial_id == user_id,
+    criteria={
+        Client: lambda user_id: Client.commercial_id == user_id,
+        Contract: lambda user_id: Contract.commercial_id == user_id,
+        Event: lambda user_id: Event.contract_id.in_(commercial_contracts(user_id)),
+    },
+)
+CLIENT_COMMERCIAL = Predicate(
+    name="client_commercial",
+    check=lambda ownership, user_id: user_id is not None and client_commercial_id(ownership) == user_id,
+    criteria={
+        Client: lambda user_id: Client.commercial_id == user_id,
+        Contract: lambda user_id: Contract.commercial_id == user_id,
+        Event: lambda user_id: Event.contract_id.in_(commercial_contracts(user_id)),
+    },
+)
+SUPPORT = Predicate(
+    name="support",
+    check=lambda ownership, user_id: user_id is not None and ownership.support_id == user_id,
+    criteria={Event: lambda user_id: Event.support_id == user_id},
+)
+
+"""
+Table des permissions : pour chaque rôle, les actions autorisées et le prédicat que l'entité visée doit vérifier.
+Une action absente est refusée. Les actions `view_own_*` désignent le portefeuille de l'utilisateur
+(export `--mine`, listes « My ... ») et `view_assigned_events` les événements à venir du support.
+"""
+READ_RULES = {"view_clients": ANY, "view_contracts": ANY, "view_events": ANY, "search": ANY}
+RULES = {
+    "Admin": {
+        **READ_RULES,
+        "update_contract": ANY,
+        "update_event": ANY,
+        "delete_client": ANY,
+        "delete_contract": ANY,
+        "delete_event": ANY,
+        "manage_collaborators": ANY,
+        "filter_events_without_support": ANY,
+        "view_dashboard": ANY,
+        "read_audit_log": ANY,
+        "import_data": ANY,
+        "view_reports": ANY,
+    },
+    "Commercial": {
+        **READ_RULES,
+        "create_client": ANY,
+        "create_contract": COMMERCIAL,
+        "create_event": CLIENT_COMMERCIAL,
+        "update_client": COMMERCIAL,
+        "update_contract": COMMERCIAL,
+        "update_event": COMMERCIAL,
+        "view_own_clients": COMMERCIAL,
+        "view_own_contracts": COMMERCIAL,
+        "view_own_events": COMMERCIAL,
+    },
+    "Support": {
+        **READ_RULES,
+        "update_event": SUPPORT,
+        "view_own_events": SUPPORT,
+        "view_assigned_events": SUPPORT,
+    },
+}
+
+"""
+Entrées du menu des données, dans l'ordre d'affichage : (option, action requise, prédicats acceptés).
+Une entrée n'apparaît que si le rôle a l'action, et, si des prédicats sont précisés, avec l'un d'eux :
+« Update Contract » pour le commercial du contrat, « Update Any Contract » pour qui peut tout modifier.
+"""
+MENU = (
+    ("view_clients", "view_clients", None),
+    ("view_contracts", "view_contracts", None),
+    ("view_events", "view_events", None),
+    ("search", "search", None),
+    ("create_client", "create_client", None),
+    ("create_contract", "create_contract", None),
+    ("create_event", "create_event", None),
+    ("update_client", "update_client", None),
+    ("update_contract", "update_contract", (COMMERCIAL,)),
+    ("my_clients", "view_own_clients", (COMMERCIAL,)),
+    ("my_contracts", "view_own_contracts", (COMMERCIAL,)),
+    ("unsigned_contracts", "view_own_contracts", (COMMERCIAL,)),
+    ("contracts_with_amount_due", "view_own_contracts", (COMMERCIAL,)),
+    ("update_event", "update_event", (COMMERCIAL, SUPPORT)),
+    ("my_upcoming_events", "view_assigned_events", None),
+    ("create_collaborator", "manage_collaborators", None),
+    ("update_collaborator", "manage_collaborators", None),
+    ("delete_collaborator", "manage_collaborators", None),
+    ("delete_client", "delete_client", None),
+    ("delete_contract", "delete_contract", None),
+    ("delete_event", "delete_event", None),
+    ("filter_events_without_support", "filter_events_without_support", None),
+    ("update_any_contract", "update_contract", (ANY,)),
+    ("update_any_event", "update_event", (ANY,)),
+    ("dashboard", "view_dashboard", None),
+)
+
+
+def compile_rules(rules, menu):
+    """
+    Aplatit la table en un dictionnaire (rôle, action) -> prédicat et calcule une fois pour toutes
+    les options de menu de chaque rôle.
+    """
+    compiled = {(role, action): predicate for role, actions in rules.items() for action, predicate in actions.items()}
+    menus = {
+        role: tuple(
+            option
+            for option, action, accepted in menu
+            if (role, action) in compiled and (accepted is None or compiled[(role, action)] in accepted)
+        )
+        for role in rules
+    }
+    return compiled, menus
+
+
+PERMISSIONS, MENUS = compile_rules(RULES, MENU)
+
+
+def rule(role, action):
+    """
+    Retourne le prédicat exigé pour l'action, ou None si le rôle n'y a pas droit.
+    """
+    return PERMISSIONS.get((role, action))
+
+
+def menu_options(role):
+    """
+    Retourne les options du menu des données accessibles au rôle, dans l'ordre d'affichage.
+    """
+    return MENUS.get(role, ())
+
+
+def allows(role, action, user_id=None, ownership=None):
+    """
+    Indique si le rôle peut effectuer l'action ; si une entité résolue est fournie, son prédicat
+    doit être vérifié.
+    """
+    predicate = PERMISSIONS.get((role, action))
+    if predicate is None:
+        return False
+    return ownership is None or predicate.check(ownership, user_id)
+
+
+def require(role, action, message, user_id=None, ownership=None):
+    """
+    Lève PermissionError avec le message fourni si l'action n'est pas autorisée (voir allows) ;
+    retourne le prédicat appliqué.
+    """
+    if not allows(role, action, user_id, ownership):
+        raise PermissionError(message)
+    return PERMISSIONS[(role, action)]
+
+
+def restrict(query, role, action, model, user_id, message):
+    """
+    Restreint une requête du modèle aux entités sur lesquelles le rôle peut effectuer l'action (condition SQL
+    du prédicat, aucune pour ANY) ; lève PermissionError avec le message fourni si l'action n'est pas autorisée.
+    """
+    predicate = require(role, action, message)
+    if predicate is ANY:
+        return query
+    return query.filter(predicate.criterion(model, user_id))
@@ -0,0 +1,218 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from models.user_model import User, Role
+import config
+
+"""
+Cache local au processus des rôles (nom -> identifiant) et des collaborateurs connus (email -> identité et rôle),
+un jeu de caches par moteur de base de données. Les entrées expirent après config.PRINCIPAL_CACHE_TTL secondes
+et les moins récemment utilisées sont évincées au-delà de config.PRINCIPAL_CACHE_SIZE entrées.
+Les modifications de collaborateurs invalident explicitement leurs entrées, à la fin de leur transaction.
+"""
+
+
+class TTLCache:
+    """
+    Dictionnaire borné à durée de vie : chaque entrée expire `ttl` secondes après son écriture et,
+    au-delà de `maxsize` entrées, la moins récemment lue est évincée. Une durée de vie nulle désactive le cache.
+    """
+
+    def __init__(self, maxsize, ttl, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """
+        Retourne la valeur associée à la clé, ou `default` si elle est absente ou expirée.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] > self.clock():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """
+        Enregistre une valeur, en évinçant les entrées les moins récemment utilisées si le cache est plein.
+        Une durée de vie propre à l'entrée (`ttl`) peut raccourcir celle du cache.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (value, self.clock() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """
+        Retire une entrée du cache (sans effet si elle est absente).
+        """
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        """
+        Vide le cache.
+        """
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+@dataclass(frozen=True)
+class CachedPrincipal:
+    """
+    Identité d'un collaborateur telle qu'elle est mise en cache : de simples valeurs, jamais une instance ORM,
+    pour pouvoir être partagée entre sessions.
+    """
+
+    id: int
+    email: str
+    role: str
+
+
+class PrincipalCache:
+    """
+    Caches des rôles et des collaborateurs d'une base de données.
+    """
+
+    def __init__(self, maxsize=None, ttl=None):
+        maxsize = config.PRINCIPAL_CACHE_SIZE if maxsize is None else maxsize
+        ttl = config.PRINCIPAL_CACHE_TTL if ttl is None else ttl
+        self.roles = TTLCache(maxsize, ttl)
+        self.principals = TTLCache(maxsize, ttl)
+
+    def clear(self):
+        """
+        Vide les deux caches.
+        """
+        self.roles.clear()
+        self.principals.clear()
+
+
+_caches = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def get_cache(db: Session):
+    """
+    Retourne les caches du moteur de la session, créés à la première utilisation.
+    """
+    bind = db.get_bind()
+    engine = getattr(bind, "engine", bind)
+    with _caches_lock:
+        cache = _caches.get(engine)
+        if cache is None:
+            cache = _caches[engine] = PrincipalCache()
+        return cache
+
+
+def clear():
+    """
+    Vide les caches de tous les moteurs.
+    """
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.clear()
+
+
+def role_id(db: Session, name):
+    """
+    Retourne l'identifiant du rôle portant ce nom, ou None s'il n'existe pas (un rôle absent n'est pas mis en cache).
+    """
+    cache = get_cache(db).roles
+    value = cache.get(name)
+    if value is None:
+        value = db.scalar(select(Role.id).where(Role.name == name))
+        if value is not None:
+            cache.set(name, value)
+    return value
+
+
+def get_role(db: Session, name):
+    """
+    Retourne le rôle portant ce nom, ou None : son identifiant vient du cache et l'instance de la carte
+    d'identité de la session si elle y est déjà.
+    """
+    value = role_id(db, name)
+    return db.get(Role, value) if value is not None else None
+
+
+def principal(db: Session, email):
+    """
+    Retourne l'identité et le rôle du collaborateur ayant cet email, ou None s'il n'existe pas.
+    """
+    if email is None:
+        return None
+    cache = get_cache(db).principals
+    value = cache.get(email)
+    if value is None:
+        row = db.execute(
+            select(User.id, User.email, Role.name).outerjoin(Role, Role.id == User.role_id).where(User.email == email)
+        ).first()
+        if row is None:
+            return None
+        value = CachedPrincipal(*row)
+        cache.set(email, value)
+    return value
+
+
+def role_of(db: Session, user):
+    """
+    Retourne le nom du rôle d'un collaborateur (None s'il n'en a pas) à partir du cache, sans charger
+    la relation `role` de l'instance. Une entrée d'un autre collaborateur au même email est ignorée.
+    """
+    if user is None:
+        return None
+    cached = principal(db, user.email)
+    if cached is None or cached.id != user.id:
+        return user.role.name if user.role else None
+    return cached.role
+
+
+def invalidate_on_commit(db: Session, *emails):
+    """
+    Programme l'invalidation des collaborateurs donnés à la fin de la transaction en cours. Elle a lieu aussi
+    en cas d'annulation : une lecture faite après le flush a pu mettre en cache des valeurs jamais validées.
+    """
+    cache = get_cache(db)
+    db.info.setdefault("principal_cache_invalidations", []).extend(
+        (cache, email) for email in emails if email is not None
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed_principals(session):
+    """
+    Retire du cache les collaborateurs créés, modifiés ou supprimés par la transaction validée.
+    """
+    for cache, email in session.info.pop("principal_cache_invalidations", ()):
+        cache.principals.invalidate(email)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def invalidate_rolled_back_principals(session, previous_transaction):
+    """
+    Retire aussi du cache les collaborateurs d'une transaction annulée (transaction principale uniquement).
+    """
+    if not previous_transaction.nested:
+        invalidate_committed_principals(session)
@@ -0,0 +1,280 @@
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from sqlalchemy import event
+
+"""
+Instrumentation des actions du DataController : nombre de requêtes SQL, temps passé en base, requête la plus lente
+et lignes renvoyées par le pilote, par action. Les mesures ne sont prises que si un Profiler est attaché à un moteur
+(option --profile, tests) ; l'action en cours reste connue du journal des requêtes lentes. Chaque requête est
+comptée pour l'action la plus interne en cours (une opération d'un lot, et non le lot lui-même), et seulement
+par les profileurs du moteur qui l'a exécutée.
+"""
+_current = contextvars.ContextVar("profiled_action", default=None)
+_profilers = []
+_profilers_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Une action a envoyé plus de requêtes (ou passé plus de temps en base) que le budget fixé.
+    """
+
+
+@dataclass
+class ActionRun:
+    """
+    Mesures d'une exécution d'action, remplies par les événements des moteurs ; `engines` détaille
+    les mesures par moteur.
+    """
+
+    action: str
+    statements: int = 0
+    db_time: float = 0.0
+    rows: int = 0
+    slowest_statement: str = None
+    slowest_time: float = 0.0
+    elapsed: float = 0.0
+    engines: dict = field(default_factory=dict, repr=False)
+
+    def record(self, statement, duration, rowcount, engine=None):
+        """
+        Ajoute une requête exécutée pour l'action (sur le moteur `engine`).
+        """
+        if engine is not None:
+            self.engines.setdefault(engine, ActionRun(self.action)).record(statement, duration, rowcount)
+        self.statements += 1
+        self.db_time += duration
+        if rowcount > 0:
+            self.rows += rowcount
+        if self.slowest_statement is None or duration > self.slowest_time:
+            self.slowest_statement = " ".join(statement.split())
+            self.slowest_time = duration
+
+    def on(self, engine):
+        """
+        Retourne les mesures de l'exécution limitées aux requêtes envoyées au moteur, ou None si l'action
+        n'a interrogé que d'autres moteurs. Une exécution sans aucune requête compte pour tous les moteurs.
+        """
+        if not self.statements:
+            return self
+        run = self.engines.get(engine)
+        if run is None:
+            return None
+        run.elapsed = self.elapsed
+        return run
+
+
+@dataclass
+class ActionStats:
+    """
+    Mesures cumulées d'une action sur toutes ses exécutions ; `max_statements` est le plus grand nombre de requêtes
+    d'une seule exécution (celui que contrôlent les budgets). Les durées sont en secondes.
+    """
+
+    action: str
+    calls: int = 0
+    statements: int = 0
+    max_statements: int = 0
+    db_time: float = 0.0
+    rows: int = 0
+    slowest_statement: str = None
+    slowest_time: float = 0.0
+    elapsed: float = 0.0
+
+    def add(self, run):
+        """
+        Cumule une exécution de l'action.
+        """
+        self.calls += 1
+        self.statements += run.statements
+        self.max_statements = max(self.max_statements, run.statements)
+        self.db_time += run.db_time
+        self.rows += run.rows
+        self.elapsed += run.elapsed
+        slower = self.slowest_statement is None or run.slowest_time > self.slowest_time
+        if run.slowest_statement is not None and slower:
+            self.slowest_statement = run.slowest_statement
+            self.slowest_time = run.slowest_time
+
+    def as_dict(self):
+        """
+        Représentation sérialisable des mesures.
+        """
+        return asdict(self)
+
+
+@contextmanager
+def action(name):
+    """
+    Mesure les requêtes envoyées pendant l'action `name` (nom de l'entrée du menu ou de l'opération), pour chaque
+    profileur attaché. Une action imbriquée dans une action de même nom n'en fait qu'une. La durée totale comprend
+    les saisies de l'utilisateur dans le menu interactif.
+    """
+    current = _current.get()
+    if current is not None and current.action == name:
+        yield current
+        return
+    run = ActionRun(name)
+    token = _current.set(run)
+    started = time.perf_counter()
+    try:
+        yield run
+    finally:
+        run.elapsed = time.perf_counter() - started
+        _current.reset(token)
+        if _profilers:
+            with _profilers_lock:
+                profilers = tuple(_profilers)
+            for profiler in profilers:
+                profiler.add(run)
+
+
+def current_action():
+    """
+    Retourne le nom de l'action en cours (la plus interne), ou None hors de toute action.
+    """
+    run = _current.get()
+    return run.action if run is not None else None
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """
+    Note le début d'une requête envoyée pendant une action mesurée.
+    """
+    if _current.get() is not None:
+        conn.info.setdefault("profiling_started", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """
+    Attribue la requête terminée à l'action en cours. Les lignes sont celles indiquées par le pilote
+    (cursor.rowcount) : lignes modifiées, et lignes renvoyées par un SELECT sur PostgreSQL
+    (SQLite ne les compte pas).
+    """
+    run = _current.get()
+    started = conn.info.get("profiling_started")
+    if run is None or not started:
+        return
+    run.record(statement, time.perf_counter() - started.pop(), cursor.rowcount, conn.engine)
+
+
+def instrument(engine):
+    """
+    Ajoute au moteur les écouteurs de mesure (une seule fois par moteur).
+    """
+    if not event.contains(engine, "before_cursor_execute", before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+class Profiler:
+    """
+    Cumule, par action, les mesures des actions exécutées sur son moteur pendant qu'il est attaché. Utilisable
+    comme gestionnaire de contexte, notamment dans les tests pour vérifier un budget de requêtes :
+
+        with Profiler(engine) as profiler:
+            command_controller.run("events", "update", 1, {"location": "Lyon"})
+        profiler.assert_budget("events update", statements=4)
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def attach(self, engine=None):
+        """
+        Commence la collecte des mesures (sur le moteur donné à la construction, ou `engine`).
+        """
+        self.engine = engine or self.engine
+        instrument(self.engine)
+        with _profilers_lock:
+            if self not in _profilers:
+                _profilers.append(self)
+        return self
+
+    def detach(self):
+        """
+        Arrête la collecte ; les mesures déjà cumulées sont conservées.
+        """
+        with _profilers_lock:
+            if self in _profilers:
+                _profilers.remove(self)
+
+    def __enter__(self):
+        return self.attach()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.detach()
+
+    def add(self, run):
+        """
+        Cumule une exécution d'action, réduite aux requêtes envoyées à son moteur (voir ActionRun.on).
+        """
+        run = run.on(self.engine)
+        if run is None:
+            return
+        with self.lock:
+            stats = self.stats.get(run.action)
+            if stats is None:
+                stats = self.stats[run.action] = ActionStats(run.action)
+            stats.add(run)
+
+    def results(self):
+        """
+        Retourne les mesures de chaque action, la plus coûteuse en temps de base en premier.
+        """
+        with self.lock:
+            return sorted(self.stats.values(), key=lambda stats: (-stats.db_time, stats.action))
+
+    def assert_budget(self, name, statements=None, db_time=None):
+        """
+        Vérifie qu'aucune exécution de l'action n'a dépassé `statements` requêtes et que le temps cumulé en base
+        ne dépasse pas `db_time` secondes ; lève QueryBudgetExceeded sinon (ou si l'action n'a pas été exécutée).
+        """
+        stats = self.stats.get(name)
+        if stats is None:
+            raise QueryBudgetExceeded(f"Action '{name}' was not run while profiling.")
+        if statements is not None and stats.max_statements > statements:
+            raise QueryBudgetExceeded(
+                f"Action '{name}' issued {stats.max_statements} statements (budget: {statements}). "
+                f"Slowest: {stats.slowest_statement}"
+            )
+        if db_time is not None and stats.db_time > db_time:
+            raise QueryBudgetExceeded(
+                f"Action '{name}' spent {stats.db_time:.3f}s in the database (budget: {db_time}s)."
+            )
+        return stats
+
+    def to_json(self):
+        """
+        Exporte les mesures en JSON (une entrée par action).
+        """
+        return json.dumps([stats.as_dict() for stats in self.results()], indent=2)
+
+    def to_prometheus(self, prefix="epic_action"):
+        """
+        Exporte les mesures au format texte de Prometheus (compteurs étiquetés par action).
+        """
+        metrics = (
+            ("calls_total", "counter", "Executions of the action.", "calls"),
+            ("statements_total", "counter", "SQL statements issued by the action.", "statements"),
+            ("max_statements", "gauge", "Most SQL statements issued by a single execution.", "max_statements"),
+            ("db_seconds_total", "counter", "Time spent executing SQL statements.", "db_time"),
+            ("rows_total", "counter", "Rows reported by the database driver.", "rows"),
+            ("slowest_statement_seconds", "gauge", "Duration of the slowest SQL statement.", "slowest_time"),
+        )
+        results = self.results()
+        lines = []
+        for suffix, kind, help_text, attribute in metrics:
+            name = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for stats in results:
+                label = stats.action.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{name}{{action="{label}"}} {getattr(stats, attribute)}')
+        return "\n".join(lines) + "\n"
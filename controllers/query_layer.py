@@ -0,0 +1,95 @@
+import os
+import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass
+from sqlalchemy import event
+from sqlalchemy.orm import Session, joinedload, selectinload
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+import config
+
+
+class UnplannedLazyLoadWarning(UserWarning):
+    """
+    Avertissement émis lorsqu'une relation est chargée paresseusement pendant l'affichage d'une liste,
+    c'est-à-dire lorsqu'une relation nécessaire à la vue n'a pas été déclarée dans LISTINGS.
+    """
+
+
+@dataclass(frozen=True)
+class Listing:
+    """
+    Déclare le modèle affiché par une vue et les relations qu'elle lit,
+    avec leur stratégie de chargement (joined pour un many-to-one, selectin pour une collection).
+    """
+
+    model: type
+    joined: tuple = ()
+    selectin: tuple = ()
+
+    def options(self):
+        """
+        Retourne les options de chargement à appliquer à la requête.
+        """
+        return [joinedload(rel) for rel in self.joined] + [selectinload(rel) for rel in self.selectin]
+
+
+"""
+Relations lues par chaque vue de DataView : toute relation utilisée à l'affichage doit être déclarée ici,
+pour qu'une liste coûte un nombre constant d'aller-retours vers la base.
+"""
+LISTINGS = {
+    "clients": Listing(Client, joined=(Client.commercial,)),
+    "contracts": Listing(Contract, joined=(Contract.commercial,)),
+    "events": Listing(Event, joined=(Event.client, Event.support)),
+}
+
+
+def listing_query(db: Session, name):
+    """
+    Construit la requête d'une liste avec ses relations chargées en avance.
+    """
+    listing = LISTINGS[name]
+    return db.query(listing.model).options(*listing.options())
+
+
+def lazy_load_warnings_enabled():
+    """
+    Les chargements paresseux imprévus sont signalés en mode debug et pendant les tests.
+    """
+    return config.DEBUG or "PYTEST_CURRENT_TEST" in os.environ
+
+
+@contextmanager
+def rendering(db: Session):
+    """
+    Délimite l'affichage d'une liste : tout chargement paresseux dans ce bloc lève un UnplannedLazyLoadWarning.
+    """
+    if not lazy_load_warnings_enabled():
+        yield
+        return
+
+    previous = db.info.get("rendering", False)
+    db.info["rendering"] = True
+    try:
+        yield
+    finally:
+        db.info["rendering"] = previous
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _warn_on_lazy_load(orm_execute_state):
+    """
+    Détecte les chargements paresseux déclenchés pendant un bloc rendering().
+    """
+    session = orm_execute_state.session
+    if not session.info.get("rendering") or orm_execute_state.lazy_loaded_from is None:
+        return
+
+    state = orm_execute_state.lazy_loaded_from
+    warnings.warn(
+        f"Unplanned lazy load from {state.class_.__name__} during rendering, declare the relationship in LISTINGS",
+        UnplannedLazyLoadWarning,
+        stacklevel=2,
+    )
@@ -0,0 +1,133 @@
+from sqlalchemy import func, literal, or_, text
+from sqlalchemy.orm import Session
+from controllers.query_layer import listing_query
+from models.client_model import Client, CLIENT_SEARCH_COLUMNS
+from models.event_model import Event, EVENT_SEARCH_COLUMNS
+from models.search_index import fts_table
+
+"""
+Entités couvertes par la recherche : modèle et colonnes indexées (avec leur poids pour le classement SQLite).
+"""
+SEARCH_TARGETS = {
+    "clients": (Client, CLIENT_SEARCH_COLUMNS, (10.0, 5.0, 3.0)),
+    "events": (Event, EVENT_SEARCH_COLUMNS, (10.0, 3.0)),
+}
+
+DEFAULT_LIMIT = 20
+MAX_TRIGRAMS = 32
+
+"""
+SQLite : part minimale des trigrammes du terme présents dans une entité pour qu'elle soit retenue
+(équivalent du seuil de similarité de pg_trgm), et nombre de candidats lus dans l'index par résultat attendu.
+"""
+SIMILARITY_THRESHOLD = 0.4
+CANDIDATES_PER_RESULT = 5
+
+
+def search(db: Session, entity, term, limit=DEFAULT_LIMIT):
+    """
+    Recherche approximative (sous-chaîne et fautes de frappe) dans les clients ou les événements.
+    Retourne au plus `limit` entités, de la plus pertinente à la moins pertinente, chargées avec
+    les relations de leur liste (commercial, client, support).
+    """
+    if entity not in SEARCH_TARGETS:
+        raise ValueError(f"Search is not available for {entity}. Expected one of: {', '.join(SEARCH_TARGETS)}")
+    term = (term or "").strip()
+    if not term:
+        return []
+
+    model = SEARCH_TARGETS[entity][0]
+    if db.get_bind().dialect.name == "postgresql":
+        ids = postgresql_ranked_ids(db, entity, term, limit)
+    elif len(term) >= 3:
+        ids = sqlite_ranked_ids(db, entity, term, limit)
+    else:
+        ids = like_ids(db, entity, term, limit)
+
+    if not ids:
+        return []
+    rows = {row.id: row for row in listing_query(db, entity).filter(model.id.in_(ids))}
+    return [rows[entity_id] for entity_id in ids if entity_id in rows]
+
+
+def postgresql_ranked_ids(db, entity, term, limit):
+    """
+    PostgreSQL : correspondance par sous-chaîne (ILIKE) ou par similarité de trigrammes (opérateur <%),
+    servies par les index GIN gin_trgm_ops, classées par word_similarity.
+    """
+    model, columns, _ = SEARCH_TARGETS[entity]
+    pattern = f"%{escape_like(term)}%"
+    fields = [getattr(model, column) for column in columns]
+    rank = func.greatest(*[func.word_similarity(term, func.coalesce(field, "")) for field in fields])
+    matches = or_(
+        *[field.ilike(pattern, escape="\\") for field in fields],
+        *[literal(term).op("<%")(field) for field in fields],
+    )
+    query = db.query(model.id).filter(matches).order_by(rank.desc(), model.id).limit(limit)
+    return [row.id for row in query]
+
+
+def sqlite_ranked_ids(db, entity, term, limit):
+    """
+    SQLite : table FTS5 à tokenizer trigram. Les trigrammes du terme, combinés par OR, sélectionnent
+    dans l'index les candidats classés par bm25 (pondéré par colonne) ; seuls ceux qui partagent
+    au moins SIMILARITY_THRESHOLD des trigrammes sont retenus, les plus proches en premier.
+    Un nom mal orthographié partage encore la plupart de ses trigrammes.
+    """
+    model, columns, weights = SEARCH_TARGETS[entity]
+    trigrams = term_trigrams(term)
+    if not trigrams:
+        return like_ids(db, entity, term, limit)
+
+    fts = fts_table(model.__tablename__)
+    weights_sql = ", ".join(str(weight) for weight in weights)
+    statement = text(
+        f"SELECT rowid, {', '.join(columns)} FROM {fts} WHERE {fts} MATCH :query "
+        f"ORDER BY bm25({fts}, {weights_sql}), rowid LIMIT :limit"
+    )
+    rows = db.execute(statement, {"query": trigram_query(trigrams), "limit": limit * CANDIDATES_PER_RESULT})
+
+    ranked = []
+    for position, row in enumerate(rows):
+        content = " ".join(value for value in row[1:] if value).lower()
+        similarity = sum(trigram in content for trigram in trigrams) / len(trigrams)
+        if similarity >= SIMILARITY_THRESHOLD:
+            ranked.append((-similarity, position, row.rowid))
+    return [entity_id for _, _, entity_id in sorted(ranked)[:limit]]
+
+
+def like_ids(db, entity, term, limit):
+    """
+    Termes de moins de trois caractères (trop courts pour les trigrammes) : simple recherche par sous-chaîne.
+    """
+    model, columns, _ = SEARCH_TARGETS[entity]
+    pattern = f"%{escape_like(term)}%"
+    matches = or_(*[getattr(model, column).ilike(pattern, escape="\\") for column in columns])
+    return [row.id for row in db.query(model.id).filter(matches).order_by(model.id).limit(limit)]
+
+
+def term_trigrams(term):
+    """
+    Trigrammes distincts (en minuscules) de chaque mot du terme, dans leur ordre d'apparition.
+    """
+    trigrams = []
+    for word in term.lower().split():
+        for i in range(len(word) - 2):
+            trigram = word[i:i + 3]
+            if trigram not in trigrams:
+                trigrams.append(trigram)
+    return trigrams[:MAX_TRIGRAMS]
+
+
+def trigram_query(trigrams):
+    """
+    Construit la requête FTS5 : chaque trigramme entre guillemets, combinés par OR.
+    """
+    return " OR ".join('"' + trigram.replace('"', '""') + '"' for trigram in trigrams)
+
+
+def escape_like(term):
+    """
+    Échappe les caractères spéciaux de LIKE (%, _ et le caractère d'échappement).
+    """
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -0,0 +1,264 @@
+import datetime
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from sqlalchemy import event
+from controllers import profiling
+import config
+
+"""
+Journal des requêtes lentes : chaque requête plus longue que le seuil est écrite (une ligne JSON) dans un fichier
+local tournant, avec sa durée, ses paramètres, l'action du DataController en cours et son plan d'exécution :
+EXPLAIN (ANALYZE, BUFFERS) sur PostgreSQL pour un SELECT simple (EXPLAIN sans exécution pour tout le reste,
+y compris WITH, qui peut contenir une écriture à ne pas rejouer), EXPLAIN QUERY PLAN sur SQLite. Le plan
+est obtenu sur la même connexion, dans la même transaction, et au plus une fois par empreinte de requête
+toutes les config.SLOW_QUERY_EXPLAIN_INTERVAL secondes.
+"""
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+"""
+Normalisation des requêtes pour l'empreinte : littéraux et paramètres remplacés par ?, listes IN réduites,
+espaces fusionnés ; deux requêtes de même forme ont la même empreinte quels que soient leurs paramètres.
+"""
+FINGERPRINT_RULES = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"%\(\w+\)s|%s|\$\d+|:\w+|\?"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),
+    (re.compile(r"\s+"), " "),
+)
+
+MAX_PARAMETER_LENGTH = 200
+
+
+def normalize(statement):
+    """
+    Retourne la forme normalisée d'une requête (voir FINGERPRINT_RULES).
+    """
+    for pattern, replacement in FINGERPRINT_RULES:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def fingerprint(statement):
+    """
+    Empreinte courte (16 caractères hexadécimaux) de la forme normalisée d'une requête.
+    """
+    return hashlib.sha1(normalize(statement).encode("utf-8")).hexdigest()[:16]
+
+
+def loggable(parameters):
+    """
+    Paramètres sérialisables en JSON, les valeurs longues tronquées.
+    """
+    if isinstance(parameters, dict):
+        return {key: loggable(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [loggable(value) for value in parameters]
+    if parameters is None or isinstance(parameters, (bool, int, float)):
+        return parameters
+    text = parameters.hex() if isinstance(parameters, (bytes, bytearray, memoryview)) else str(parameters)
+    return text if len(text) <= MAX_PARAMETER_LENGTH else text[:MAX_PARAMETER_LENGTH] + "..."
+
+
+def explain(conn, statement, parameters):
+    """
+    Calcule le plan d'exécution de la requête sur la connexion donnée et le retourne sous forme de texte
+    (None pour une requête sans plan : point de sauvegarde, DDL, etc.).
+    Sur PostgreSQL, le plan est obtenu dans un point de sauvegarde annulé ensuite : la transaction de l'appelant
+    n'est ni modifiée ni interrompue si l'EXPLAIN échoue.
+    """
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    cursor = conn.connection.cursor()
+    try:
+        if conn.dialect.name == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+        if conn.dialect.name != "postgresql":
+            return None
+        select = statement.lstrip().upper().startswith("SELECT")
+        prefix = "EXPLAIN (ANALYZE, BUFFERS)" if select else "EXPLAIN"
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"{prefix} {statement}", parameters)
+            return "\n".join(str(row[0]) for row in cursor.fetchall())
+        finally:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        cursor.close()
+
+
+class SlowQueryRecorder:
+    """
+    Écrit dans un fichier tournant les requêtes d'un moteur plus longues que `threshold_ms` millisecondes.
+    """
+
+    def __init__(
+        self,
+        path=None,
+        threshold_ms=None,
+        max_bytes=None,
+        backup_count=None,
+        explain_interval=None,
+        log_parameters=None,
+        clock=time.monotonic,
+    ):
+        self.path = path or config.SLOW_QUERY_FILE
+        self.threshold = (config.SLOW_QUERY_THRESHOLD_MS if threshold_ms is None else threshold_ms) / 1000
+        self.max_bytes = config.SLOW_QUERY_MAX_BYTES if max_bytes is None else max_bytes
+        self.backup_count = config.SLOW_QUERY_BACKUP_COUNT if backup_count is None else backup_count
+        self.explain_interval = config.SLOW_QUERY_EXPLAIN_INTERVAL if explain_interval is None else explain_interval
+        self.log_parameters = config.SLOW_QUERY_LOG_PARAMETERS if log_parameters is None else log_parameters
+        self.clock = clock
+        self.explained = {}
+        self.lock = threading.Lock()
+        self.engine = None
+        self.handler = None
+
+    def attach(self, engine):
+        """
+        Commence l'enregistrement des requêtes lentes du moteur.
+        """
+        self.engine = engine
+        self.handler = RotatingFileHandler(
+            self.path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding="utf-8", delay=True
+        )
+        event.listen(engine, "before_cursor_execute", self.before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self.after_cursor_execute)
+        return self
+
+    def detach(self):
+        """
+        Arrête l'enregistrement et ferme le fichier.
+        """
+        if self.engine is None:
+            return
+        event.remove(self.engine, "before_cursor_execute", self.before_cursor_execute)
+        event.remove(self.engine, "after_cursor_execute", self.after_cursor_execute)
+        self.handler.close()
+        self.engine = None
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        """
+        Note le début de la requête.
+        """
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        """
+        Enregistre la requête terminée si elle a dépassé le seuil.
+        """
+        started = conn.info.get("slow_query_started")
+        if not started:
+            return
+        duration = time.perf_counter() - started.pop()
+        if duration >= self.threshold:
+            self.record(conn, statement, parameters, duration, executemany)
+
+    def should_explain(self, key):
+        """
+        Indique si le plan de cette empreinte doit être (re)calculé, et note la date du calcul.
+        """
+        now = self.clock()
+        with self.lock:
+            explained_at = self.explained.get(key)
+            if explained_at is not None and now - explained_at < self.explain_interval:
+                return False
+            self.explained[key] = now
+            return True
+
+    def record(self, conn, statement, parameters, duration, executemany=False):
+        """
+        Écrit une requête lente, avec son plan d'exécution si besoin (pas pour un executemany).
+        """
+        key = fingerprint(statement)
+        plan = None
+        if not executemany and self.should_explain(key):
+            try:
+                plan = explain(conn, statement, parameters)
+            except Exception as e:
+                plan = f"EXPLAIN failed: {e}"
+        entry = {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "duration_ms": round(duration * 1000, 3),
+            "action": profiling.current_action(),
+            "fingerprint": key,
+            "statement": " ".join(statement.split()),
+            "parameters": loggable(parameters) if self.log_parameters else None,
+            "dialect": conn.dialect.name,
+            "plan": plan,
+        }
+        self.handler.handle(logging.makeLogRecord({"msg": json.dumps(entry)}))
+
+
+def install(engine):
+    """
+    Attache au moteur le journal des requêtes lentes si un seuil est configuré (config.SLOW_QUERY_THRESHOLD_MS),
+    et retourne l'enregistreur (None sinon).
+    """
+    if config.SLOW_QUERY_THRESHOLD_MS <= 0:
+        return None
+    return SlowQueryRecorder().attach(engine)
+
+
+def read_entries(path=None, backup_count=None):
+    """
+    Lit les requêtes enregistrées dans le fichier et ses copies tournées, de la plus ancienne à la plus récente.
+    Les lignes illisibles (fichier tronqué) sont ignorées.
+    """
+    path = path or config.SLOW_QUERY_FILE
+    backup_count = config.SLOW_QUERY_BACKUP_COUNT if backup_count is None else backup_count
+    paths = [f"{path}.{number}" for number in range(backup_count, 0, -1)] + [path]
+    for current in paths:
+        if not os.path.exists(current):
+            continue
+        with open(current, encoding="utf-8") as source:
+            for line in source:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def summarize(entries):
+    """
+    Regroupe les requêtes lentes par empreinte : nombre, durées totale, moyenne et maximale (ms), actions
+    concernées, requête normalisée et dernier plan connu. Les plus coûteuses (durée totale) en premier.
+    """
+    groups = {}
+    for entry in entries:
+        group = groups.get(entry["fingerprint"])
+        if group is None:
+            group = groups[entry["fingerprint"]] = {
+                "fingerprint": entry["fingerprint"],
+                "statement": normalize(entry["statement"]),
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "actions": set(),
+                "last_seen": None,
+                "plan": None,
+            }
+        group["count"] += 1
+        group["total_ms"] += entry["duration_ms"]
+        group["max_ms"] = max(group["max_ms"], entry["duration_ms"])
+        if entry.get("action"):
+            group["actions"].add(entry["action"])
+        group["last_seen"] = entry["timestamp"]
+        if entry.get("plan"):
+            group["plan"] = entry["plan"]
+
+    report = []
+    for group in sorted(groups.values(), key=lambda group: -group["total_ms"]):
+        group["total_ms"] = round(group["total_ms"], 3)
+        group["mean_ms"] = round(group["total_ms"] / group["count"], 3)
+        group["actions"] = sorted(group["actions"])
+        report.append(group)
+    return report
@@ -0,0 +1,98 @@
+import os
+from sqlalchemy import inspect, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from models.base_model import Base
+from models.user_model import User, Role
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.audit_log_model import AuditLog
+from models.contract_summary_model import ContractSummary
+from models.revoked_token_model import RevokedToken
+
+"""
+Révision Alembic correspondant aux modèles (schéma et rôles par défaut). Une base à cette révision
+est prête : le démarrage se limite alors à une seule requête. À mettre à jour avec chaque nouvelle migration
+(vérifié par tests/test_startup.py).
+"""
+SCHEMA_REVISION = "0010"
+
+DEFAULT_ROLES = ("Admin", "Commercial", "Support")
+
+"""
+États possibles de la base au démarrage.
+"""
+CURRENT = "current"
+CREATED = "created"
+LEGACY = "legacy"
+OUTDATED = "outdated"
+
+
+def schema_revision(engine):
+    """
+    Retourne la révision Alembic enregistrée dans la base, ou None si la base n'est pas versionnée.
+    """
+    with engine.connect() as connection:
+        try:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except DBAPIError:
+            return None
+
+
+def ensure_database(engine):
+    """
+    Prépare la base au démarrage et retourne son état :
+    - CURRENT : la base est à la révision courante, rien n'est fait (une seule requête) ;
+    - OUTDATED : la base est versionnée mais en retard, il faut lancer `alembic upgrade head` ;
+    - CREATED : base vide, les tables et les rôles sont créés et la révision courante est enregistrée ;
+    - LEGACY : tables créées avant Alembic, elles sont complétées et les rôles vérifiés à chaque démarrage
+      tant que la base n'est pas marquée (voir README, `alembic stamp 0001` puis `alembic upgrade head`).
+    """
+    revision = schema_revision(engine)
+    if revision == SCHEMA_REVISION:
+        return CURRENT
+    if revision is not None:
+        return OUTDATED
+
+    with engine.connect() as connection:
+        legacy = inspect(connection).has_table(User.__tablename__)
+
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        seed_default_roles(db)
+        db.commit()
+
+    if legacy:
+        return LEGACY
+    stamp(engine)
+    return CREATED
+
+
+def seed_default_roles(db: Session):
+    """
+    Ajoute les rôles par défaut manquants (une requête de lecture, aucune écriture si tout existe)
+    et retourne les noms des rôles créés. La validation (commit) est laissée à l'appelant.
+    """
+    existing = set(db.scalars(select(Role.name).where(Role.name.in_(DEFAULT_ROLES))))
+    created = [name for name in DEFAULT_ROLES if name not in existing]
+    db.add_all([Role(name=name, description=f"{name} role") for name in created])
+    return created
+
+
+def stamp(engine):
+    """
+    Enregistre la révision courante dans la table alembic_version d'une base créée par create_all.
+    Alembic n'est importé que dans ce cas (premier démarrage).
+    """
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    alembic_config = Config(os.path.join(root, "alembic.ini"))
+    alembic_config.set_main_option("script_location", os.path.join(root, "migrations"))
+    script = ScriptDirectory.from_config(alembic_config)
+
+    with engine.begin() as connection:
+        MigrationContext.configure(connection).stamp(script, SCHEMA_REVISION)
@@ -0,0 +1,325 @@
+import hashlib
+import threading
+import time
+import uuid
+import weakref
+from dataclasses import dataclass, field
+import jwt
+from sqlalchemy import and_, delete, event, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from controllers import principal_cache
+from controllers.principal_cache import TTLCache
+from models.base_model import dialect_insert
+from models.revoked_token_model import RevokedToken
+import config
+
+"""
+Jetons d'authentification sans état : un jeton d'accès (courte durée) et un jeton de rafraîchissement
+(config.REFRESH_TOKEN_EXPIRE_DAYS) signés avec la même clé. Un jeton vérifié est gardé dans un cache LRU,
+indexé par l'empreinte SHA-256 du jeton, jusqu'à son expiration : les vérifications suivantes ne décodent plus
+le JWT. La révocation (déconnexion, rotation, suppression d'un collaborateur) est enregistrée dans la table
+revoked_tokens, dont chaque processus garde une copie relue au plus toutes les config.TOKEN_REVOCATION_SYNC
+secondes (immédiatement après une révocation faite par le processus lui-même).
+"""
+SECRET_KEY = "epic-events-secret-key"
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 45
+
+ACCESS = "access"
+REFRESH = "refresh"
+
+
+class TokenError(Exception):
+    """
+    Jeton invalide, expiré ou révoqué ; le message est destiné à l'utilisateur.
+    """
+
+
+class TokenExpired(TokenError):
+    """
+    Jeton dont la date d'expiration est dépassée.
+    """
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Identité de l'utilisateur connectée, issue des claims du token vérifié.
+    """
+
+    email: str
+    expires_at: float
+    claims: dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class TokenPair:
+    """
+    Jetons remis à un client à la connexion : jeton d'accès, jeton de rafraîchissement et durée de validité
+    du jeton d'accès (secondes).
+    """
+
+    access_token: str
+    refresh_token: str
+    expires_in: int
+
+    def as_dict(self):
+        """
+        Réponse de connexion (format OAuth 2.0).
+        """
+        return {
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "token_type": "bearer",
+            "expires_in": self.expires_in,
+        }
+
+
+def encode(claims: dict, kind=ACCESS, expires_in=None):
+    """
+    Signe un jeton du type donné avec un identifiant unique (jti), sa date d'émission et son expiration
+    (`expires_in` secondes, 15 minutes par défaut).
+    """
+    now = time.time()
+    payload = {
+        **claims,
+        "type": kind,
+        "jti": uuid.uuid4().hex,
+        "iat": int(now),
+        "exp": int(now + (expires_in if expires_in is not None else 15 * 60)),
+    }
+    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def issue(email):
+    """
+    Émet un jeton d'accès et un jeton de rafraîchissement pour le collaborateur.
+    """
+    access_expires_in = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    return TokenPair(
+        access_token=encode({"sub": email}, ACCESS, access_expires_in),
+        refresh_token=encode({"sub": email}, REFRESH, config.REFRESH_TOKEN_EXPIRE_DAYS * 86400),
+        expires_in=access_expires_in,
+    )
+
+
+_verified = TTLCache(config.TOKEN_CACHE_SIZE, config.REFRESH_TOKEN_EXPIRE_DAYS * 86400)
+
+
+def fingerprint(token):
+    """
+    Clé du jeton dans le cache : son empreinte SHA-256 (le jeton lui-même n'est pas conservé).
+    """
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def decode(token, kind=ACCESS):
+    """
+    Vérifie la signature, l'expiration et le type du jeton (sans consulter la base) et retourne l'identité
+    qu'il porte. Le résultat est mis en cache jusqu'à l'expiration du jeton. Lève TokenExpired ou TokenError.
+    Un jeton sans type (émis avant les jetons de rafraîchissement) est un jeton d'accès.
+    """
+    key = fingerprint(token)
+    principal = _verified.get(key)
+    if principal is None:
+        try:
+            claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except jwt.ExpiredSignatureError:
+            raise TokenExpired("Token expired. You need to log in again.")
+        except jwt.InvalidTokenError:
+            raise TokenError("Invalid token. Please log in again.")
+        if claims.get("sub") is None or "exp" not in claims:
+            raise TokenError("Invalid token. Please log in again.")
+        principal = Principal(email=claims["sub"], expires_at=float(claims["exp"]), claims=claims)
+        _verified.set(key, principal, principal.expires_at - time.time())
+    elif principal.expires_at <= time.time():
+        raise TokenExpired("Token expired. You need to log in again.")
+
+    if principal.claims.get("type", ACCESS) != kind:
+        raise TokenError("Invalid token. Please log in again.")
+    return principal
+
+
+class RevocationList:
+    """
+    Copie locale des révocations encore utiles d'une base : identifiants de jetons révoqués et, par collaborateur,
+    date avant laquelle tous ses jetons sont révoqués. Relue depuis la table au plus toutes les `sync_interval`
+    secondes, ou à la prochaine vérification si elle a été marquée périmée.
+    """
+
+    def __init__(self, sync_interval=None, clock=time.monotonic):
+        self.sync_interval = config.TOKEN_REVOCATION_SYNC if sync_interval is None else sync_interval
+        self.clock = clock
+        self.snapshot = (frozenset(), {})
+        self.synced_at = None
+
+    def sync(self, db: Session):
+        """
+        Relit les révocations non expirées si la copie est périmée (une requête sur l'index d'expiration).
+        Aucun verrou n'est tenu pendant la requête (les requêtes de l'API partagent le thread de la boucle
+        d'événements) : la nouvelle copie remplace l'ancienne en une affectation.
+        """
+        if self.synced_at is not None and self.clock() - self.synced_at < self.sync_interval:
+            return
+        rows = db.execute(
+            select(RevokedToken.jti, RevokedToken.subject, RevokedToken.issued_before).where(
+                RevokedToken.expires_at > int(time.time())
+            )
+        ).all()
+        subjects = {}
+        for _, subject, issued_before in rows:
+            if subject is not None and issued_before is not None:
+                subjects[subject] = max(issued_before, subjects.get(subject, issued_before))
+        self.snapshot = (frozenset(jti for jti, _, _ in rows if jti is not None), subjects)
+        self.synced_at = self.clock()
+
+    def expire(self):
+        """
+        Marque la copie comme périmée : elle sera relue à la prochaine vérification.
+        """
+        self.synced_at = None
+
+    def is_revoked(self, principal):
+        """
+        Indique si le jeton est révoqué, d'après la copie locale.
+        """
+        jtis, subjects = self.snapshot
+        if principal.claims.get("jti") in jtis:
+            return True
+        issued_before = subjects.get(principal.email)
+        return issued_before is not None and principal.claims.get("iat", 0) <= issued_before
+
+
+_revocations = weakref.WeakKeyDictionary()
+_revocations_lock = threading.Lock()
+
+
+def revocations(db: Session):
+    """
+    Retourne la liste de révocation du moteur de la session, créée à la première utilisation.
+    """
+    bind = db.get_bind()
+    engine = getattr(bind, "engine", bind)
+    with _revocations_lock:
+        revocation_list = _revocations.get(engine)
+        if revocation_list is None:
+            revocation_list = _revocations[engine] = RevocationList()
+        return revocation_list
+
+
+def revoked_in_database(db: Session, principal):
+    """
+    Indique si le jeton est révoqué, d'après la table elle-même (une requête indexée).
+    """
+    claims = principal.claims
+    condition = or_(
+        RevokedToken.jti == claims.get("jti"),
+        and_(RevokedToken.subject == principal.email, RevokedToken.issued_before >= claims.get("iat", 0)),
+    )
+    return db.scalar(select(RevokedToken.id).where(condition).limit(1)) is not None
+
+
+def is_revoked(db: Session, principal):
+    """
+    Indique si le jeton est révoqué, d'après la copie locale de la liste de révocation (relue si besoin).
+    """
+    revocation_list = revocations(db)
+    revocation_list.sync(db)
+    return revocation_list.is_revoked(principal)
+
+
+def verify(db: Session, token, kind=ACCESS):
+    """
+    Vérifie un jeton (signature, expiration, type et révocation) et retourne son identité ; lève TokenError sinon.
+    Un jeton d'accès est contrôlé sur la copie locale de la liste de révocation, un jeton de rafraîchissement
+    (plus rare, à usage unique) directement dans la table.
+    """
+    principal = decode(token, kind)
+    revoked = revoked_in_database(db, principal) if kind == REFRESH else is_revoked(db, principal)
+    if revoked:
+        raise TokenError("Token revoked. Please log in again.")
+    return principal
+
+
+def revoke(db: Session, principal):
+    """
+    Révoque un jeton (déconnexion, rotation) et purge les révocations devenues inutiles. Idempotent : un jeton
+    déjà révoqué (par exemple par un autre processus dont la copie de la liste n'est pas encore relue) ne lève
+    pas d'erreur. Retourne True si le jeton vient d'être révoqué, False s'il l'était déjà.
+    La révocation prend effet à la validation de la transaction par l'appelant.
+    """
+    now = int(time.time())
+    db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+    values = {"jti": principal.claims.get("jti"), "subject": principal.email, "expires_at": int(principal.expires_at)}
+    expire_on_commit(db)
+    statement = dialect_insert(db, RevokedToken)
+    if statement is not None:
+        return db.execute(statement.values(**values).on_conflict_do_nothing(index_elements=["jti"])).rowcount == 1
+    try:
+        with db.begin_nested():
+            db.add(RevokedToken(**values))
+    except IntegrityError:
+        return False
+    return True
+
+
+def revoke_subject(db: Session, email):
+    """
+    Révoque tous les jetons déjà émis pour ce collaborateur (suppression du collaborateur) ; la ligne est gardée
+    jusqu'à l'expiration du plus long d'entre eux. Prend effet à la validation de la transaction par l'appelant.
+    """
+    now = int(time.time())
+    db.add(
+        RevokedToken(
+            subject=email, issued_before=now, expires_at=int(now + config.REFRESH_TOKEN_EXPIRE_DAYS * 86400)
+        )
+    )
+    expire_on_commit(db)
+
+
+def refresh(db: Session, refresh_token):
+    """
+    Échange un jeton de rafraîchissement contre une nouvelle paire de jetons. L'ancien jeton est révoqué
+    (rotation) : un jeton déjà utilisé est refusé. Le collaborateur doit toujours exister.
+    """
+    principal = verify(db, refresh_token, REFRESH)
+    if principal_cache.principal(db, principal.email) is None:
+        raise TokenError("Invalid token. Please log in again.")
+    if not revoke(db, principal):
+        raise TokenError("Token revoked. Please log in again.")
+    return issue(principal.email)
+
+
+def expire_on_commit(db: Session):
+    """
+    Programme la relecture de la liste de révocation du processus quand la transaction en cours est validée.
+    """
+    db.info.setdefault("token_revocations", set()).add(revocations(db))
+
+
+@event.listens_for(Session, "after_commit")
+def expire_revocation_lists(session):
+    """
+    Après la validation d'une révocation, la copie locale est relue à la prochaine vérification.
+    """
+    for revocation_list in session.info.pop("token_revocations", ()):
+        revocation_list.expire()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def forget_revocations(session, previous_transaction):
+    """
+    Une révocation annulée n'a rien à relire (transaction principale uniquement).
+    """
+    if not previous_transaction.nested:
+        session.info.pop("token_revocations", None)
+
+
+def clear():
+    """
+    Vide le cache des jetons vérifiés et oublie les listes de révocation (tests).
+    """
+    _verified.clear()
+    with _revocations_lock:
+        _revocations.clear()
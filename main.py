@@ -1,48 +1,535 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, configure_mappers
-from models.base_model import Base
+import argparse
+import datetime
+import sys
+from sqlalchemy.orm import sessionmaker
 from models.user_model import User, Role
 from models.client_model import Client
 from models.contract_model import Contract
 from models.event_model import Event
-from controllers.auth_controller import AuthController
+from models.audit_log_model import AuditLog
+from models.contract_summary_model import ContractSummary
+from models.revoked_token_model import RevokedToken
+from controllers import permissions, profiling, slow_query_log
+from controllers import startup
+from rich.console import Console
+from sqlalchemy.exc import SQLAlchemyError
 import config
-import sentry_sdk
 from config import SENTRY_DSN
-from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
-from sentry_sdk.integrations.logging import LoggingIntegration
 
-sentry_sdk.init(
-    dsn=SENTRY_DSN,
-    integrations=[SqlalchemyIntegration(), LoggingIntegration()],
-    traces_sample_rate=1.0,
-    environment="production",
-    send_default_pii=True,
-)
+engine = config.create_db_engine()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+"""
+Choix des options de la ligne de commande, écrits en dur pour que build_parser n'importe aucun contrôleur :
+chaque sous-commande n'importe que les siens (tests/test_startup.py vérifie qu'ils correspondent aux contrôleurs).
+"""
+IMPORT_ENTITIES = ("clients", "contracts", "events", "collaborators")
+EXPORT_ENTITIES = ("clients", "contracts", "events")
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+COMMAND_ACTIONS = {
+    "clients": ("list", "show", "create", "update", "delete"),
+    "contracts": ("list", "show", "create", "update", "sign", "delete"),
+    "events": ("list", "show", "create", "update", "delete"),
+    "collaborators": ("create", "update", "delete"),
+}
+COMMAND_VIEWS = {
+    "clients": ("mine",),
+    "contracts": ("mine", "unsigned", "amount-due"),
+    "events": ("upcoming", "without-support"),
+}
+AUDIT_ENTITIES = ("clients", "contracts", "events", "users")
+DASHBOARD_SOURCES = ("live", "summary")
+OUTPUT_FORMATS = ("table", "json", "jsonl", "csv")
+PROFILE_FORMATS = ("table", "json", "prometheus")
 
-configure_mappers()
-engine = create_engine(config.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def init_sentry():
+    """
+    Initialise Sentry au lancement (et non à l'import du module), uniquement si un DSN est configuré :
+    les intégrations ne sont importées que dans ce cas. Les taux d'échantillonnage dépendent de l'environnement
+    (voir config.SENTRY_ENVIRONMENT).
+    """
+    if not SENTRY_DSN:
+        return
+
+    import sentry_sdk
+    from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+    from sentry_sdk.integrations.logging import LoggingIntegration
+
+    sentry_sdk.init(
+        dsn=SENTRY_DSN,
+        integrations=[SqlalchemyIntegration(), LoggingIntegration()],
+        sample_rate=config.SENTRY_SAMPLE_RATE,
+        traces_sample_rate=config.SENTRY_TRACES_SAMPLE_RATE,
+        environment=config.SENTRY_ENVIRONMENT,
+        send_default_pii=config.SENTRY_SEND_DEFAULT_PII,
+    )
 
 
-def init_db():
+def prepare_database():
     """
-    Initialise la base de données en créant toutes les tables définies.
+    Prépare la base au lancement du menu : une base déjà à la révision courante (schéma et rôles par défaut)
+    ne coûte qu'une requête ; une base vide est créée, remplie des rôles par défaut et marquée
+    à cette révision.
     """
-    Base.metadata.create_all(bind=engine)
+    state = startup.ensure_database(engine)
+    if state == startup.OUTDATED:
+        Console().print("[bold yellow]The database schema is out of date. Run 'alembic upgrade head'.[/bold yellow]")
+    elif state == startup.LEGACY:
+        Console().print(
+            "[bold yellow]The database was created before Alembic. "
+            "Run 'alembic stamp 0001' then 'alembic upgrade head'.[/bold yellow]"
+        )
+    return state
 
 
 def main():
     """
     Démarre l'application en initialisant la base de données et les contrôleurs.
+    Chaque action du menu des données utilise ensuite sa propre session issue de SessionLocal.
     """
+    from controllers.auth_controller import AuthController
+
     db = SessionLocal()
+    auth_controller = AuthController(db, session_factory=SessionLocal)
+
+    try:
+        auth_controller.start()
+    finally:
+        db.close()
+
+
+def build_parser():
+    """
+    Construit l'analyseur de la ligne de commande (sans sous-commande : menu interactif).
+    Aucun contrôleur n'est importé ici : les tailles de lot et limites par défaut sont celles des contrôleurs,
+    appliquées par la sous-commande exécutée.
+    """
+    parser = argparse.ArgumentParser(prog="epic", description="Epic Events CRM")
+    parser.add_argument(
+        "--profile", action="store_true", help="Report SQL statements, database time and rows per action on exit"
+    )
+    parser.add_argument("--profile-format", choices=PROFILE_FORMATS, default="table")
+    parser.add_argument("--profile-output", help="Write the profile to this file instead of standard error")
+    subparsers = parser.add_subparsers(dest="command")
+
+    import_parser = subparsers.add_parser(
+        "import", help="Bulk import clients, contracts, events or collaborators (Admin only)"
+    )
+    import_parser.add_argument("entity", choices=IMPORT_ENTITIES)
+    import_parser.add_argument("path", help="CSV or JSONL file to import")
+    import_parser.add_argument("--format", choices=["csv", "jsonl"], help="File format (default: from extension)")
+    import_parser.add_argument("--batch-size", type=int, help="Rows per batch (default: 1000)")
+
+    export_parser = subparsers.add_parser(
+        "export", help="Stream clients, contracts or events to CSV, JSONL or Parquet"
+    )
+    export_parser.add_argument("entity", choices=EXPORT_ENTITIES)
+    export_parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    export_parser.add_argument("--output", "-o", default="-", help="Output file (default: standard output)")
+    export_parser.add_argument("--columns", help="Comma-separated list of columns to export")
+    export_parser.add_argument(
+        "--since", type=datetime.date.fromisoformat, help="Only rows dated on or after this day (YYYY-MM-DD)"
+    )
+    export_parser.add_argument("--mine", action="store_true", help="Only export your own portfolio")
+    export_parser.add_argument("--batch-size", type=int, help="Rows per batch (default: 1000)")
+
+    for entity, actions in COMMAND_ACTIONS.items():
+        entity_parser = subparsers.add_parser(entity, help=f"Manage {entity} without prompts")
+        action_parsers = entity_parser.add_subparsers(dest="action", required=True)
+        for action in actions:
+            action_parser = action_parsers.add_parser(action)
+            if action == "list":
+                action_parser.add_argument("--format", choices=OUTPUT_FORMATS, default="table")
+                action_parser.add_argument("--view", choices=COMMAND_VIEWS[entity], help="Filtered view")
+                action_parser.add_argument("--limit", type=int, help="Maximum number of rows")
+                continue
+            if action != "create":
+                action_parser.add_argument("id", type=int)
+            if action in ("create", "update"):
+                action_parser.add_argument(
+                    "--set",
+                    dest="values",
+                    metavar="FIELD=VALUE",
+                    type=assignment,
+                    action="append",
+                    default=[],
+                    help="Field value (repeatable)",
+                )
+
+    audit_parser = subparsers.add_parser("audit", help="Search the audit log (Admin only)")
+    audit_parser.add_argument("--entity", choices=AUDIT_ENTITIES)
+    audit_parser.add_argument("--id", type=int, help="Entity ID")
+    audit_parser.add_argument("--actor", help="Email of the collaborator who made the change")
+    audit_parser.add_argument("--action", choices=["create", "update", "delete"])
+    audit_parser.add_argument("--since", type=datetime.date.fromisoformat, help="From this day (YYYY-MM-DD)")
+    audit_parser.add_argument("--until", type=datetime.date.fromisoformat, help="Up to this day (YYYY-MM-DD)")
+    audit_parser.add_argument("--limit", type=int, help="Maximum number of entries (default: 100)")
+    audit_parser.add_argument("--format", choices=OUTPUT_FORMATS, default="table")
+
+    dashboard_parser = subparsers.add_parser(
+        "dashboard", help="Revenue, amount due and event load per collaborator (Admin only)"
+    )
+    dashboard_parser.add_argument("--format", choices=["table", "json"], default="table")
+    dashboard_parser.add_argument("--source", choices=DASHBOARD_SOURCES, help="Contract totals source")
+    dashboard_parser.add_argument(
+        "--refresh", action="store_true", help="Rebuild the contract summary table (repair) before displaying"
+    )
+
+    report_parser = subparsers.add_parser(
+        "report", help="Financial report: totals, amount due ageing and per-client roll-up (Admin only, needs numpy)"
+    )
+    report_parser.add_argument(
+        "--bounds",
+        type=lambda value: tuple(int(bound) for bound in value.split(",")),
+        help="Ageing bucket bounds in days (default: 30,60,90)",
+    )
+
+    subparsers.add_parser("logout", help="Revoke the saved token and log out")
+
+    slow_queries_parser = subparsers.add_parser(
+        "slow-queries", help="Summarize the slow query log by statement fingerprint"
+    )
+    slow_queries_parser.add_argument("--path", default=config.SLOW_QUERY_FILE, help="Slow query log file")
+    slow_queries_parser.add_argument("--limit", type=int, default=20, help="Number of statements to show")
+    slow_queries_parser.add_argument("--format", choices=["table", "json"], default="table")
+    slow_queries_parser.add_argument("--plans", action="store_true", help="Show the last plan of each statement")
+
+    batch_parser = subparsers.add_parser(
+        "batch", help="Run JSON operations (one per line) from a file or stdin in a single transaction"
+    )
+    batch_parser.add_argument("path", nargs="?", default="-", help="JSONL file (default: standard input)")
+    return parser
+
+
+def assignment(value):
+    """
+    Lit une affectation FIELD=VALUE de l'option --set.
+    """
+    name, separator, field_value = value.partition("=")
+    if not separator or not name.strip():
+        raise argparse.ArgumentTypeError(f"expected FIELD=VALUE, got '{value}'")
+    return name.strip(), field_value
+
+
+def authenticate(db):
+    """
+    Authentifie une seule fois l'utilisateur à partir du token enregistré et retourne le contrôleur
+    d'authentification (current_user renseigné), ou None s'il n'est pas (ou plus) connecté.
+    Les messages d'authentification sont écrits sur la sortie d'erreur pour ne pas se mêler aux données.
+    """
+    from controllers.auth_controller import AuthController
+
     auth_controller = AuthController(db)
+    auth_controller.console = Console(stderr=True)
+    if not auth_controller.is_authenticated():
+        return None
+    auth_controller.current_user = db.query(User).filter(User.email == auth_controller.principal.email).first()
+    return auth_controller if auth_controller.current_user else None
+
+
+def get_authenticated_user(db):
+    """
+    Retourne l'utilisateur correspondant au token enregistré, ou None s'il n'est pas (ou plus) connecté.
+    """
+    auth_controller = authenticate(db)
+    return auth_controller.current_user if auth_controller else None
+
+
+def run_import(args):
+    """
+    Importe un fichier en masse, pour un administrateur déjà connecté.
+    Retourne le code de sortie : 0 si tout est importé, 2 si des lignes ont été rejetées.
+    """
+    from controllers.import_controller import ImportController
+    from views.import_view import ImportView
+
+    import_view = ImportView()
+    db = SessionLocal()
+    try:
+        user = get_authenticated_user(db)
+        if not user or not permissions.allows(user.role.name, "import_data"):
+            import_view.print_error("Permission denied. Log in as an Admin to import data.")
+            return 1
+
+        import_controller = ImportController(db, batch_size=args.batch_size or ImportController.DEFAULT_BATCH_SIZE)
+        try:
+            report = import_controller.import_file(args.entity, args.path, args.format)
+        except (OSError, ValueError) as e:
+            import_view.print_error(str(e))
+            return 1
+
+        import_view.display_report(report)
+        return 2 if report.errors else 0
+    finally:
+        db.close()
+
+
+def run_export(args):
+    """
+    Exporte une table en flux pour l'utilisateur connecté, selon les règles de visibilité de son rôle.
+    """
+    from controllers.export_controller import ExportController
+    from views.export_view import ExportView
+
+    export_view = ExportView()
+    db = SessionLocal()
+    try:
+        user = get_authenticated_user(db)
+        if not user:
+            export_view.print_error("You must be logged in to export data.")
+            return 1
+
+        batch_size = args.batch_size or ExportController.DEFAULT_BATCH_SIZE
+        export_controller = ExportController(db, user, batch_size=batch_size)
+        columns = [name.strip() for name in args.columns.split(",")] if args.columns else None
+        output = sys.stdout if args.output == "-" else args.output
+        try:
+            report = export_controller.export(args.entity, output, args.format, columns, args.since, args.mine)
+        except (OSError, ValueError, PermissionError) as e:
+            export_view.print_error(str(e))
+            return 1
+
+        export_view.display_report(report)
+        return 0
+    finally:
+        db.close()
+
+
+def run_audit(args):
+    """
+    Affiche les lignes du journal d'audit correspondant aux critères, pour un administrateur connecté.
+    """
+    from controllers.audit_log_controller import AuditLogController
+    from controllers.command_controller import CommandController
+    from views.command_view import CommandView
+
+    command_view = CommandView()
+    db = SessionLocal()
+    try:
+        user = get_authenticated_user(db)
+        if not user:
+            command_view.print_error("You must be logged in to read the audit log.")
+            return 1
+
+        audit_log_controller = AuditLogController(db, user)
+        try:
+            query = audit_log_controller.search(
+                args.entity, args.id, args.actor, args.action, args.since, args.until, args.limit
+            )
+        except PermissionError as e:
+            command_view.print_error(str(e))
+            return 1
+
+        entries = audit_log_controller.entries(query)
+        command_view.display_records("audit_log", entries, args.format, CommandController.record)
+        return 0
+    finally:
+        db.close()
+
+
+def run_dashboard(args):
+    """
+    Affiche le tableau de bord pour un administrateur connecté, après avoir recalculé la table de synthèse
+    si `--refresh` est demandé.
+    """
+    from controllers.dashboard_controller import DashboardController
+    from views.command_view import CommandView
+
+    command_view = CommandView()
+    db = SessionLocal()
+    try:
+        user = get_authenticated_user(db)
+        if not user:
+            command_view.print_error("You must be logged in to view the dashboard.")
+            return 1
+
+        dashboard = DashboardController(db, user, args.source)
+        try:
+            if args.refresh:
+                rows = dashboard.refresh_summary()
+                db.commit()
+                command_view.console.print(f"[bold green]Contract summary rebuilt ({rows} rows).[/bold green]")
+            totals = dashboard.totals()
+            commercials = dashboard.rows(dashboard.commercials_query())
+            supports = dashboard.rows(dashboard.supports_query())
+        except PermissionError as e:
+            command_view.print_error(str(e))
+            return 1
+
+        command_view.display_dashboard(totals, commercials, supports, args.format)
+        return 0
+    finally:
+        db.close()
+
+
+def run_report(args):
+    """
+    Affiche le rapport financier vectorisé (JSON) pour un administrateur connecté.
+    """
+    from controllers import financial_report
+    from views.command_view import CommandView
+
+    command_view = CommandView()
+    db = SessionLocal()
+    try:
+        user = get_authenticated_user(db)
+        if not user or not permissions.allows(user.role.name, "view_reports"):
+            command_view.print_error("Permission denied. Log in as an Admin to run financial reports.")
+            return 1
+
+        try:
+            columns = financial_report.load_columns(db)
+        except ValueError as e:
+            command_view.print_error(str(e))
+            return 1
+
+        command_view.display_financial_report(
+            {
+                "totals": financial_report.totals(columns),
+                "ageing": financial_report.ageing(columns, bounds=args.bounds or financial_report.AGEING_BOUNDS),
+                "clients": financial_report.client_rollup(columns),
+            }
+        )
+        return 0
+    finally:
+        db.close()
+
+
+def run_logout(args):
+    """
+    Révoque le token enregistré (il est refusé partout, y compris par l'API) et supprime le fichier token.
+    """
+    from controllers.auth_controller import AuthController
+
+    db = SessionLocal()
+    try:
+        auth_controller = AuthController(db)
+        auth_controller.console = Console(stderr=True)
+        auth_controller.logout()
+        auth_controller.console.print("[bold green]Logged out.[/bold green]")
+        return 0
+    finally:
+        db.close()
+
+
+def run_slow_queries(args):
+    """
+    Résume le journal des requêtes lentes (fichier courant et copies tournées) par empreinte de requête,
+    les plus coûteuses en premier.
+    """
+    from views.command_view import CommandView
+
+    command_view = CommandView()
+    report = slow_query_log.summarize(slow_query_log.read_entries(args.path))
+    if not report:
+        command_view.print_error(f"No slow queries recorded in {args.path}.")
+        return 1
+    command_view.display_slow_queries(report[: args.limit], args.format, args.plans)
+    return 0
+
+
+def run_command(args, stdin=None):
+    """
+    Exécute une commande non interactive (`epic <entité> <action>` ou `epic batch`) pour l'utilisateur connecté.
+    Une commande, ou tout un lot, s'exécute dans une seule session et une seule transaction.
+    Retourne le code de sortie : 0 en cas de succès, 1 en cas d'erreur (rien n'est alors enregistré).
+    """
+    from controllers.command_controller import CommandController, CommandError
+    from views.command_view import CommandView
+
+    command_view = CommandView()
+    db = SessionLocal()
+    try:
+        auth_controller = authenticate(db)
+        if not auth_controller:
+            command_view.print_error("You must be logged in to run commands.")
+            return 1
+
+        command_controller = CommandController(db, auth_controller)
+        try:
+            if args.command == "batch":
+                results = run_batch_file(command_controller, args.path, stdin or sys.stdin)
+            elif args.action == "list":
+                query = command_controller.list_records(args.command, args.view, args.limit)
+                command_view.display_records(
+                    args.command, query.yield_per(500), args.format, command_controller.record
+                )
+                return 0
+            else:
+                values = dict(getattr(args, "values", []))
+                results = [command_controller.run(args.command, args.action, getattr(args, "id", None), values)]
+                db.commit()
+        except CommandError as e:
+            db.rollback()
+            location = f"line {e.line}: " if e.line else ""
+            command_view.print_error(f"{location}{e}")
+            return 1
+        except (OSError, SQLAlchemyError) as e:
+            db.rollback()
+            command_view.print_error(str(e))
+            return 1
+
+        command_view.display_results(results)
+        return 0
+    finally:
+        db.close()
+
+
+def run_batch_file(command_controller, path, stdin):
+    """
+    Exécute les opérations d'un fichier JSONL (ou de l'entrée standard si `path` vaut "-").
+    """
+    if path == "-":
+        return command_controller.run_batch(stdin)
+    with open(path, encoding="utf-8") as source:
+        return command_controller.run_batch(source)
+
+
+def run(args):
+    """
+    Exécute la sous-commande demandée (ou le menu interactif) et retourne le code de sortie.
+    Une sous-commande est mesurée comme une action (voir --profile) ; les opérations qu'elle exécute
+    le sont à part.
+    """
+    runners = {
+        "import": run_import,
+        "export": run_export,
+        "audit": run_audit,
+        "dashboard": run_dashboard,
+        "report": run_report,
+        "logout": run_logout,
+        "slow-queries": run_slow_queries,
+    }
+    if args.command is None:
+        prepare_database()
+        main()
+        return 0
+    name = " ".join(part for part in (args.command, getattr(args, "action", None)) if part)
+    with profiling.action(name):
+        return runners.get(args.command, run_command)(args)
+
+
+def run_profiled(args):
+    """
+    Exécute la commande avec un profileur attaché au moteur, puis affiche ou enregistre ses mesures.
+    """
+    from views.command_view import CommandView
 
-    auth_controller.start()
+    profiler = profiling.Profiler(engine).attach()
+    try:
+        return run(args)
+    finally:
+        profiler.detach()
+        if args.profile_output:
+            with open(args.profile_output, "w", encoding="utf-8") as stream:
+                CommandView().display_profile(profiler, args.profile_format, stream)
+        else:
+            CommandView().display_profile(profiler, args.profile_format)
 
 
 if __name__ == "__main__":
-    init_db()
-    main()
+    args = build_parser().parse_args()
+    init_sentry()
+    slow_query_log.install(engine)
+    sys.exit(run_profiled(args) if args.profile else run(args))
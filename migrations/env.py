@@ -0,0 +1,84 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine, pool
+from models.base_model import Base
+from models.user_model import User, Role
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.audit_log_model import AuditLog
+from models.contract_summary_model import ContractSummary
+from models.revoked_token_model import RevokedToken
+from models.search_index import is_search_index
+import config as app_config
+
+"""
+Environnement Alembic : les migrations ciblent config.DATABASE_URL,
+sauf si une URL est fournie via `sqlalchemy.url` (tests) ou `alembic -x url=...`.
+"""
+
+alembic_config = context.config
+
+if alembic_config.config_file_name is not None and alembic_config.attributes.get("configure_logger", True):
+    fileConfig(alembic_config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def get_url():
+    """
+    Retourne l'URL de la base à migrer.
+    """
+    return (
+        context.get_x_argument(as_dictionary=True).get("url")
+        or alembic_config.get_main_option("sqlalchemy.url")
+        or app_config.DATABASE_URL
+    )
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """
+    Exclut de l'autogénération les index de recherche (tables FTS5, index trigrammes) : ils sont gérés
+    par des instructions DDL propres à chaque dialecte, pas par les modèles.
+    """
+    return not (reflected and compare_to is None and is_search_index(name))
+
+
+def run_migrations_offline():
+    """
+    Génère le SQL des migrations sans connexion à la base.
+    """
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """
+    Applique les migrations sur la base.
+    """
+    connectable = create_engine(get_url(), poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,
+            include_object=include_object,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,101 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "roles",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+    )
+    op.create_index("ix_roles_id", "roles", ["id"])
+    op.create_index("ix_roles_name", "roles", ["name"], unique=True)
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("employee_number", sa.Integer(), nullable=True),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("department", sa.String(), nullable=True),
+        sa.Column("password_hash", sa.String(), nullable=True),
+        sa.Column("role_id", sa.Integer(), sa.ForeignKey("roles.id"), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_employee_number", "users", ["employee_number"], unique=True)
+    op.create_index("ix_users_full_name", "users", ["full_name"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "clients",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("phone", sa.String(), nullable=True),
+        sa.Column("company_name", sa.String(), nullable=True),
+        sa.Column("first_contact_date", sa.Date(), nullable=True),
+        sa.Column("last_contact_date", sa.Date(), nullable=True),
+        sa.Column("commercial_contact", sa.String(), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+    )
+    op.create_index("ix_clients_id", "clients", ["id"])
+    op.create_index("ix_clients_full_name", "clients", ["full_name"])
+    op.create_index("ix_clients_email", "clients", ["email"], unique=True)
+
+    op.create_table(
+        "contracts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("client_id", sa.Integer(), sa.ForeignKey("clients.id"), nullable=True),
+        sa.Column("commercial_contact", sa.String(), nullable=True),
+        sa.Column("total_amount", sa.Float(), nullable=True),
+        sa.Column("amount_due", sa.Float(), nullable=True),
+        sa.Column("creation_date", sa.Date(), nullable=True),
+        sa.Column("signed", sa.Boolean(), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+    )
+    op.create_index("ix_contracts_id", "contracts", ["id"])
+
+    op.create_table(
+        "events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("contract_id", sa.Integer(), sa.ForeignKey("contracts.id"), nullable=True),
+        sa.Column("client_id", sa.Integer(), sa.ForeignKey("clients.id"), nullable=True),
+        sa.Column("event_name", sa.String(), nullable=True),
+        sa.Column("event_date_start", sa.Date(), nullable=True),
+        sa.Column("event_date_end", sa.Date(), nullable=True),
+        sa.Column("support_contact", sa.String(), nullable=True),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("attendees", sa.Integer(), nullable=True),
+        sa.Column("notes", sa.String(), nullable=True),
+        sa.Column("client_contact", sa.String(), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+    )
+    op.create_index("ix_events_id", "events", ["id"])
+    op.create_index("ix_events_event_name", "events", ["event_name"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("events")
+    op.drop_table("contracts")
+    op.drop_table("clients")
+    op.drop_table("users")
+    op.drop_table("roles")
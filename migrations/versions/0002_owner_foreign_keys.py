@@ -0,0 +1,76 @@
+"""Owner foreign keys for clients, contracts and events
+
+Remplace les comparaisons de noms (commercial_contact / support_contact) par des clés étrangères
+indexées vers users, remplies à partir des noms existants.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("clients") as batch:
+        batch.add_column(sa.Column("commercial_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key("fk_clients_commercial_id_users", "users", ["commercial_id"], ["id"])
+        batch.create_index("ix_clients_commercial_id", ["commercial_id"])
+
+    with op.batch_alter_table("contracts") as batch:
+        batch.add_column(sa.Column("commercial_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key("fk_contracts_commercial_id_users", "users", ["commercial_id"], ["id"])
+        batch.create_index("ix_contracts_commercial_id", ["commercial_id"])
+
+    with op.batch_alter_table("events") as batch:
+        batch.add_column(sa.Column("support_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key("fk_events_support_id_users", "users", ["support_id"], ["id"])
+        batch.create_index("ix_events_support_id", ["support_id"])
+
+    # Remplissage à partir des noms : en cas d'homonymes, le collaborateur le plus ancien est retenu.
+    op.execute(
+        "UPDATE clients SET commercial_id = "
+        "(SELECT MIN(users.id) FROM users WHERE users.full_name = clients.commercial_contact)"
+    )
+    op.execute(
+        "UPDATE contracts SET commercial_id = "
+        "(SELECT MIN(users.id) FROM users WHERE users.full_name = contracts.commercial_contact)"
+    )
+    op.execute(
+        "UPDATE contracts SET commercial_id = "
+        "(SELECT clients.commercial_id FROM clients WHERE clients.id = contracts.client_id) "
+        "WHERE commercial_id IS NULL"
+    )
+    op.execute(
+        "UPDATE events SET support_id = "
+        "(SELECT MIN(users.id) FROM users WHERE users.full_name = events.support_contact)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("events") as batch:
+        batch.drop_index("ix_events_support_id")
+        batch.drop_constraint("fk_events_support_id_users", type_="foreignkey")
+        batch.drop_column("support_id")
+
+    with op.batch_alter_table("contracts") as batch:
+        batch.drop_index("ix_contracts_commercial_id")
+        batch.drop_constraint("fk_contracts_commercial_id_users", type_="foreignkey")
+        batch.drop_column("commercial_id")
+
+    with op.batch_alter_table("clients") as batch:
+        batch.drop_index("ix_clients_commercial_id")
+        batch.drop_constraint("fk_clients_commercial_id_users", type_="foreignkey")
+        batch.drop_column("commercial_id")
@@ -0,0 +1,59 @@
+"""Composite indexes for the portfolio views
+
+Les index simples sur commercial_id / support_id sont remplacés par des index composites
+(et partiels pour les contrats non signés / non soldés) adaptés aux filtres et au tri des vues "mon portefeuille".
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index("ix_clients_commercial_id", table_name="clients")
+    op.drop_index("ix_contracts_commercial_id", table_name="contracts")
+    op.drop_index("ix_events_support_id", table_name="events")
+
+    op.create_index("ix_clients_commercial_id_id", "clients", ["commercial_id", "id"])
+    op.create_index("ix_contracts_commercial_id_id", "contracts", ["commercial_id", "id"])
+    op.create_index(
+        "ix_contracts_unsigned_commercial_id_id",
+        "contracts",
+        ["commercial_id", "id"],
+        postgresql_where=sa.text("signed IS NOT true"),
+        sqlite_where=sa.text("signed IS NOT 1"),
+    )
+    op.create_index(
+        "ix_contracts_amount_due_commercial_id_id",
+        "contracts",
+        ["commercial_id", "id"],
+        postgresql_where=sa.text("amount_due > 0"),
+        sqlite_where=sa.text("amount_due > 0"),
+    )
+    op.create_index("ix_events_support_id_date_start_id", "events", ["support_id", "event_date_start", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_events_support_id_date_start_id", table_name="events")
+    op.drop_index("ix_contracts_amount_due_commercial_id_id", table_name="contracts")
+    op.drop_index("ix_contracts_unsigned_commercial_id_id", table_name="contracts")
+    op.drop_index("ix_contracts_commercial_id_id", table_name="contracts")
+    op.drop_index("ix_clients_commercial_id_id", table_name="clients")
+
+    op.create_index("ix_events_support_id", "events", ["support_id"])
+    op.create_index("ix_contracts_commercial_id", "contracts", ["commercial_id"])
+    op.create_index("ix_clients_commercial_id", "clients", ["commercial_id"])
@@ -0,0 +1,40 @@
+"""Default roles
+
+Crée les rôles par défaut (Admin, Commercial, Support) s'ils n'existent pas : une base à la révision
+courante a donc son schéma et ses données de référence, et le démarrage n'a plus à les vérifier.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 13:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULT_ROLES = ("Admin", "Commercial", "Support")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name in DEFAULT_ROLES:
+        op.execute(
+            sa.text(
+                "INSERT INTO roles (name, description) SELECT :name, :description "
+                "WHERE NOT EXISTS (SELECT 1 FROM roles WHERE name = :name)"
+            ).bindparams(name=name, description=f"{name} role")
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Les rôles peuvent être référencés par des collaborateurs : ils sont conservés.
+    pass
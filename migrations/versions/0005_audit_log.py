@@ -0,0 +1,48 @@
+"""Audit log table
+
+Journal d'audit en ajout seul (acteur, action, entité, détail des modifications),
+indexé par date, par entité et par acteur pour les recherches de conformité.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "audit_log",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("actor_id", sa.Integer(), nullable=True),
+        sa.Column("actor_email", sa.String(), nullable=True),
+        sa.Column("action", sa.String(), nullable=False),
+        sa.Column("entity", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=True),
+        sa.Column("changes", sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_audit_log_created_at_id", "audit_log", ["created_at", "id"])
+    op.create_index("ix_audit_log_entity_entity_id_created_at", "audit_log", ["entity", "entity_id", "created_at"])
+    op.create_index("ix_audit_log_actor_email_created_at", "audit_log", ["actor_email", "created_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_audit_log_actor_email_created_at", table_name="audit_log")
+    op.drop_index("ix_audit_log_entity_entity_id_created_at", table_name="audit_log")
+    op.drop_index("ix_audit_log_created_at_id", table_name="audit_log")
+    op.drop_table("audit_log")
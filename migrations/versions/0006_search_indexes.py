@@ -0,0 +1,56 @@
+"""Search indexes
+
+Index de recherche approximative sur les clients (nom, email, entreprise) et les événements (nom, lieu) :
+index GIN pg_trgm sous PostgreSQL, tables FTS5 (tokenizer trigram) synchronisées par triggers sous SQLite.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 16:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from models.search_index import TRGM_EXTENSION, drop_statements, postgresql_statements, sqlite_statements
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = {
+    "clients": ("full_name", "email", "company_name"),
+    "events": ("event_name", "location"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(sa.text(TRGM_EXTENSION))
+    for table_name, columns in SEARCH_COLUMNS.items():
+        if dialect == "sqlite":
+            statements = sqlite_statements(table_name, columns)
+        elif dialect == "postgresql":
+            statements = postgresql_statements(table_name, columns)
+        else:
+            statements = []
+        for statement in statements:
+            op.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table_name, columns in SEARCH_COLUMNS.items():
+        if dialect == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                op.execute(sa.text(f"DROP TRIGGER IF EXISTS {table_name}_fts_{suffix}"))
+        if dialect in ("sqlite", "postgresql"):
+            for statement in drop_statements(dialect, table_name, columns):
+                op.execute(sa.text(statement))
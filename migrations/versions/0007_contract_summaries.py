@@ -0,0 +1,57 @@
+"""Contract summaries
+
+Table de synthèse du tableau de bord : totaux des contrats par commercial et par client,
+remplie à partir des contrats existants.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 17:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "contract_summaries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("commercial_id", sa.Integer(), nullable=True),
+        sa.Column("client_id", sa.Integer(), nullable=True),
+        sa.Column("contract_count", sa.Integer(), nullable=False),
+        sa.Column("signed_count", sa.Integer(), nullable=False),
+        sa.Column("signed_total", sa.Float(), nullable=False),
+        sa.Column("amount_due", sa.Float(), nullable=False),
+        sa.Column("last_activity", sa.Date(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_contract_summaries_commercial_id_client_id",
+        "contract_summaries",
+        ["commercial_id", "client_id"],
+        unique=True,
+    )
+    op.execute(
+        "INSERT INTO contract_summaries (commercial_id, client_id, contract_count, signed_count, signed_total, "
+        "amount_due, last_activity, updated_at) "
+        "SELECT commercial_id, client_id, COUNT(id), COUNT(CASE WHEN signed THEN id END), "
+        "COALESCE(SUM(CASE WHEN signed THEN total_amount ELSE 0 END), 0), COALESCE(SUM(amount_due), 0), "
+        "MAX(creation_date), CURRENT_TIMESTAMP FROM contracts GROUP BY commercial_id, client_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_contract_summaries_commercial_id_client_id", table_name="contract_summaries")
+    op.drop_table("contract_summaries")
@@ -0,0 +1,50 @@
+"""Numeric amounts
+
+Montants exacts : total_amount et amount_due des contrats passent en NUMERIC(12, 2),
+les totaux de la synthèse en NUMERIC(14, 2). Les valeurs existantes sont arrondies au centime.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AMOUNT_COLUMNS = {
+    "contracts": (("total_amount", "amount_due"), sa.Numeric(12, 2)),
+    "contract_summaries": (("signed_total", "amount_due"), sa.Numeric(14, 2)),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name, (columns, numeric) in AMOUNT_COLUMNS.items():
+        with op.batch_alter_table(table_name) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.Float(),
+                    type_=numeric,
+                    postgresql_using=f"round({column}::numeric, {numeric.scale})",
+                )
+        if op.get_bind().dialect.name != "postgresql":
+            assignments = ", ".join(f"{column} = round({column}, {numeric.scale})" for column in columns)
+            op.execute(f"UPDATE {table_name} SET {assignments}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name, (columns, numeric) in AMOUNT_COLUMNS.items():
+        with op.batch_alter_table(table_name) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, existing_type=numeric, type_=sa.Float())
@@ -0,0 +1,47 @@
+"""Contract owner follows client
+
+Le commercial d'un contrat est désormais toujours celui de son client : les contrats existants sont réalignés
+(clé et nom du commercial) et la synthèse des contrats est recalculée. Index sur contracts.client_id (suivi de
+la réaffectation d'un client) et sur events.contract_id (événements des contrats d'un commercial).
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 21:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_contracts_client_id", "contracts", ["client_id"])
+    op.create_index("ix_events_contract_id", "events", ["contract_id"])
+    op.execute(
+        "UPDATE contracts SET "
+        "commercial_id = (SELECT clients.commercial_id FROM clients WHERE clients.id = contracts.client_id), "
+        "commercial_contact = (SELECT clients.commercial_contact FROM clients WHERE clients.id = contracts.client_id) "
+        "WHERE client_id IS NOT NULL"
+    )
+    op.execute("DELETE FROM contract_summaries")
+    op.execute(
+        "INSERT INTO contract_summaries (commercial_id, client_id, contract_count, signed_count, signed_total, "
+        "amount_due, last_activity, updated_at) "
+        "SELECT commercial_id, client_id, COUNT(id), COUNT(CASE WHEN signed THEN id END), "
+        "COALESCE(SUM(CASE WHEN signed THEN total_amount ELSE 0 END), 0), COALESCE(SUM(amount_due), 0), "
+        "MAX(creation_date), CURRENT_TIMESTAMP FROM contracts GROUP BY commercial_id, client_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_events_contract_id", table_name="events")
+    op.drop_index("ix_contracts_client_id", table_name="contracts")
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from models.base_model import Base
+from datetime import datetime, timezone
+
+
+class AuditLog(Base):
+    """
+    Journal d'audit en ajout seul : qui (acteur) a fait quoi (action) sur quelle entité, avec le détail
+    des champs modifiés ({"champ": [ancienne valeur, nouvelle valeur]}).
+    L'acteur est conservé par identifiant et email, sans clé étrangère : le journal survit à la suppression
+    d'un collaborateur.
+    """
+
+    __tablename__ = "audit_log"
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    actor_id = Column(Integer)
+    actor_email = Column(String)
+    action = Column(String, nullable=False)
+    entity = Column(String, nullable=False)
+    entity_id = Column(Integer)
+    changes = Column(JSON)
+
+    # Index des recherches de conformité : par période, par entité (historique d'un enregistrement)
+    # et par acteur, toujours triées du plus récent au plus ancien.
+    __table_args__ = (
+        Index("ix_audit_log_created_at_id", "created_at", "id"),
+        Index("ix_audit_log_entity_entity_id_created_at", "entity", "entity_id", "created_at"),
+        Index("ix_audit_log_actor_email_created_at", "actor_email", "created_at"),
+    )
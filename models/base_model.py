@@ -2,3 +2,20 @@
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
+
+
+def dialect_insert(bind, model):
+    """
+    Retourne un INSERT sur la table du modèle propre au dialecte de `bind` (session, connexion ou moteur),
+    qui accepte ON CONFLICT (on_conflict_do_nothing / on_conflict_do_update) : PostgreSQL et SQLite.
+    Retourne None pour les autres bases.
+    """
+    bind = bind.get_bind() if hasattr(bind, "get_bind") else bind
+    name = bind.dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(model)
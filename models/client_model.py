@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from models.base_model import Base
+from models.search_index import register_search_index
 from datetime import datetime
 
 
@@ -18,8 +19,18 @@ class Client(Base):
     first_contact_date = Column(Date, default=datetime.utcnow)
     last_contact_date = Column(Date, default=datetime.utcnow)
     commercial_contact = Column(String)
+    commercial_id = Column(Integer, ForeignKey("users.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
 
-    user = relationship("User", back_populates="clients")
+    user = relationship("User", back_populates="clients", foreign_keys=[user_id])
+    commercial = relationship("User", foreign_keys=[commercial_id])
     contracts = relationship("Contract", back_populates="client")
     events = relationship("Event", back_populates="client")
+
+    # Index composite pour "mes clients" : filtre sur le commercial, tri par identifiant (pagination keyset)
+    __table_args__ = (Index("ix_clients_commercial_id_id", "commercial_id", "id"),)
+
+
+# Colonnes couvertes par la recherche approximative (index trigrammes, voir models/search_index.py)
+CLIENT_SEARCH_COLUMNS = ("full_name", "email", "company_name")
+register_search_index(Client.__table__, CLIENT_SEARCH_COLUMNS)
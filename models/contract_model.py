@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, Date, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, Date, Boolean, Index
 from sqlalchemy.orm import relationship
 from models.base_model import Base
 
@@ -12,13 +12,37 @@ class Contract(Base):
     id = Column(Integer, primary_key=True, index=True)
     client_id = Column(Integer, ForeignKey("clients.id"))
     commercial_contact = Column(String)
-    total_amount = Column(Float)
-    amount_due = Column(Float)
+    commercial_id = Column(Integer, ForeignKey("users.id"))
+    # Montants exacts (Decimal à deux décimales) : les sommes sur des milliers de contrats ne dérivent pas
+    total_amount = Column(Numeric(12, 2))
+    amount_due = Column(Numeric(12, 2))
     creation_date = Column(Date)
     signed = Column(Boolean)
     user_id = Column(Integer, ForeignKey("users.id"))
     # description = Column(String)
 
-    user = relationship("User", back_populates="contracts")
+    user = relationship("User", back_populates="contracts", foreign_keys=[user_id])
+    commercial = relationship("User", foreign_keys=[commercial_id])
     client = relationship("Client", back_populates="contracts")
     events = relationship("Event", back_populates="contract")
+
+    # Index composites pour "mes contrats", et index partiels pour les contrats non signés / non soldés ;
+    # index sur le client pour suivre sa réaffectation (voir controllers/ownership.py)
+    __table_args__ = (
+        Index("ix_contracts_commercial_id_id", commercial_id, id),
+        Index("ix_contracts_client_id", client_id),
+        Index(
+            "ix_contracts_unsigned_commercial_id_id",
+            commercial_id,
+            id,
+            postgresql_where=signed.isnot(True),
+            sqlite_where=signed.isnot(True),
+        ),
+        Index(
+            "ix_contracts_amount_due_commercial_id_id",
+            commercial_id,
+            id,
+            postgresql_where=amount_due > 0,
+            sqlite_where=amount_due > 0,
+        ),
+    )
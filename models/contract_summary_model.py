@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, Numeric, Date, DateTime, Index
+from models.base_model import Base
+from datetime import datetime, timezone
+
+
+class ContractSummary(Base):
+    """
+    Totaux des contrats par commercial et par client (nombre de contrats, contrats signés, chiffre d'affaires
+    signé, reste à payer, dernière activité). Table de synthèse du tableau de bord, recalculée en SQL
+    à partir de `contracts` : elle ne fait jamais autorité sur les contrats eux-mêmes.
+    Les identifiants ne portent pas de clé étrangère, comme pour le journal d'audit : un recalcul suffit
+    à refléter la suppression d'un client ou d'un collaborateur.
+    """
+
+    __tablename__ = "contract_summaries"
+
+    id = Column(Integer, primary_key=True)
+    commercial_id = Column(Integer)
+    client_id = Column(Integer)
+    contract_count = Column(Integer, nullable=False, default=0)
+    signed_count = Column(Integer, nullable=False, default=0)
+    signed_total = Column(Numeric(14, 2), nullable=False, default=0)
+    amount_due = Column(Numeric(14, 2), nullable=False, default=0)
+    last_activity = Column(Date)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    # Une ligne par couple (commercial, client) ; le tableau de bord agrège par commercial.
+    __table_args__ = (
+        Index("ix_contract_summaries_commercial_id_client_id", "commercial_id", "client_id", unique=True),
+    )
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Index
 from sqlalchemy.orm import relationship
 from models.base_model import Base
+from models.search_index import register_search_index
 
 
 class Event(Base):
@@ -16,12 +17,26 @@ class Event(Base):
     event_date_start = Column(Date)
     event_date_end = Column(Date)
     support_contact = Column(String)
+    support_id = Column(Integer, ForeignKey("users.id"))
     location = Column(String)
     attendees = Column(Integer)
     notes = Column(String)
     client_contact = Column(String)
     user_id = Column(Integer, ForeignKey("users.id"))
 
-    user = relationship("User", back_populates="events")
+    user = relationship("User", back_populates="events", foreign_keys=[user_id])
+    support = relationship("User", foreign_keys=[support_id])
     client = relationship("Client", back_populates="events")
     contract = relationship("Contract", back_populates="events")
+
+    # Index composite pour "mes événements à venir" : filtre sur le support, tri par date puis identifiant ;
+    # index sur le contrat pour les événements des contrats d'un commercial
+    __table_args__ = (
+        Index("ix_events_support_id_date_start_id", "support_id", "event_date_start", "id"),
+        Index("ix_events_contract_id", "contract_id"),
+    )
+
+
+# Colonnes couvertes par la recherche approximative (index trigrammes, voir models/search_index.py)
+EVENT_SEARCH_COLUMNS = ("event_name", "location")
+register_search_index(Event.__table__, EVENT_SEARCH_COLUMNS)
@@ -0,0 +1,82 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import config
+
+"""
+Hachage des mots de passe (argon2id via passlib) avec les paramètres de config : coût en temps (passes),
+coût en mémoire (Kio) et parallélisme (voies). Un hash calculé avec d'autres paramètres reste vérifiable ;
+needs_rehash() le signale pour qu'il soit recalculé à la connexion suivante.
+"""
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+class PasswordHash(str):
+    """
+    Mot de passe déjà haché (par exemple dans un thread, hors de la boucle d'événements de l'API) :
+    User.set_password l'enregistre tel quel au lieu de le hacher.
+    """
+
+
+def configure(time_cost=None, memory_cost=None, parallelism=None):
+    """
+    Construit et installe le hacheur de l'application ; un paramètre absent est lu dans config.
+    Retourne le hacheur (gestionnaire passlib configuré) ; passlib n'est importé qu'ici, au premier hachage.
+    """
+    from passlib.hash import argon2
+
+    global _hasher
+    hasher = argon2.using(
+        time_cost=time_cost or config.ARGON2_TIME_COST,
+        memory_cost=memory_cost or config.ARGON2_MEMORY_COST,
+        parallelism=parallelism or config.ARGON2_PARALLELISM,
+    )
+    with _hasher_lock:
+        _hasher = hasher
+    return hasher
+
+
+def get_hasher():
+    """
+    Retourne le hacheur de l'application, construit à la première utilisation.
+    """
+    return _hasher or configure()
+
+
+def hash_password(password):
+    """
+    Hache un mot de passe avec les paramètres courants.
+    """
+    return get_hasher().hash(password)
+
+
+def verify_password(password, password_hash):
+    """
+    Vérifie un mot de passe contre son hash, quels que soient les paramètres avec lesquels il a été calculé.
+    """
+    if not password_hash:
+        return False
+    return get_hasher().verify(password, password_hash)
+
+
+def needs_rehash(password_hash):
+    """
+    Indique si le hash a été calculé avec d'autres paramètres (ou un autre algorithme)
+    que les paramètres courants.
+    """
+    return bool(password_hash) and get_hasher().needs_update(password_hash)
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hache plusieurs mots de passe dans un pool de threads (argon2 libère le GIL pendant le calcul)
+    et retourne les hashes dans le même ordre. `workers` vaut config.PASSWORD_HASH_WORKERS par défaut.
+    """
+    passwords = list(passwords)
+    workers = workers or config.PASSWORD_HASH_WORKERS
+    hasher = get_hasher()
+    if workers <= 1 or len(passwords) <= 1:
+        return [hasher.hash(password) for password in passwords]
+    with ThreadPoolExecutor(max_workers=min(workers, len(passwords))) as executor:
+        return list(executor.map(hasher.hash, passwords))
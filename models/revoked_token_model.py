@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from models.base_model import Base
+from datetime import datetime, timezone
+
+
+class RevokedToken(Base):
+    """
+    Liste de révocation des jetons : un jeton précis, désigné par son identifiant `jti` (déconnexion, rotation
+    d'un jeton de rafraîchissement), ou tous les jetons d'un collaborateur émis au plus tard à `issued_before`
+    (suppression du collaborateur). Les horodatages sont ceux des claims JWT (secondes depuis l'epoch) ;
+    une ligne ne sert que jusqu'à `expires_at`, après quoi les jetons visés ont expiré et elle est purgée.
+    Le sujet (email) est conservé sans clé étrangère : la révocation survit à la suppression du collaborateur.
+    """
+
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True)
+    jti = Column(String)
+    subject = Column(String)
+    issued_before = Column(Integer)
+    expires_at = Column(Integer, nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    # Recherche d'un jeton (unique), des révocations d'un collaborateur, et chargement / purge
+    # des révocations encore utiles.
+    __table_args__ = (
+        Index("ix_revoked_tokens_jti", "jti", unique=True),
+        Index("ix_revoked_tokens_subject_issued_before", "subject", "issued_before"),
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
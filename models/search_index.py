@@ -0,0 +1,105 @@
+from sqlalchemy import DDL, event, text
+
+"""
+Index de recherche plein texte / approximative, créés avec les tables (create_all) et par la migration 0006 :
+- PostgreSQL : extension pg_trgm et un index GIN (gin_trgm_ops) par colonne recherchée ;
+- SQLite : table virtuelle FTS5 (tokenizer trigram) à contenu externe, synchronisée par des triggers.
+Les triggers SQLite sont liés à la table : une migration qui recrée la table (batch) doit les recréer.
+"""
+
+"""
+Extension pg_trgm, créée par la migration 0006. create_all ne la crée que si elle manque et que le rôle en a
+le droit (superutilisateur, ou droit CREATE sur la base : pg_trgm est une extension de confiance), et ne crée
+les index trigrammes que si elle est installée.
+"""
+TRGM_EXTENSION = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+TRGM_EXTENSION_INSTALLED = "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"
+TRGM_EXTENSION_ALLOWED = (
+    "SELECT rolsuper OR has_database_privilege(current_database(), 'CREATE') "
+    "FROM pg_roles WHERE rolname = current_user"
+)
+
+
+def fts_table(table_name):
+    """
+    Nom de la table FTS5 associée à une table (SQLite).
+    """
+    return f"{table_name}_fts"
+
+
+def is_search_index(name):
+    """
+    Indique si une table ou un index a été créé par les index de recherche (tables FTS5 et leurs tables
+    internes, index trigrammes), pour l'exclure de l'autogénération Alembic.
+    """
+    return name is not None and ("_fts" in name or name.endswith("_trgm"))
+
+
+def sqlite_statements(table_name, columns):
+    """
+    Instructions SQLite créant la table FTS5, ses triggers de synchronisation et son remplissage initial.
+    """
+    fts = fts_table(table_name)
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values});"
+    insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, content='{table_name}', "
+        f"content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table_name} BEGIN {delete_old} {insert_new} END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def postgresql_statements(table_name, columns):
+    """
+    Instructions PostgreSQL créant les index GIN trigrammes (l'extension pg_trgm doit être installée).
+    """
+    return [
+        f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{column}_trgm ON {table_name} USING gin ({column} gin_trgm_ops)"
+        for column in columns
+    ]
+
+
+def trgm_extension_installed(ddl, target, bind, **kw):
+    """
+    Condition (execute_if) : l'extension pg_trgm est installée dans la base.
+    """
+    return bind.execute(text(TRGM_EXTENSION_INSTALLED)).scalar()
+
+
+def trgm_extension_missing_and_allowed(ddl, target, bind, **kw):
+    """
+    Condition (execute_if) : l'extension pg_trgm manque et le rôle courant peut la créer.
+    """
+    return not trgm_extension_installed(ddl, target, bind) and bind.execute(text(TRGM_EXTENSION_ALLOWED)).scalar()
+
+
+def drop_statements(dialect_name, table_name, columns):
+    """
+    Instructions supprimant les index de recherche d'une table.
+    """
+    if dialect_name == "sqlite":
+        return [f"DROP TABLE IF EXISTS {fts_table(table_name)}"]
+    return [f"DROP INDEX IF EXISTS ix_{table_name}_{column}_trgm" for column in columns]
+
+
+def register_search_index(table, columns):
+    """
+    Attache à la table la création (après CREATE TABLE) et la suppression (avant DROP TABLE)
+    de ses index de recherche, selon le dialecte (voir TRGM_EXTENSION pour PostgreSQL).
+    """
+    for statement in sqlite_statements(table.name, columns):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    extension = DDL(TRGM_EXTENSION).execute_if(dialect="postgresql", callable_=trgm_extension_missing_and_allowed)
+    event.listen(table, "after_create", extension)
+    for statement in postgresql_statements(table.name, columns):
+        index = DDL(statement).execute_if(dialect="postgresql", callable_=trgm_extension_installed)
+        event.listen(table, "after_create", index)
+    for dialect_name in ("sqlite", "postgresql"):
+        for statement in drop_statements(dialect_name, table.name, columns):
+            event.listen(table, "before_drop", DDL(statement).execute_if(dialect=dialect_name))
@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from models.base_model import Base
-from passlib.hash import argon2
+from models import password_hasher
 
 
 class Role(Base):
@@ -33,12 +33,18 @@ class User(Base):
     role_id = Column(Integer, ForeignKey("roles.id"))
 
     role = relationship("Role", back_populates="users")
-    clients = relationship("Client", back_populates="user")
-    contracts = relationship("Contract", back_populates="user")
-    events = relationship("Event", back_populates="user")
+    clients = relationship("Client", back_populates="user", foreign_keys="Client.user_id")
+    contracts = relationship("Contract", back_populates="user", foreign_keys="Contract.user_id")
+    events = relationship("Event", back_populates="user", foreign_keys="Event.user_id")
 
     def set_password(self, password):
-        self.password_hash = argon2.hash(password)
+        if isinstance(password, password_hasher.PasswordHash):
+            self.password_hash = password
+        else:
+            self.password_hash = password_hasher.hash_password(password)
 
     def check_password(self, password):
-        return argon2.verify(password, self.password_hash)
+        return password_hasher.verify_password(password, self.password_hash)
+
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
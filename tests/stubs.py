@@ -0,0 +1,15 @@
+"""
+Doublures partagées par les tests et les benchmarks (benchmarks/), qui l'importent depuis la racine du projet.
+"""
+
+
+class StubAuthController:
+    """
+    Contrôleur d'authentification réduit à un collaborateur déjà connecté, sans token.
+    """
+
+    def __init__(self, user):
+        self.current_user = user
+
+    def is_authenticated(self):
+        return True
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import threading
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from controllers.api_controller import ApiController
+from controllers import tokens
+from models import password_hasher
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.user_model import User, Role
+
+
+@pytest.fixture(scope="module")
+def database_url(tmp_path_factory):
+    pytest.importorskip("greenlet")
+    pytest.importorskip("aiosqlite")
+    url = f"sqlite:///{tmp_path_factory.mktemp('api') / 'api.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    commercial_role = Role(name="Commercial", description="Commercial role")
+    support_role = Role(name="Support", description="Support role")
+    admin_role = Role(name="Admin", description="Admin role")
+    alice = User(employee_number=1, full_name="Alice", email="alice@example.com", role=commercial_role)
+    sam = User(employee_number=2, full_name="Sam", email="sam@example.com", role=support_role)
+    ada = User(employee_number=3, full_name="Ada", email="ada@example.com", role=admin_role)
+    alice.password_hash = password_hasher.get_hasher().using(time_cost=1, memory_cost=1024, parallelism=1).hash("pw")
+    db.add_all([alice, sam, ada])
+    db.flush()
+    client = Client(full_name="A Client", email="a@client.io", commercial_id=alice.id)
+    db.add(client)
+    db.flush()
+    db.add(Contract(client_id=client.id, commercial_id=alice.id, total_amount=100, amount_due=50))
+    db.commit()
+    db.close()
+
+    yield url
+    engine.dispose()
+
+
+def token(email):
+    return tokens.issue(email).access_token
+
+
+async def call(app, method, path, body=None, bearer=None, query=""):
+    headers = [(b"authorization", f"Bearer {bearer}".encode())] if bearer else []
+    messages = [{"type": "http.request", "body": json.dumps(body).encode() if body is not None else b""}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode(), "headers": headers}
+    await app(scope, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def serve(database_url, scenario):
+    async def run():
+        app = ApiController.from_config(database_url)
+        try:
+            return await scenario(app)
+        finally:
+            await app.engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_login_refresh_and_logout(database_url):
+    async def scenario(app):
+        status, login = await call(app, "POST", "/auth/login", {"email": "alice@example.com", "password": "pw"})
+        assert status == 200 and login["token_type"] == "bearer"
+        assert (await call(app, "POST", "/auth/login", {"email": "alice@example.com", "password": "no"}))[0] == 401
+
+        status, body = await call(app, "GET", "/clients", bearer=login["access_token"], query="view=mine")
+        assert status == 200
+        assert [client["email"] for client in body["items"]] == ["a@client.io"]
+        assert (await call(app, "GET", "/clients"))[0] == 401
+        assert (await call(app, "GET", "/clients", bearer="not-a-token"))[0] == 401
+
+        status, refreshed = await call(app, "POST", "/auth/refresh", {"refresh_token": login["refresh_token"]})
+        assert status == 200 and refreshed["access_token"] != login["access_token"]
+        assert (await call(app, "POST", "/auth/refresh", {"refresh_token": login["refresh_token"]}))[0] == 401
+
+        assert (await call(app, "POST", "/auth/logout", bearer=refreshed["access_token"]))[0] == 200
+        assert (await call(app, "POST", "/auth/logout", bearer=refreshed["access_token"]))[0] == 401
+        assert (await call(app, "GET", "/clients", bearer=refreshed["access_token"]))[0] == 401
+
+    serve(database_url, scenario)
+
+
+def test_operations_map_errors_to_http_statuses(database_url):
+    async def scenario(app):
+        alice, sam = token("alice@example.com"), token("sam@example.com")
+        status, created = await call(app, "POST", "/clients", {"full_name": "New", "email": "new@client.io"}, alice)
+        assert status == 201 and created["record"]["commercial_id"] is not None
+
+        status, updated = await call(app, "PATCH", f"/clients/{created['id']}", {"phone": "0102"}, alice)
+        assert status == 200 and updated["record"]["phone"] == "0102"
+        status, signed = await call(app, "POST", "/contracts/1/sign", bearer=alice)
+        assert status == 200 and signed["record"]["signed"] is True
+
+        assert (await call(app, "PATCH", f"/clients/{created['id']}", {"phone": "1"}, sam))[0] == 403
+        assert (await call(app, "DELETE", f"/clients/{created['id']}", bearer=alice))[0] == 403
+        assert (await call(app, "GET", "/clients/999", bearer=alice))[0] == 404
+        assert (await call(app, "POST", "/clients", {"unknown": "x"}, alice))[0] == 400
+        assert (await call(app, "GET", "/collaborators", bearer=alice))[0] == 405
+        assert (await call(app, "GET", "/nothing", bearer=alice))[0] == 404
+
+        status, shown = await call(app, "GET", f"/clients/{created['id']}", bearer=sam)
+        assert status == 200 and shown["record"]["phone"] == "0102"
+
+    serve(database_url, scenario)
+
+
+def test_concurrent_requests_use_their_own_sessions(database_url):
+    async def scenario(app):
+        alice, sam = token("alice@example.com"), token("sam@example.com")
+        responses = await asyncio.gather(
+            *(call(app, "GET", "/contracts", bearer=alice if i % 2 else sam, query="limit=5") for i in range(50))
+        )
+        assert {status for status, _ in responses} == {200}
+        assert all(len(body["items"]) == 1 for _, body in responses)
+
+    serve(database_url, scenario)
+
+
+def test_collaborator_passwords_are_hashed_off_the_event_loop(database_url, monkeypatch):
+    monkeypatch.setattr(
+        password_hasher, "_hasher", password_hasher.get_hasher().using(time_cost=1, memory_cost=1024, parallelism=1)
+    )
+    hashing_threads = []
+    hash_password = password_hasher.hash_password
+
+    def recording_hash_password(password):
+        hashing_threads.append(threading.current_thread())
+        return hash_password(password)
+
+    monkeypatch.setattr(password_hasher, "hash_password", recording_hash_password)
+
+    async def scenario(app):
+        values = {"full_name": "Nina", "email": "nina@example.com", "role": "Support", "password": "s3cret"}
+        status, created = await call(app, "POST", "/collaborators", values, token("ada@example.com"))
+        assert status == 201 and "password_hash" not in created["record"]
+        status, _ = await call(app, "POST", "/auth/login", {"email": "nina@example.com", "password": "s3cret"})
+        assert status == 200
+
+    serve(database_url, scenario)
+    assert hashing_threads and threading.main_thread() not in hashing_threads
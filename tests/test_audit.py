@@ -0,0 +1,56 @@
+import json
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from controllers import audit
+from controllers.audit import AuditEvent, AuditQueue, FileSink
+
+engine = create_engine("sqlite:///:memory:")
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class RecordingSink:
+    def __init__(self):
+        self.batches = []
+
+    def emit(self, events):
+        self.batches.append(list(events))
+
+
+def test_queue_flushes_in_batches():
+    sink = RecordingSink()
+    audit_queue = AuditQueue(sink, batch_size=3, flush_interval=0.05)
+
+    for i in range(7):
+        audit_queue.emit(AuditEvent(action="contract.signed", message=f"Contract {i} signed"))
+    audit_queue.close()
+
+    assert [event.message for batch in sink.batches for event in batch] == [f"Contract {i} signed" for i in range(7)]
+    assert all(len(batch) <= 3 for batch in sink.batches)
+
+
+def test_events_are_emitted_only_after_commit(monkeypatch):
+    sink = RecordingSink()
+    audit_queue = AuditQueue(sink, flush_interval=0.01)
+    monkeypatch.setattr(audit, "_audit_queue", audit_queue)
+    db = SessionLocal()
+
+    audit.record(db, "collaborator.deleted", "Collaborator A deleted by admin@example.com")
+    db.rollback()
+    audit.record(db, "contract.signed", "Contract 1 signed by alice@example.com", entity="contracts", entity_id=1)
+    db.commit()
+    audit_queue.close()
+    db.close()
+
+    assert [event.action for batch in sink.batches for event in batch] == ["contract.signed"]
+
+
+def test_file_sink_appends_json_lines(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    sink = FileSink(str(path))
+
+    sink.emit([AuditEvent(action="collaborator.created", message="m1", actor="admin@example.com")])
+    sink.emit([AuditEvent(action="collaborator.updated", message="m2", actor="admin@example.com")])
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["action"] for record in records] == ["collaborator.created", "collaborator.updated"]
+    assert records[0]["actor"] == "admin@example.com"
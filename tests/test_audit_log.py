@@ -0,0 +1,94 @@
+import datetime
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from controllers.audit_log import set_actor
+from controllers.audit_log_controller import AuditLogController
+from controllers.command_controller import CommandController
+from models.audit_log_model import AuditLog
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User, Role
+from tests.stubs import StubAuthController
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    admin = User(employee_number=1, full_name="Ada", email="admin@example.com", role=Role(name="Admin"))
+    alice = User(employee_number=2, full_name="Alice", email="alice@example.com", role=Role(name="Commercial"))
+    db.add_all([admin, alice])
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def commands(db, email):
+    return CommandController(db, StubAuthController(db.query(User).filter_by(email=email).first()))
+
+
+def test_mutations_are_logged_in_the_same_transaction(setup_database):
+    db = setup_database
+    alice = commands(db, "alice@example.com")
+
+    client_id = alice.run("clients", "create", values={"full_name": "Acme", "email": "acme@x.io"}).id
+    alice.run("clients", "update", client_id, {"phone": "0102"})
+    db.commit()
+
+    entries = db.query(AuditLog).filter_by(entity="clients", entity_id=client_id).order_by(AuditLog.id).all()
+    assert [entry.action for entry in entries] == ["create", "update"]
+    assert entries[0].actor_email == "alice@example.com"
+    assert entries[0].changes["email"] == [None, "acme@x.io"]
+    assert entries[1].changes == {"phone": [None, "0102"]}
+
+    alice.run("clients", "update", client_id, {"phone": "0303"})
+    db.rollback()
+    assert db.query(AuditLog).filter_by(entity="clients", entity_id=client_id).count() == 2
+
+
+def test_passwords_are_masked_and_unaudited_sessions_are_skipped(setup_database):
+    db = setup_database
+    admin = commands(db, "admin@example.com")
+
+    user_id = admin.run(
+        "collaborators",
+        "create",
+        values={"full_name": "Sam", "email": "sam@example.com", "role": "Commercial", "password": "secret"},
+    ).id
+    db.commit()
+    entry = db.query(AuditLog).filter_by(entity="users", entity_id=user_id).one()
+    assert entry.changes["password_hash"] == [None, "***"]
+
+    other = SessionLocal()
+    set_actor(other, None)
+    other.add(Contract(total_amount=1))
+    other.commit()
+    assert other.query(AuditLog).filter_by(entity="contracts").count() == 0
+    other.close()
+
+
+def test_search_uses_indexes(setup_database):
+    db = setup_database
+    admin = db.query(User).filter_by(email="admin@example.com").first()
+    controller = AuditLogController(db, admin)
+
+    query = controller.search(entity="clients", action="update", since=datetime.date.today(), limit=10)
+    assert [entry.changes for entry in controller.entries(query)] == [{"phone": [None, "0102"]}]
+
+    compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+    plan = " ".join(str(row) for row in db.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+    assert "ix_audit_log_entity_entity_id_created_at" in plan
+
+    with pytest.raises(PermissionError):
+        AuditLogController(db, db.query(User).filter_by(email="alice@example.com").first()).search()
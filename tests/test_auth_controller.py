@@ -7,9 +7,11 @@ from models.client_model import Client
 from models.contract_model import Contract
 from models.event_model import Event
 from models.user_model import User, Role
+from models import password_hasher
 import os
 import datetime
 import jwt
+import config
 
 DATABASE_URL = "sqlite:///:memory:"
 
@@ -95,3 +97,47 @@ def test_permission_check(setup_database):
     auth_controller.current_user = db.query(User).filter_by(email="testuser@example.com").first()
 
     assert auth_controller.get_user_permissions("testuser@example.com") == "Commercial"
+
+
+def test_authenticated_session_is_cached(setup_database, monkeypatch):
+    db = setup_database
+    auth_controller = AuthController(db)
+
+    assert auth_controller.login_user("testuser@example.com", "password") is not None
+    assert auth_controller.principal.email == "testuser@example.com"
+
+    decode_calls = []
+    original_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        decode_calls.append(args)
+        return original_decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+
+    for _ in range(5):
+        assert auth_controller.is_authenticated()
+    assert decode_calls == []
+
+    auth_controller.auth_session.clock = lambda: auth_controller.principal.expires_at + 1
+    assert not auth_controller.is_authenticated()
+    assert auth_controller.principal is None
+    assert not os.path.exists("token.txt")
+
+
+def test_login_rehashes_passwords_hashed_with_old_parameters(setup_database, monkeypatch, tmp_path):
+    db = setup_database
+    monkeypatch.setattr(config, "TOKEN_FILE", str(tmp_path / "token.txt"))
+    monkeypatch.setattr(password_hasher, "_hasher", None)
+    password_hasher.configure(time_cost=1, memory_cost=1024, parallelism=1)
+    AuthController(db).signup_user(2, "Old Hash", "oldhash@example.com", "xxx", "Support", "password")
+    old_hash = db.query(User).filter_by(email="oldhash@example.com").one().password_hash
+    assert "m=1024,t=1,p=1" in old_hash
+
+    password_hasher.configure(time_cost=2, memory_cost=2048, parallelism=1)
+    assert AuthController(db).login_user("oldhash@example.com", "password") is not None
+    assert (tmp_path / "token.txt").exists()
+
+    user = db.query(User).filter_by(email="oldhash@example.com").one()
+    assert "m=2048,t=2,p=1" in user.password_hash
+    assert user.check_password("password") and not user.password_needs_rehash()
@@ -0,0 +1,126 @@
+import datetime
+import json
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from controllers.command_controller import CommandController, CommandError
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User, Role
+from tests.stubs import StubAuthController
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    commercial_role = Role(name="Commercial", description="Commercial role")
+    support_role = Role(name="Support", description="Support role")
+    alice = User(employee_number=1, full_name="Alice", email="alice@example.com", role=commercial_role)
+    bob = User(employee_number=2, full_name="Bob", email="bob@example.com", role=commercial_role)
+    sam = User(employee_number=3, full_name="Sam", email="sam@example.com", role=support_role)
+    db.add_all([alice, bob, sam])
+    db.flush()
+
+    alice_client = Client(full_name="A Client", email="a@client.io", commercial_id=alice.id)
+    bob_client = Client(full_name="B Client", email="b@client.io", commercial_id=bob.id)
+    db.add_all([alice_client, bob_client])
+    db.flush()
+    contract = Contract(client_id=alice_client.id, commercial_id=alice.id, total_amount=100, amount_due=50)
+    db.add(contract)
+    db.flush()
+    db.add(
+        Event(
+            contract_id=contract.id,
+            client_id=alice_client.id,
+            event_name="Launch",
+            location="Paris",
+            support_id=sam.id,
+            event_date_start=datetime.date(2030, 1, 1),
+        )
+    )
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def commands(db, email):
+    return CommandController(db, StubAuthController(db.query(User).filter_by(email=email).first()))
+
+
+def test_list_view_mine(setup_database):
+    clients = commands(setup_database, "alice@example.com").list_records("clients", "mine").all()
+
+    assert [client.email for client in clients] == ["a@client.io"]
+
+
+def test_sign_and_update_contract(setup_database):
+    db = setup_database
+    controller = commands(db, "alice@example.com")
+    contract_id = db.query(Contract.id).scalar()
+
+    controller.run("contracts", "sign", contract_id)
+    result = controller.run("contracts", "update", contract_id, {"amount_due": "0"})
+    db.commit()
+
+    assert result.record["signed"] is True
+    assert db.get(Contract, contract_id).amount_due == 0
+
+
+def test_permission_and_read_only_fields_are_rejected(setup_database):
+    db = setup_database
+    bob_client_id = db.query(Client.id).filter_by(email="b@client.io").scalar()
+    event_id = db.query(Event.id).scalar()
+
+    with pytest.raises(CommandError, match="Permission denied"):
+        commands(db, "alice@example.com").run("clients", "update", bob_client_id, {"phone": "0102"})
+    with pytest.raises(CommandError, match="read-only"):
+        commands(db, "sam@example.com").run("events", "update", event_id, {"event_date_start": "2031-01-01"})
+
+    result = commands(db, "sam@example.com").run("events", "update", event_id, {"location": "Lyon"})
+    assert result.record["location"] == "Lyon"
+    db.rollback()
+
+
+def test_batch_runs_in_one_transaction(setup_database):
+    db = setup_database
+    client_id = db.query(Client.id).filter_by(email="a@client.io").scalar()
+    controller = commands(db, "alice@example.com")
+
+    failing = [
+        json.dumps({"entity": "clients", "action": "create", "values": {"full_name": "New", "email": "n@x.io"}}),
+        json.dumps({"entity": "contracts", "action": "create", "values": {"client_id": client_id, "total": 1}}),
+    ]
+    with pytest.raises(CommandError) as error:
+        controller.run_batch(failing)
+    assert error.value.line == 2
+    assert db.query(Client).filter_by(email="n@x.io").first() is None
+
+    results = controller.run_batch(
+        [
+            "# comment lines and blank lines are ignored",
+            "",
+            json.dumps({"entity": "clients", "action": "create", "values": {"full_name": "New", "email": "n@x.io"}}),
+            json.dumps(
+                {
+                    "entity": "contracts",
+                    "action": "create",
+                    "values": {"client_id": client_id, "total_amount": "200", "signed": "no"},
+                }
+            ),
+        ]
+    )
+
+    assert [(result.entity, result.action) for result in results] == [("clients", "create"), ("contracts", "create")]
+    assert db.query(Client).filter_by(email="n@x.io").one().commercial_contact == "Alice"
+    assert db.get(Contract, results[1].id).total_amount == 200
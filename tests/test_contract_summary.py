@@ -0,0 +1,129 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from controllers.command_controller import CommandController
+from controllers.contract_summary import rebuild
+from controllers.import_controller import ImportController
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.contract_summary_model import ContractSummary
+from models.user_model import User, Role
+from tests.stubs import StubAuthController
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    commercial = Role(name="Commercial")
+    admin = User(employee_number=1, full_name="Ada", email="admin@example.com", role=Role(name="Admin"))
+    alice = User(employee_number=2, full_name="Alice", email="alice@example.com", role=commercial)
+    bob = User(employee_number=3, full_name="Bob", email="bob@example.com", role=commercial)
+    db.add_all([admin, alice, bob])
+    db.flush()
+    db.add_all([Client(full_name="Acme", commercial_id=alice.id), Client(full_name="Globex", commercial_id=alice.id)])
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def commands(db, email):
+    return CommandController(db, StubAuthController(db.query(User).filter_by(email=email).one()))
+
+
+def summary(db):
+    """
+    Lignes de la synthèse, sans identifiant ni date de mise à jour.
+    """
+    columns = [column for column in ContractSummary.__table__.c if column.name not in ("id", "updated_at")]
+    return db.execute(select(*columns).order_by(*columns[:2])).all()
+
+
+def assert_matches_rebuild(db):
+    incremental = summary(db)
+    rebuild(db)
+    assert summary(db) == incremental
+    db.rollback()
+    return incremental
+
+
+def test_contract_changes_update_the_summary_incrementally(setup_database):
+    db = setup_database
+    alice = commands(db, "alice@example.com")
+    acme, globex = db.query(Client).order_by(Client.id).all()
+
+    values = {"client_id": str(acme.id), "total_amount": "1000", "amount_due": "400", "creation_date": "2026-03-01"}
+    first = alice.run("contracts", "create", values=values).id
+    second = alice.run("contracts", "create", values={"client_id": str(acme.id), "total_amount": "200"}).id
+    alice.run("contracts", "create", values={"client_id": str(globex.id), "total_amount": "50", "amount_due": "50"})
+    db.commit()
+    assert [row.contract_count for row in assert_matches_rebuild(db)] == [2, 1]
+
+    alice.run("contracts", "sign", first)
+    alice.run("contracts", "update", second, {"amount_due": "200", "creation_date": "2026-05-01"})
+    db.commit()
+    row = assert_matches_rebuild(db)[0]
+    assert (row.signed_count, row.signed_total, row.amount_due, str(row.last_activity)) == (1, 1000, 600, "2026-05-01")
+
+    commands(db, "admin@example.com").run("contracts", "delete", second)
+    db.commit()
+    assert str(assert_matches_rebuild(db)[0].last_activity) == "2026-03-01"
+
+
+def test_reassignment_rollback_and_bulk_import(setup_database, tmp_path):
+    db = setup_database
+    bob = db.query(User).filter_by(email="bob@example.com").one()
+    globex = db.query(Client).filter_by(full_name="Globex").one()
+
+    contract = db.query(Contract).filter_by(client_id=globex.id).one()
+    db.expire_all()
+    contract.commercial_id = bob.id
+    db.commit()
+    assert contract.commercial_id == globex.commercial_id
+
+    globex.commercial_id = bob.id
+    db.commit()
+    assert contract.commercial_id == bob.id
+    assert [(row.commercial_id, row.contract_count) for row in assert_matches_rebuild(db)][-1] == (bob.id, 1)
+
+    db.add(Contract(client_id=globex.id, commercial_id=bob.id, total_amount=10, signed=True))
+    db.flush()
+    db.rollback()
+    before = assert_matches_rebuild(db)
+
+    path = tmp_path / "contracts.csv"
+    path.write_text(f"client_id,commercial_id,total_amount,amount_due,signed\n{globex.id},{bob.id},70,0,true\n")
+    report = ImportController(db).import_file("contracts", str(path))
+    assert report.imported == 1
+    after = assert_matches_rebuild(db)
+    assert [(row.contract_count, row.signed_total) for row in after if row not in before] == [(2, 70)]
+
+
+def test_deleting_a_client_moves_its_contracts_out_of_its_summary_row(setup_database):
+    db = setup_database
+    alice = db.query(User).filter_by(email="alice@example.com").one()
+    client = Client(full_name="Initech", commercial_id=alice.id)
+    db.add(client)
+    db.flush()
+    db.add_all(
+        [Contract(client_id=client.id, commercial_id=alice.id, total_amount=30, amount_due=30) for _ in range(2)]
+    )
+    db.commit()
+    client_id = client.id
+    db.expunge_all()
+
+    commands(db, "admin@example.com").run("clients", "delete", client_id)
+    db.commit()
+
+    rows = assert_matches_rebuild(db)
+    assert client_id not in [row.client_id for row in rows]
+    assert [(row.contract_count, row.amount_due) for row in rows if row.client_id is None] == [(2, 60)]
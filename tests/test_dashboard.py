@@ -0,0 +1,103 @@
+import datetime
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from controllers.dashboard_controller import DashboardController
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.contract_summary_model import ContractSummary
+from models.event_model import Event
+from models.user_model import User, Role
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    commercial = Role(name="Commercial")
+    admin = User(employee_number=1, full_name="Ada", email="admin@example.com", role=Role(name="Admin"))
+    alice = User(employee_number=2, full_name="Alice", email="alice@example.com", role=commercial)
+    bob = User(employee_number=3, full_name="Bob", email="bob@example.com", role=commercial)
+    sam = User(employee_number=4, full_name="Sam", email="sam@example.com", role=Role(name="Support"))
+    acme = Client(full_name="Acme", commercial=alice)
+    globex = Client(full_name="Globex", commercial=bob)
+    db.add_all([admin, alice, bob, sam, acme, globex])
+    db.flush()
+
+    today = datetime.date.today()
+    big = Contract(client_id=acme.id, commercial_id=alice.id, total_amount=300, amount_due=100, signed=True)
+    db.add_all(
+        [
+            big,
+            Contract(client_id=acme.id, commercial_id=alice.id, total_amount=500, amount_due=500, signed=False),
+            Contract(client_id=globex.id, commercial_id=bob.id, total_amount=100, amount_due=0, signed=True),
+        ]
+    )
+    db.flush()
+    db.add_all(
+        [
+            Event(contract_id=big.id, support_id=sam.id, attendees=50, event_date_start=today),
+            Event(contract_id=big.id, support_id=sam.id, attendees=20, event_date_start=today + datetime.timedelta(7)),
+            Event(contract_id=big.id, attendees=10, event_date_start=today + datetime.timedelta(1)),
+            Event(contract_id=big.id, support_id=sam.id, event_date_start=today - datetime.timedelta(1)),
+        ]
+    )
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def dashboard(db, email, source="live"):
+    return DashboardController(db, db.query(User).filter_by(email=email).one(), source)
+
+
+def test_totals_and_rankings_are_aggregated_in_sql(setup_database):
+    db = setup_database
+    live = dashboard(db, "admin@example.com")
+
+    totals = live.totals()
+    assert (totals.contracts, totals.signed_contracts, totals.signed_revenue, totals.amount_due) == (3, 2, 400, 600)
+    assert totals.upcoming_events == 3
+
+    commercials = live.rows(live.commercials_query())
+    assert [(row.commercial, row.contracts, row.signed_revenue, row.rank) for row in commercials] == [
+        ("Alice", 2, 300, 1),
+        ("Bob", 1, 100, 2),
+    ]
+    assert [row.revenue_share for row in commercials] == [75, 25]
+
+    supports = live.rows(live.supports_query())
+    assert [(row.support, row.upcoming_events, row.attendees, row.rank) for row in supports] == [
+        ("Sam", 2, 70, 1),
+        (None, 1, 10, 2),
+    ]
+    assert supports[0].next_event == datetime.date.today()
+
+
+def test_summary_source_matches_live_totals_after_refresh(setup_database):
+    db = setup_database
+    live = dashboard(db, "admin@example.com")
+    summary = dashboard(db, "admin@example.com", "summary")
+
+    assert summary.refresh_summary() == 2
+    db.commit()
+    assert db.query(ContractSummary).filter_by(contract_count=2).one().amount_due == 600
+    assert summary.totals()[:4] == live.totals()[:4]
+    assert summary.rows(summary.commercials_query()) == live.rows(live.commercials_query())
+
+
+def test_dashboard_is_admin_only(setup_database):
+    db = setup_database
+    with pytest.raises(PermissionError):
+        dashboard(db, "alice@example.com").totals()
+    with pytest.raises(ValueError):
+        dashboard(db, "admin@example.com", "cache")
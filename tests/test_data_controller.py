@@ -1,27 +1,46 @@
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 from controllers.data_controller import DataController
 from models.base_model import Base
 from models.client_model import Client
 from models.contract_model import Contract
-from models.event_model import Event
 from models.user_model import User, Role
+from tests.stubs import StubAuthController
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 @pytest.fixture(scope="module")
 def setup_database():
+    Base.metadata.create_all(bind=engine)
     db = SessionLocal()
+
+    commercial_role = Role(name="Commercial", description="Commercial role")
+    user = User(employee_number=1, full_name="Test User", email="testuser@example.com", role=commercial_role)
+    db.add(user)
+    db.flush()
+    client = Client(full_name="Existing Client", email="client@example.com", commercial_id=user.id)
+    db.add(client)
+    db.flush()
+    db.add(Contract(client_id=client.id, commercial_id=user.id, total_amount=1000, amount_due=500))
+    db.commit()
+
     yield db
     db.close()
+    Base.metadata.drop_all(bind=engine)
 
 
 def test_create_client(setup_database):
     db = setup_database
-    data_controller = DataController(db, None)
-
     user = db.query(User).filter_by(email="testuser@example.com").first()
-    data_controller.auth_controller.current_user = user
+    data_controller = DataController(db, StubAuthController(user))
 
-    data_controller.create_client()
+    data_controller.add_client({"full_name": "New Client", "email": "newclient@example.com"})
+    db.commit()
     client = db.query(Client).filter_by(email="newclient@example.com").first()
 
     assert client is not None
@@ -30,10 +49,13 @@ def test_create_client(setup_database):
 
 def test_update_contract(setup_database):
     db = setup_database
-    data_controller = DataController(db, None)
+    user = db.query(User).filter_by(email="testuser@example.com").first()
+    data_controller = DataController(db, StubAuthController(user))
 
     contract_id = 1
-    data_controller.update_contract(contract_id)
+    contract = data_controller.authorize_contract_update(contract_id).contract
+    data_controller.edit_contract(contract, {"total_amount": "2000"})
+    db.commit()
 
     contract = db.query(Contract).filter_by(id=contract_id).first()
     assert contract.total_amount == 2000
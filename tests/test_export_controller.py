@@ -0,0 +1,86 @@
+import csv
+import datetime
+import io
+import json
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from controllers.export_controller import ExportController
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User, Role
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    commercial_role = Role(name="Commercial", description="Commercial role")
+    alice = User(employee_number=1, full_name="Alice", email="alice@example.com", role=commercial_role)
+    bob = User(employee_number=2, full_name="Bob", email="bob@example.com", role=commercial_role)
+    db.add_all([alice, bob])
+    db.flush()
+    for i in range(25):
+        db.add(
+            Client(
+                full_name=f"Client {i}",
+                email=f"client{i}@example.com",
+                commercial_id=alice.id if i % 2 else bob.id,
+                last_contact_date=datetime.date(2024, 1, 1) + datetime.timedelta(days=i),
+            )
+        )
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def exporter(db, email):
+    return ExportController(db, db.query(User).filter_by(email=email).first(), batch_size=10)
+
+
+def test_export_csv_with_columns_and_since(setup_database):
+    output = io.StringIO()
+    report = exporter(setup_database, "alice@example.com").export(
+        "clients", output, "csv", columns=["id", "email"], since=datetime.date(2024, 1, 21)
+    )
+
+    rows = list(csv.reader(io.StringIO(output.getvalue())))
+    assert rows[0] == ["id", "email"]
+    assert [row[1] for row in rows[1:]] == [f"client{i}@example.com" for i in range(20, 25)]
+    assert report.rows == 5
+
+
+def test_export_jsonl_mine(setup_database):
+    output = io.StringIO()
+    report = exporter(setup_database, "alice@example.com").export("clients", output, "jsonl", mine=True)
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert report.rows == 12
+    assert {record["commercial_id"] for record in records} == {1}
+    assert records[0]["last_contact_date"] == "2024-01-02"
+
+
+def test_export_parquet(setup_database, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "clients.parquet")
+
+    report = exporter(setup_database, "bob@example.com").export("clients", path, "parquet")
+
+    table = pq.read_table(path)
+    assert report.rows == table.num_rows == 25
+    assert table.column("last_contact_date")[0].as_py() == datetime.date(2024, 1, 1)
+
+
+def test_export_rejects_unknown_columns(setup_database):
+    with pytest.raises(ValueError):
+        exporter(setup_database, "alice@example.com").export("clients", io.StringIO(), columns=["password"])
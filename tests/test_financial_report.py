@@ -0,0 +1,89 @@
+import datetime
+import decimal
+import pytest
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from controllers import financial_report
+from controllers.import_controller import convert_value
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    today = datetime.date.today()
+    acme, globex = Client(full_name="Acme"), Client(full_name="Globex")
+    db.add_all([acme, globex])
+    db.flush()
+    db.add_all(
+        [
+            Contract(client_id=acme.id, total_amount="0.10", amount_due="0.10", signed=True, creation_date=today),
+            Contract(
+                client_id=acme.id,
+                total_amount="0.20",
+                amount_due="0.20",
+                signed=True,
+                creation_date=today - datetime.timedelta(45),
+            ),
+            Contract(client_id=globex.id, total_amount="1000.00", amount_due="0", signed=False),
+            Contract(total_amount="5.00", amount_due="5.00", signed=None),
+        ]
+    )
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_amounts_are_exact_decimals(setup_database):
+    db = setup_database
+    amount = Contract.__table__.c.total_amount.type
+
+    assert convert_value(amount, " 10.005 ") == decimal.Decimal("10.01")
+    with pytest.raises(ValueError):
+        convert_value(amount, "10000000000")
+    with pytest.raises(ValueError):
+        convert_value(amount, "NaN")
+
+    signed_total = db.query(func.sum(Contract.total_amount)).filter(Contract.signed.is_(True)).scalar()
+    assert signed_total == decimal.Decimal("0.30")
+    assert db.query(Contract).filter_by(total_amount=decimal.Decimal("1000")).one().amount_due == 0
+
+
+def test_vectorized_report_matches_the_contracts(setup_database):
+    pytest.importorskip("numpy")
+    db = setup_database
+    columns = financial_report.load_columns(db, batch_size=2)
+
+    assert financial_report.totals(columns) == {
+        "contracts": 4,
+        "signed_contracts": 2,
+        "signed_revenue": decimal.Decimal("0.30"),
+        "amount_due": decimal.Decimal("5.30"),
+    }
+    buckets = financial_report.ageing(columns)
+    assert [(bucket["bucket"], bucket["contracts"], bucket["amount_due"]) for bucket in buckets] == [
+        ("0-30", 1, decimal.Decimal("0.10")),
+        ("31-60", 1, decimal.Decimal("0.20")),
+        ("61-90", 0, 0),
+        (">90", 0, 0),
+        ("undated", 1, decimal.Decimal("5.00")),
+    ]
+    rollup = financial_report.client_rollup(columns)
+    assert [(row["client_id"], row["contracts"], row["signed_revenue"]) for row in rollup] == [
+        (None, 1, 0),
+        (1, 2, decimal.Decimal("0.30")),
+        (2, 1, 0),
+    ]
@@ -0,0 +1,162 @@
+import json
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from controllers import import_controller
+from controllers.import_controller import ImportController
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User, Role
+from models import password_hasher
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add_all(
+        [
+            User(employee_number=1, full_name="Alice", email="alice@example.com", role=Role(name="Commercial")),
+            User(employee_number=2, full_name="Sam", email="sam@example.com", role=Role(name="Support")),
+        ]
+    )
+    db.commit()
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_import_clients_csv(setup_database, tmp_path):
+    db = setup_database
+    path = tmp_path / "clients.csv"
+    path.write_text(
+        "full_name,email,phone,company_name,first_contact_date,commercial_contact\n"
+        "Client A,a@example.com,0600,Acme,2024-01-15,Alice\n"
+        "Client B,b@example.com,0601,Acme,not-a-date,Alice\n"
+        "Client C,,0602,Acme,,Alice\n"
+        "Client D,d@example.com,0603,Acme,,Nobody\n"
+        "Client E,e@example.com,0604,Acme,,\n"
+    )
+
+    report = ImportController(db, batch_size=2).import_file("clients", str(path))
+
+    assert report.total == 5
+    assert report.imported == 2
+    assert [line for line, _ in report.errors] == [3, 4, 5]
+    assert report.rows_per_second > 0
+
+    client = db.query(Client).filter_by(email="a@example.com").first()
+    assert client.commercial_id == 1
+    assert str(client.first_contact_date) == "2024-01-15"
+
+    path.write_text("full_name,email,commercial_id\nClient A renamed,a@example.com,1\n")
+    report = ImportController(db).import_file("clients", str(path))
+    assert report.imported == 1
+    assert db.query(Client).filter_by(email="a@example.com").count() == 1
+    db.expire_all()
+    assert db.query(Client).filter_by(email="a@example.com").first().full_name == "Client A renamed"
+
+
+def test_import_contracts_and_events_jsonl(setup_database, tmp_path):
+    db = setup_database
+    client_id = db.query(Client.id).filter_by(email="a@example.com").scalar()
+
+    contracts = tmp_path / "contracts.jsonl"
+    contracts.write_text(
+        "\n".join(
+            [
+                json.dumps(
+                    {"id": 10, "client_id": client_id, "total_amount": "1000", "amount_due": 0, "signed": "yes"}
+                ),
+                json.dumps({"client_id": 999, "total_amount": 5}),
+                "{not json",
+            ]
+        )
+    )
+    report = ImportController(db).import_file("contracts", str(contracts))
+    assert report.imported == 1
+    assert [line for line, _ in report.errors] == [2, 3]
+
+    contract = db.get(Contract, 10)
+    assert contract.signed is True
+    assert contract.commercial_id == 1
+
+    events = tmp_path / "events.jsonl"
+    events.write_text(json.dumps({"contract_id": 10, "event_name": "Launch", "support_contact": "Sam"}) + "\n")
+    report = ImportController(db).import_file("events", str(events))
+    assert report.imported == 1
+
+    event = db.query(Event).filter_by(event_name="Launch").first()
+    assert event.client_id == client_id
+    assert event.support_id == 2
+
+
+def test_import_collaborators_hashes_passwords_in_parallel(setup_database, tmp_path, monkeypatch):
+    db = setup_database
+    monkeypatch.setattr(password_hasher, "_hasher", None)
+    password_hasher.configure(time_cost=1, memory_cost=1024, parallelism=1)
+
+    path = tmp_path / "collaborators.csv"
+    path.write_text(
+        "employee_number,full_name,email,department,role,password\n"
+        "10,Sue,sue@example.com,Events,Support,secret-1\n"
+        "11,Tom,tom@example.com,Events,Support,secret-2\n"
+        "12,Ann,ann@example.com,Events,Unknown,secret-3\n"
+        "13,Joe,joe@example.com,Events,Support,\n"
+    )
+    report = ImportController(db).import_file("collaborators", str(path))
+    assert report.imported == 2
+    assert [line for line, _ in report.errors] == [4, 5]
+
+    sue, tom = db.query(User).filter(User.employee_number.in_([10, 11])).order_by(User.employee_number)
+    assert sue.role.name == "Support"
+    assert sue.check_password("secret-1") and tom.check_password("secret-2")
+    assert not sue.check_password("secret-2")
+
+
+def test_import_checks_the_role_of_owners_and_the_commercial_of_contracts(setup_database, tmp_path):
+    db = setup_database
+    client_id = db.query(Client.id).filter_by(email="a@example.com").scalar()
+    commercial = db.query(Role).filter_by(name="Commercial").one()
+    db.add(User(employee_number=3, full_name="Bob", email="bob@example.com", role=commercial))
+    db.commit()
+
+    clients = tmp_path / "clients.csv"
+    clients.write_text("full_name,email,commercial_id\nClient S,s@example.com,2\n")
+    report = ImportController(db).import_file("clients", str(clients))
+    assert report.imported == 0
+    assert report.errors[0][1] == "collaborator 2 (Sam) is not a Commercial and cannot be the commercial_id"
+
+    contracts = tmp_path / "contracts.csv"
+    contracts.write_text(
+        f"client_id,commercial_contact,total_amount\n{client_id},Sam,1\n{client_id},Bob,2\n{client_id},Alice,3\n"
+    )
+    report = ImportController(db).import_file("contracts", str(contracts))
+    assert report.imported == 1
+    assert [message.split(" ")[0] for _, message in report.errors] == ["collaborator", "commercial_id"]
+
+    events = tmp_path / "events.csv"
+    events.write_text("contract_id,event_name,support_id\n10,Kickoff,1\n")
+    report = ImportController(db).import_file("events", str(events))
+    assert report.imported == 0 and "is not a Support" in report.errors[0][1]
+
+
+def test_import_without_on_conflict_inserts_or_refuses_to_upsert(setup_database, tmp_path, monkeypatch):
+    db = setup_database
+    monkeypatch.setattr(import_controller, "dialect_insert", lambda bind, table: None)
+
+    path = tmp_path / "contracts.jsonl"
+    client_id = db.query(Client.id).filter_by(email="a@example.com").scalar()
+    path.write_text(json.dumps({"client_id": client_id, "total_amount": 3}) + "\n")
+    assert ImportController(db).import_file("contracts", str(path)).imported == 1
+
+    path.write_text(json.dumps({"id": 10, "client_id": client_id, "total_amount": 3}) + "\n")
+    with pytest.raises(ValueError, match="requires PostgreSQL or SQLite"):
+        ImportController(db).import_file("contracts", str(path))
@@ -0,0 +1,46 @@
+import os
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+
+
+@pytest.fixture
+def alembic_config(tmp_path):
+    alembic_cfg = Config(os.path.join(os.path.dirname(os.path.dirname(__file__)), "alembic.ini"))
+    alembic_cfg.set_main_option("sqlalchemy.url", f"sqlite:///{tmp_path / 'migrations.db'}")
+    alembic_cfg.attributes["configure_logger"] = False
+    return alembic_cfg
+
+
+def test_owner_foreign_keys_are_backfilled(alembic_config):
+    command.upgrade(alembic_config, "0001")
+
+    engine = create_engine(alembic_config.get_main_option("sqlalchemy.url"))
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO users (id, full_name, email) VALUES (1, 'Alice Sales', 'a@x.io')"))
+        connection.execute(text("INSERT INTO users (id, full_name, email) VALUES (2, 'Bob Support', 'b@x.io')"))
+        connection.execute(
+            text(
+                "INSERT INTO clients (id, full_name, email, commercial_contact) "
+                "VALUES (1, 'C', 'c@x.io', 'Alice Sales')"
+            )
+        )
+        connection.execute(text("INSERT INTO contracts (id, client_id, commercial_contact) VALUES (1, 1, NULL)"))
+        connection.execute(
+            text("INSERT INTO events (id, contract_id, client_id, support_contact) VALUES (1, 1, 1, 'Bob Support')")
+        )
+
+    command.upgrade(alembic_config, "head")
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT commercial_id FROM clients")).scalar() == 1
+        assert connection.execute(text("SELECT commercial_id FROM contracts")).scalar() == 1
+        assert connection.execute(text("SELECT support_id FROM events")).scalar() == 2
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("events")}
+    assert "ix_events_support_id_date_start_id" in indexes
+
+    command.downgrade(alembic_config, "0001")
+    assert "support_id" not in {column["name"] for column in inspect(engine).get_columns("events")}
+    engine.dispose()
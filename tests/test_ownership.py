@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from controllers.ownership import resolve_client, resolve_contract, resolve_event
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User, Role
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    alice = User(employee_number=1, full_name="Alice", email="alice@example.com")
+    sam = User(employee_number=2, full_name="Sam", email="sam@example.com")
+    db.add_all([alice, sam])
+    db.flush()
+    client = Client(full_name="Client", email="client@example.com", commercial_id=alice.id)
+    db.add(client)
+    db.flush()
+    contract = Contract(client_id=client.id, commercial_id=alice.id)
+    db.add(contract)
+    db.flush()
+    db.add(Event(event_name="Event", contract_id=contract.id, client_id=client.id, support_id=sam.id))
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield executed
+    event.remove(engine, "before_cursor_execute", count)
+
+
+def test_resolve_event_in_one_query(setup_database, statements):
+    db = setup_database
+    db.expunge_all()
+    alice = db.query(User).filter_by(email="alice@example.com").first()
+    sam = db.query(User).filter_by(email="sam@example.com").first()
+    statements.clear()
+
+    ownership = resolve_event(db, 1)
+    assert ownership.entity.event_name == "Event"
+    assert ownership.contract.id == 1
+    assert ownership.client.full_name == "Client"
+    assert ownership.commercial_id == alice.id and ownership.support_id == sam.id
+    assert len(statements) == 1
+
+
+def test_resolve_contract_and_client(setup_database):
+    db = setup_database
+    alice = db.query(User).filter_by(email="alice@example.com").first()
+
+    assert resolve_contract(db, 1).commercial_id == alice.id
+    assert resolve_client(db, 1).commercial_id == alice.id
+    assert resolve_contract(db, 99) is None
+    assert resolve_event(db, 99) is None
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from controllers.pagination import KeysetPaginator
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User, Role
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    db.add_all([Client(full_name=f"Client {i}", email=f"client{i}@example.com") for i in range(1, 26)])
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_first_page(setup_database):
+    paginator = KeysetPaginator(setup_database.query(Client), (Client.id,), 10)
+
+    page = paginator.first()
+    assert [client.id for client in page.items] == list(range(1, 11))
+    assert page.has_next
+    assert not page.has_previous
+
+
+def test_next_and_previous(setup_database):
+    paginator = KeysetPaginator(setup_database.query(Client), (Client.id,), 10)
+
+    page = paginator.next(paginator.next(paginator.first()))
+    assert [client.id for client in page.items] == list(range(21, 26))
+    assert not page.has_next
+    assert page.has_previous
+
+    page = paginator.previous(page)
+    assert [client.id for client in page.items] == list(range(11, 21))
+    assert page.has_next
+    assert page.has_previous
+
+    page = paginator.previous(page)
+    assert [client.id for client in page.items] == list(range(1, 11))
+    assert not page.has_previous
+
+
+def test_jump(setup_database):
+    paginator = KeysetPaginator(setup_database.query(Client), (Client.id,), 10)
+
+    page = paginator.jump(18)
+    assert [client.id for client in page.items] == list(range(18, 26))
+    assert page.has_previous
+    assert not page.has_next
+
+
+def test_filtered_query(setup_database):
+    query = setup_database.query(Client).filter(Client.id % 2 == 0)
+    paginator = KeysetPaginator(query, (Client.id,), 5)
+
+    page = paginator.next(paginator.first())
+    assert [client.id for client in page.items] == [12, 14, 16, 18, 20]
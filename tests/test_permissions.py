@@ -0,0 +1,128 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from controllers import permissions
+from controllers.data_controller import DataController
+from controllers.ownership import resolve_client, resolve_contract, resolve_event
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User, Role
+from tests.stubs import StubAuthController
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    commercial_role = Role(name="Commercial", description="Commercial role")
+    support_role = Role(name="Support", description="Support role")
+    alice = User(employee_number=1, full_name="Alice", email="alice@example.com", role=commercial_role)
+    bob = User(employee_number=2, full_name="Bob", email="bob@example.com", role=commercial_role)
+    sam = User(employee_number=3, full_name="Sam", email="sam@example.com", role=support_role)
+    db.add_all([alice, bob, sam])
+    db.flush()
+
+    alice_client = Client(full_name="A Client", email="a@client.io", commercial_id=alice.id)
+    bob_client = Client(full_name="B Client", email="b@client.io", commercial_id=bob.id)
+    db.add_all([alice_client, bob_client])
+    db.flush()
+    # Contrat saisi au nom de Bob pour un client d'Alice : il revient à Alice, le commercial du client.
+    contracts = [
+        Contract(client_id=alice_client.id, commercial_id=alice.id, total_amount=100, amount_due=0),
+        Contract(client_id=alice_client.id, commercial_id=bob.id, total_amount=100, amount_due=0),
+        Contract(client_id=bob_client.id, commercial_id=bob.id, total_amount=100, amount_due=0),
+    ]
+    db.add_all(contracts)
+    db.flush()
+    db.add_all(
+        [
+            Event(contract_id=contracts[0].id, client_id=alice_client.id, event_name="A", support_id=sam.id),
+            Event(contract_id=contracts[1].id, client_id=alice_client.id, event_name="B"),
+            Event(contract_id=contracts[2].id, client_id=bob_client.id, event_name="C", support_id=sam.id),
+        ]
+    )
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_menu_options_follow_the_permission_table():
+    assert permissions.menu_options("Commercial") == (
+        "view_clients",
+        "view_contracts",
+        "view_events",
+        "search",
+        "create_client",
+        "create_contract",
+        "create_event",
+        "update_client",
+        "update_contract",
+        "my_clients",
+        "my_contracts",
+        "unsigned_contracts",
+        "contracts_with_amount_due",
+        "update_event",
+    )
+    assert permissions.menu_options("Support")[-2:] == ("update_event", "my_upcoming_events")
+    admin = permissions.menu_options("Admin")
+    assert "update_any_contract" in admin and "update_contract" not in admin
+    assert permissions.menu_options(None) == ()
+
+
+@pytest.mark.parametrize(
+    "predicate", [permissions.ANY, permissions.COMMERCIAL, permissions.CLIENT_COMMERCIAL, permissions.SUPPORT]
+)
+@pytest.mark.parametrize(
+    "model, resolver", [(Client, resolve_client), (Contract, resolve_contract), (Event, resolve_event)]
+)
+def test_sql_criteria_match_the_ownership_checks(setup_database, predicate, model, resolver):
+    db = setup_database
+    for user in db.query(User):
+        ids = db.scalars(select(model.id)).all()
+        expected = [entity_id for entity_id in ids if predicate.check(resolver(db, entity_id), user.id)]
+        selected = db.scalars(select(model.id).where(predicate.criterion(model, user.id)).order_by(model.id)).all()
+        assert selected == expected
+
+
+def test_event_update_fields_depend_on_the_predicate(setup_database):
+    db = setup_database
+    sam = db.query(User).filter_by(email="sam@example.com").one()
+    data_controller = DataController(db, StubAuthController(sam))
+    event_a, event_b = db.scalars(select(Event.id).order_by(Event.id).limit(2)).all()
+
+    _, fields = data_controller.authorize_event_update(event_a)
+    assert fields == ("event_name", "location")
+    with pytest.raises(PermissionError):
+        data_controller.authorize_event_update(event_b)
+
+
+def test_contracts_follow_the_commercial_of_their_client(setup_database):
+    db = setup_database
+    alice = DataController(db, StubAuthController(db.query(User).filter_by(email="alice@example.com").one()))
+    bob = DataController(db, StubAuthController(db.query(User).filter_by(email="bob@example.com").one()))
+    contract_for_alice_client = 2
+
+    assert db.get(Contract, contract_for_alice_client).commercial_id == alice.auth_controller.current_user.id
+    assert alice.authorize_contract_update(contract_for_alice_client).contract.id == 2
+    with pytest.raises(PermissionError):
+        bob.authorize_contract_update(contract_for_alice_client)
+
+    query, _ = alice.portfolio_query("my_contracts")
+    assert [contract.id for contract in query.order_by(Contract.id)] == [1, 2]
+
+    db.query(Client).filter_by(email="a@client.io").one().commercial_id = bob.auth_controller.current_user.id
+    db.flush()
+    query, _ = bob.portfolio_query("my_contracts")
+    assert [contract.id for contract in query.order_by(Contract.id)] == [1, 2, 3]
+    assert alice.portfolio_query("my_contracts")[0].count() == 0
+    db.rollback()
@@ -0,0 +1,97 @@
+import datetime
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from controllers.data_controller import DataController
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User, Role
+from tests.stubs import StubAuthController
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    commercial_role = Role(name="Commercial", description="Commercial role")
+    support_role = Role(name="Support", description="Support role")
+    alice = User(employee_number=1, full_name="Alice", email="alice@example.com", role=commercial_role)
+    bob = User(employee_number=2, full_name="Bob", email="bob@example.com", role=commercial_role)
+    sam = User(employee_number=3, full_name="Sam", email="sam@example.com", role=support_role)
+    db.add_all([alice, bob, sam])
+    db.flush()
+
+    mine = Client(full_name="Mine", email="mine@example.com", commercial_id=alice.id)
+    other = Client(full_name="Other", email="other@example.com", commercial_id=bob.id)
+    db.add_all([mine, other])
+    db.flush()
+
+    db.add_all(
+        [
+            Contract(client_id=mine.id, commercial_id=alice.id, total_amount=100, amount_due=0, signed=True),
+            Contract(client_id=mine.id, commercial_id=alice.id, total_amount=100, amount_due=50, signed=False),
+            Contract(client_id=other.id, commercial_id=bob.id, total_amount=100, amount_due=50, signed=False),
+        ]
+    )
+    today = datetime.date.today()
+    db.add_all(
+        [
+            Event(event_name="Past", client_id=mine.id, support_id=sam.id, event_date_start=today.replace(year=2000)),
+            Event(event_name="Soon", client_id=mine.id, support_id=sam.id, event_date_start=today),
+            Event(event_name="Unassigned", client_id=mine.id, event_date_start=today),
+        ]
+    )
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def controller_for(db, email, displayed):
+    user = db.query(User).filter_by(email=email).first()
+    data_controller = DataController(db, StubAuthController(user))
+    data_controller.data_view.display_clients = displayed.extend
+    data_controller.data_view.display_contracts = displayed.extend
+    data_controller.data_view.display_events = displayed.extend
+    return data_controller
+
+
+def test_my_clients(setup_database):
+    displayed = []
+    controller_for(setup_database, "alice@example.com", displayed).view_portfolio("my_clients")
+    assert [client.full_name for client in displayed] == ["Mine"]
+
+
+def test_unsigned_and_amount_due_contracts(setup_database):
+    displayed = []
+    data_controller = controller_for(setup_database, "alice@example.com", displayed)
+
+    data_controller.view_portfolio("unsigned_contracts")
+    assert [(contract.commercial_id, contract.signed) for contract in displayed] == [(1, False)]
+
+    displayed.clear()
+    data_controller.view_portfolio("contracts_with_amount_due")
+    assert [contract.amount_due for contract in displayed] == [50]
+
+
+def test_my_upcoming_events(setup_database):
+    displayed = []
+    controller_for(setup_database, "sam@example.com", displayed).view_my_upcoming_events()
+    assert [event.event_name for event in displayed] == ["Soon"]
+
+
+def test_portfolio_queries_use_composite_indexes(setup_database):
+    with engine.connect() as connection:
+        plan = connection.execute(
+            text("EXPLAIN QUERY PLAN SELECT id FROM contracts WHERE commercial_id = 1 AND signed IS NOT 1 ORDER BY id")
+        ).all()
+    assert "ix_contracts_unsigned_commercial_id_id" in " ".join(str(row) for row in plan)
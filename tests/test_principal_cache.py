@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from controllers import principal_cache
+from controllers.principal_cache import TTLCache
+from controllers.data_controller import DataController
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User, Role
+from tests.stubs import StubAuthController
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    admin_role = Role(name="Admin", description="Admin role")
+    db.add_all([admin_role, Role(name="Commercial", description="Commercial role")])
+    db.add(User(employee_number=1, full_name="Ada", email="ada@example.com", role=admin_role))
+    db.commit()
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def count_queries(function):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        function()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_permission_checks_are_served_from_the_cache(setup_database):
+    db = setup_database
+    principal_cache.clear()
+    admin = db.query(User).filter_by(email="ada@example.com").one()
+    data_controller = DataController(db, StubAuthController(admin))
+    data_controller.authorize("manage_collaborators", "denied")
+
+    def checks():
+        for _ in range(10):
+            data_controller.authorize("manage_collaborators", "denied")
+            assert data_controller.current_role() == "Admin"
+
+    assert count_queries(checks) == 0
+
+
+def test_collaborator_changes_invalidate_the_cache_on_commit(setup_database):
+    db = setup_database
+    admin = db.query(User).filter_by(email="ada@example.com").one()
+    data_controller = DataController(db, StubAuthController(admin))
+    data_controller.add_collaborator(
+        {"full_name": "Carl", "email": "carl@example.com", "role": "Commercial", "password": "secret"}
+    )
+    db.commit()
+    assert principal_cache.principal(db, "carl@example.com").role == "Commercial"
+
+    carl = db.query(User).filter_by(email="carl@example.com").one()
+    data_controller.edit_collaborator(carl, {"role": "Admin"})
+    principal_cache.clear()
+    assert principal_cache.principal(db, "carl@example.com").role == "Admin"
+    db.rollback()
+    assert principal_cache.principal(db, "carl@example.com").role == "Commercial"
+
+    data_controller.edit_collaborator(carl, {"role": "Admin"})
+    db.commit()
+    assert principal_cache.principal(db, "carl@example.com").role == "Admin"
+
+    data_controller.remove_collaborator(carl)
+    db.commit()
+    assert principal_cache.principal(db, "carl@example.com") is None
@@ -0,0 +1,130 @@
+import datetime
+import json
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from controllers import profiling
+from controllers.command_controller import CommandController
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User, Role
+from tests.stubs import StubAuthController
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    commercial_role = Role(name="Commercial", description="Commercial role")
+    support_role = Role(name="Support", description="Support role")
+    alice = User(employee_number=1, full_name="Alice", email="alice@example.com", role=commercial_role)
+    sam = User(employee_number=2, full_name="Sam", email="sam@example.com", role=support_role)
+    db.add_all([alice, sam])
+    db.flush()
+    client = Client(full_name="A Client", email="a@client.io", commercial_id=alice.id)
+    db.add(client)
+    db.flush()
+    contract = Contract(client_id=client.id, commercial_id=alice.id, total_amount=100, amount_due=50)
+    db.add(contract)
+    db.flush()
+    db.add(
+        Event(
+            contract_id=contract.id,
+            client_id=client.id,
+            event_name="Launch",
+            location="Paris",
+            support_id=sam.id,
+            event_date_start=datetime.date(2030, 1, 1),
+        )
+    )
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def commands(db, email):
+    return CommandController(db, StubAuthController(db.query(User).filter_by(email=email).first()))
+
+
+def test_operations_stay_within_their_query_budget(setup_database):
+    db = setup_database
+    sam, alice = commands(db, "sam@example.com"), commands(db, "alice@example.com")
+
+    with profiling.Profiler(engine) as profiler:
+        for location in ("Lyon", "Lille"):
+            sam.run("events", "update", 1, {"location": location})
+        alice.run("contracts", "update", 1, {"amount_due": "10"})
+        db.commit()
+    alice.run("contracts", "update", 1, {"amount_due": "20"})
+    db.rollback()
+
+    events = profiler.assert_budget("events update", statements=4)
+    assert events.calls == 2 and events.rows >= 2 and events.slowest_statement is not None
+    assert profiler.assert_budget("contracts update", statements=6).calls == 1
+
+    with pytest.raises(profiling.QueryBudgetExceeded, match="statements"):
+        profiler.assert_budget("events update", statements=1)
+    with pytest.raises(profiling.QueryBudgetExceeded, match="not run"):
+        profiler.assert_budget("clients delete", statements=10)
+
+
+def test_statements_count_for_the_innermost_action(setup_database):
+    db = setup_database
+    alice = commands(db, "alice@example.com")
+    operations = [
+        json.dumps({"entity": "clients", "action": "update", "id": 1, "values": {"phone": str(number)}})
+        for number in range(3)
+    ]
+
+    with profiling.Profiler(engine) as profiler:
+        with profiling.action("batch"):
+            alice.run_batch(operations)
+
+    results = {stats.action: stats for stats in profiler.results()}
+    assert results["batch"].calls == 1 and results["batch"].statements <= 1
+    assert results["clients update"].calls == 3 and results["clients update"].statements >= 3
+
+    exported = json.loads(profiler.to_json())
+    assert {entry["action"] for entry in exported} == {"batch", "clients update"}
+    prometheus = profiler.to_prometheus()
+    assert "# TYPE epic_action_statements_total counter" in prometheus
+    assert 'epic_action_calls_total{action="clients update"} 3' in prometheus
+
+
+def test_actions_are_not_recorded_once_the_profiler_is_detached(setup_database):
+    with profiling.Profiler(engine) as profiler:
+        pass
+
+    with profiling.action("events update"):
+        assert profiling.current_action() == "events update"
+        commands(setup_database, "sam@example.com").run("events", "update", 1, {"location": "Nice"})
+    setup_database.rollback()
+
+    assert profiler.stats == {}
+    assert profiling.current_action() is None
+
+
+def test_profilers_only_count_statements_sent_to_their_engine(setup_database):
+    other_engine = create_engine(DATABASE_URL)
+    with profiling.Profiler(engine) as profiler, profiling.Profiler(other_engine) as other:
+        with profiling.action("other engine"), other_engine.connect() as connection:
+            connection.exec_driver_sql("SELECT 1")
+        with profiling.action("both engines"), other_engine.connect() as connection:
+            connection.exec_driver_sql("SELECT 1")
+            commands(setup_database, "sam@example.com").run("events", "update", 1, {"location": "Nice"})
+    setup_database.rollback()
+
+    assert "other engine" not in profiler.stats
+    assert other.stats["other engine"].statements == 1
+    assert profiler.stats["both engines"].statements == 1 and other.stats["both engines"].statements == 1
+    assert profiler.stats["events update"].statements >= 2 and "events update" not in other.stats
@@ -0,0 +1,68 @@
+import warnings
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from controllers.pagination import KeysetPaginator
+from controllers.query_layer import UnplannedLazyLoadWarning, listing_query, rendering
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User, Role
+from views.data_view import DataView
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    clients = [Client(full_name=f"Client {i}", email=f"client{i}@example.com") for i in range(5)]
+    db.add_all(clients)
+    db.flush()
+    db.add_all([Event(event_name=f"Event {i}", client_id=clients[i % 5].id) for i in range(20)])
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield executed
+    event.remove(engine, "before_cursor_execute", count)
+
+
+def test_events_listing_is_constant_round_trips(setup_database, statements):
+    db = setup_database
+    db.expunge_all()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", UnplannedLazyLoadWarning)
+        page = KeysetPaginator(listing_query(db, "events"), (Event.id,), 20).first()
+        with rendering(db):
+            DataView().display_events(page.items)
+
+    assert len(statements) == 1
+
+
+def test_unplanned_lazy_load_warns(setup_database):
+    db = setup_database
+    db.expunge_all()
+
+    events = db.query(Event).limit(2).all()
+    with pytest.warns(UnplannedLazyLoadWarning):
+        with rendering(db):
+            DataView().display_events(events)
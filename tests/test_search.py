@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from controllers.search import search, term_trigrams, trigram_query
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    db.add_all(
+        [
+            Client(full_name="Kevin Casey", email="kevin@startup.io", company_name="Cool Startup LLC"),
+            Client(full_name="Kevin Costner", email="kc@films.com", company_name="Films Inc"),
+            Client(full_name="Jane Doe", email="jane@acme.com", company_name="Acme"),
+        ]
+    )
+    contract = Contract(total_amount=1000, amount_due=0, signed=True)
+    db.add(contract)
+    db.flush()
+    db.add_all(
+        [
+            Event(event_name="John Ouick Wedding", location="53 Rue du Château", contract_id=contract.id),
+            Event(event_name="Annual Meeting", location="Paris", contract_id=contract.id),
+            Event(event_name="Team Offsite", location="Lyon", contract_id=contract.id),
+        ]
+    )
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_typos_are_ranked_by_similarity(setup_database):
+    db = setup_database
+
+    assert [client.full_name for client in search(db, "clients", "Kevin Cassey")] == ["Kevin Casey", "Kevin Costner"]
+    assert [client.full_name for client in search(db, "clients", "startup")] == ["Kevin Casey"]
+    assert [event.event_name for event in search(db, "events", "weding chateau")] == ["John Ouick Wedding"]
+
+
+def test_index_follows_updates_and_deletes(setup_database):
+    db = setup_database
+
+    client = db.query(Client).filter_by(full_name="Jane Doe").one()
+    client.company_name = "Globex"
+    client.email = "jane@globex.com"
+    db.commit()
+    assert search(db, "clients", "Acme") == []
+    assert search(db, "clients", "globex") == [client]
+
+    db.delete(client)
+    db.commit()
+    assert search(db, "clients", "globex") == []
+
+
+def test_short_terms_and_quotes(setup_database):
+    db = setup_database
+
+    assert [event.location for event in search(db, "events", "Ly")] == ["Lyon"]
+    assert trigram_query(term_trigrams('A"bc x')) == '"a""b" OR """bc"'
+    assert search(db, "events", '"" OR *') == []
+    assert search(db, "events", "   ") == []
+    with pytest.raises(ValueError):
+        search(db, "contracts", "paris")
@@ -0,0 +1,137 @@
+import datetime
+import json
+import types
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from controllers import slow_query_log
+from controllers.command_controller import CommandController
+from models.base_model import Base
+from models.client_model import Client
+from models.contract_model import Contract
+from models.event_model import Event
+from models.user_model import User, Role
+from tests.stubs import StubAuthController
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    commercial_role = Role(name="Commercial", description="Commercial role")
+    support_role = Role(name="Support", description="Support role")
+    alice = User(employee_number=1, full_name="Alice", email="alice@example.com", role=commercial_role)
+    sam = User(employee_number=2, full_name="Sam", email="sam@example.com", role=support_role)
+    db.add_all([alice, sam])
+    db.flush()
+    client = Client(full_name="A Client", email="a@client.io", commercial_id=alice.id)
+    db.add(client)
+    db.flush()
+    contract = Contract(client_id=client.id, commercial_id=alice.id, total_amount=100, amount_due=50)
+    db.add(contract)
+    db.flush()
+    db.add(
+        Event(
+            contract_id=contract.id,
+            client_id=client.id,
+            event_name="Launch",
+            location="Paris",
+            support_id=sam.id,
+            event_date_start=datetime.date(2030, 1, 1),
+        )
+    )
+    db.commit()
+
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_slow_statements_are_logged_with_action_parameters_and_plan(setup_database, tmp_path):
+    db = setup_database
+    sam = db.query(User).filter_by(email="sam@example.com").first()
+    controller = CommandController(db, StubAuthController(sam))
+    path = tmp_path / "slow.jsonl"
+
+    recorder = slow_query_log.SlowQueryRecorder(path=str(path), threshold_ms=0).attach(engine)
+    try:
+        for location in ("Lyon", "Lille"):
+            controller.run("events", "update", 1, {"location": location})
+    finally:
+        recorder.detach()
+        db.rollback()
+
+    entries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert {entry["action"] for entry in entries} == {"events update"}
+
+    update = next(entry for entry in entries if entry["statement"].startswith("UPDATE events"))
+    assert "Lyon" in update["parameters"]
+    lookup = next(entry for entry in entries if "FROM events" in entry["statement"])
+    assert "events" in lookup["plan"]
+
+    planned = [entry["fingerprint"] for entry in entries if entry["plan"]]
+    assert len(planned) == len(set(planned))
+
+
+def test_report_groups_rotated_entries_by_fingerprint(tmp_path):
+    path = tmp_path / "slow.jsonl"
+    recorder = slow_query_log.SlowQueryRecorder(path=str(path), threshold_ms=0, max_bytes=600, backup_count=3)
+    recorder.attach(create_engine("sqlite://"))
+    conn = recorder.engine.connect()
+    try:
+        for number in range(6):
+            statement = f"SELECT {number} WHERE 'a{number}' IN (?, ?) AND ? > 0"
+            recorder.record(conn, statement, (number, number + 1, 1), 0.25 + number)
+        recorder.record(conn, "SELECT 1", (), 2.0)
+    finally:
+        conn.close()
+        recorder.detach()
+
+    assert (tmp_path / "slow.jsonl.1").exists()
+    report = slow_query_log.summarize(slow_query_log.read_entries(str(path), backup_count=3))
+
+    assert [group["count"] for group in report] == [6, 1]
+    assert report[0]["statement"] == "SELECT ? WHERE ? IN (...) AND ? > ?"
+    assert report[0]["max_ms"] == 5250.0
+    assert report[0]["plan"] is not None
+    assert slow_query_log.fingerprint("SELECT 1") == report[1]["fingerprint"]
+
+
+class RecordingCursor:
+    def __init__(self, executed):
+        self.executed = executed
+
+    def execute(self, statement, parameters=None):
+        self.executed.append(statement)
+
+    def fetchall(self):
+        return [("Result",)]
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize(
+    "statement, prefix",
+    [
+        ("SELECT * FROM clients", "EXPLAIN (ANALYZE, BUFFERS) SELECT"),
+        ("WITH moved AS (DELETE FROM clients RETURNING id) SELECT * FROM moved", "EXPLAIN WITH"),
+        ("UPDATE clients SET phone = '1'", "EXPLAIN UPDATE"),
+    ],
+)
+def test_only_plain_selects_are_analyzed_on_postgresql(statement, prefix):
+    executed = []
+    cursor = RecordingCursor(executed)
+    conn = types.SimpleNamespace(
+        dialect=types.SimpleNamespace(name="postgresql"),
+        connection=types.SimpleNamespace(cursor=lambda: cursor),
+    )
+
+    assert slow_query_log.explain(conn, statement, {}) == "Result"
+    assert executed[1].startswith(prefix)
@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+import pytest
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, event, text
+from controllers import startup
+from models.base_model import Base
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALEMBIC_INI = os.path.join(ROOT, "alembic.ini")
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'startup.db'}")
+    yield engine
+    engine.dispose()
+
+
+def count_statements(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_schema_revision_is_alembic_head(engine):
+    alembic_config = Config(ALEMBIC_INI)
+    alembic_config.set_main_option("sqlalchemy.url", str(engine.url))
+    alembic_config.attributes["configure_logger"] = False
+    assert ScriptDirectory.from_config(alembic_config).get_current_head() == startup.SCHEMA_REVISION
+
+    command.upgrade(alembic_config, "head")
+
+    with engine.connect() as connection:
+        roles = connection.execute(text("SELECT name FROM roles ORDER BY name")).scalars().all()
+    assert roles == ["Admin", "Commercial", "Support"]
+    assert startup.ensure_database(engine) == startup.CURRENT
+
+
+def test_empty_database_is_created_once(engine):
+    assert startup.ensure_database(engine) == startup.CREATED
+    assert startup.schema_revision(engine) == startup.SCHEMA_REVISION
+
+    statements = count_statements(engine)
+    assert startup.ensure_database(engine) == startup.CURRENT
+    assert len(statements) == 1
+
+
+def test_legacy_and_outdated_databases_are_reported(engine):
+    Base.metadata.create_all(bind=engine)
+    assert startup.ensure_database(engine) == startup.LEGACY
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        connection.execute(text("INSERT INTO alembic_version VALUES ('0001')"))
+    assert startup.ensure_database(engine) == startup.OUTDATED
+
+
+def run_main(code, tmp_path):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'main.db'}", PYTHONPATH=ROOT, SENTRY_DSN="")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_command_line_parser_imports_no_controller(tmp_path):
+    code = (
+        "import sys, main\n"
+        "loaded = set(sys.modules)\n"
+        "main.build_parser().parse_args(['contracts', 'list', '--view', 'amount-due'])\n"
+        "print(sorted(name for name in set(sys.modules) - loaded if name.startswith(('controllers', 'views'))))"
+    )
+    assert run_main(code, tmp_path) == "[]"
+
+
+def test_command_line_choices_match_the_controllers(tmp_path):
+    code = """
+import main
+from controllers.audit_log import AUDITED
+from controllers.command_controller import ACTIONS, VIEWS
+from controllers.dashboard_controller import SOURCES
+from controllers.export_controller import FORMATS, SPECS as EXPORT_SPECS
+from controllers.import_controller import SPECS as IMPORT_SPECS
+from views.command_view import OUTPUT_FORMATS, PROFILE_FORMATS
+
+assert main.IMPORT_ENTITIES == tuple(IMPORT_SPECS)
+assert (main.EXPORT_ENTITIES, main.EXPORT_FORMATS) == (tuple(EXPORT_SPECS), FORMATS)
+assert main.COMMAND_ACTIONS == ACTIONS
+assert main.COMMAND_VIEWS == {entity: tuple(views) for entity, views in VIEWS.items()}
+assert main.AUDIT_ENTITIES == tuple(AUDITED.values())
+assert main.DASHBOARD_SOURCES == SOURCES
+assert (main.OUTPUT_FORMATS, main.PROFILE_FORMATS) == (OUTPUT_FORMATS, PROFILE_FORMATS)
+"""
+    run_main(code, tmp_path)
@@ -0,0 +1,111 @@
+import jwt
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from controllers import tokens
+from controllers.data_controller import DataController
+from models.base_model import Base
+from models.revoked_token_model import RevokedToken
+from models.user_model import User, Role
+from tests.stubs import StubAuthController
+
+DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    admin_role = Role(name="Admin", description="Admin role")
+    support_role = Role(name="Support", description="Support role")
+    db.add_all(
+        [
+            User(employee_number=1, full_name="Ada", email="ada@example.com", role=admin_role),
+            User(employee_number=2, full_name="Sam", email="sam@example.com", role=support_role),
+        ]
+    )
+    db.commit()
+
+    yield db
+    db.close()
+    tokens.clear()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_verification_is_memoized_until_logout(setup_database, monkeypatch):
+    db = setup_database
+    pair = tokens.issue("ada@example.com")
+    decode_calls = []
+    original_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        decode_calls.append(args)
+        return original_decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+
+    for _ in range(5):
+        assert tokens.verify(db, pair.access_token).email == "ada@example.com"
+    assert len(decode_calls) == 1
+    with pytest.raises(tokens.TokenError):
+        tokens.verify(db, pair.refresh_token)
+
+    tokens.revoke(db, tokens.verify(db, pair.access_token))
+    db.commit()
+    with pytest.raises(tokens.TokenError, match="revoked"):
+        tokens.verify(db, pair.access_token)
+
+
+def test_revoking_twice_is_not_an_error(setup_database):
+    db = setup_database
+    principal = tokens.decode(tokens.issue("ada@example.com").access_token)
+
+    assert tokens.revoke(db, principal) is True
+    db.commit()
+    assert tokens.revoke(db, principal) is False
+    db.commit()
+
+    assert db.query(RevokedToken).filter_by(jti=principal.claims["jti"]).count() == 1
+
+
+def test_refresh_tokens_are_rotated(setup_database):
+    db = setup_database
+    refresh_token = tokens.issue("ada@example.com").refresh_token
+
+    pair = tokens.refresh(db, refresh_token)
+    db.commit()
+
+    assert tokens.verify(db, pair.access_token).email == "ada@example.com"
+    with pytest.raises(tokens.TokenError, match="revoked"):
+        tokens.refresh(db, refresh_token)
+
+
+def test_deleting_a_collaborator_revokes_their_tokens(setup_database):
+    db = setup_database
+    sam = db.query(User).filter_by(email="sam@example.com").one()
+    ada = db.query(User).filter_by(email="ada@example.com").one()
+    pair = tokens.issue(sam.email)
+    tokens.verify(db, pair.access_token)
+
+    other_process = tokens.RevocationList(sync_interval=60)
+    other_process.sync(db)
+    principal = tokens.decode(pair.access_token)
+    assert not other_process.is_revoked(principal)
+
+    DataController(db, StubAuthController(ada)).remove_collaborator(sam)
+    db.commit()
+
+    with pytest.raises(tokens.TokenError, match="revoked"):
+        tokens.verify(db, pair.access_token)
+    with pytest.raises(tokens.TokenError, match="revoked"):
+        tokens.verify(db, pair.refresh_token, tokens.REFRESH)
+    assert db.query(RevokedToken).filter_by(subject="sam@example.com").one().issued_before is not None
+
+    assert not other_process.is_revoked(principal)
+    other_process.synced_at -= 60
+    other_process.sync(db)
+    assert other_process.is_revoked(principal)
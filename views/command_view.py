@@ -0,0 +1,143 @@
+import csv
+import json
+import sys
+from rich.console import Console
+from rich.table import Table
+from controllers.export_controller import ExportController
+from views.data_view import DataView
+
+OUTPUT_FORMATS = ("table", "json", "jsonl", "csv")
+PROFILE_FORMATS = ("table", "json", "prometheus")
+
+
+class CommandView:
+    """
+    Gère les sorties de la ligne de commande : les données sur la sortie standard (tableau, JSON, JSONL, CSV)
+    et les messages sur la sortie d'erreur, pour pouvoir enchaîner les commandes dans un script.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.console = Console(stderr=True)
+        self.data_view = DataView()
+        self.data_view.console = Console(file=self.stream)
+
+    def display_records(self, entity, instances, output_format, record):
+        """
+        Affiche une liste d'enregistrements ; `record` convertit une instance en dictionnaire de colonnes.
+        """
+        if output_format == "table":
+            display = {
+                "clients": self.data_view.display_clients,
+                "contracts": self.data_view.display_contracts,
+                "events": self.data_view.display_events,
+                "audit_log": self.data_view.display_audit_log,
+            }[entity]
+            display(list(instances))
+            return
+
+        records = (record(instance) for instance in instances)
+        if output_format == "json":
+            json.dump(list(records), self.stream, default=ExportController.serialize, indent=2)
+            self.stream.write("\n")
+        elif output_format == "jsonl":
+            for item in records:
+                self.stream.write(json.dumps(item, default=ExportController.serialize) + "\n")
+        else:
+            writer = None
+            for item in records:
+                if writer is None:
+                    writer = csv.DictWriter(self.stream, fieldnames=list(item))
+                    writer.writeheader()
+                writer.writerow(item)
+
+    def display_dashboard(self, totals, commercials, supports, output_format):
+        """
+        Affiche le tableau de bord en tableaux ou en un seul document JSON.
+        """
+        if output_format == "table":
+            self.data_view.display_dashboard(totals, commercials, supports)
+            return
+        dashboard = {
+            "totals": totals._asdict(),
+            "commercials": [row._asdict() for row in commercials],
+            "supports": [row._asdict() for row in supports],
+        }
+        json.dump(dashboard, self.stream, default=ExportController.serialize, indent=2)
+        self.stream.write("\n")
+
+    def display_financial_report(self, report):
+        """
+        Affiche le rapport financier en un document JSON (montants exacts en texte).
+        """
+        json.dump(report, self.stream, default=ExportController.serialize, indent=2)
+        self.stream.write("\n")
+
+    def display_results(self, results):
+        """
+        Affiche le résultat de chaque opération, une ligne JSON par opération.
+        """
+        for result in results:
+            self.stream.write(json.dumps(result.as_dict(), default=ExportController.serialize) + "\n")
+
+    def display_profile(self, profiler, output_format, stream=None):
+        """
+        Affiche les mesures par action (option --profile) sur la sortie d'erreur, ou les écrit dans `stream` :
+        tableau, JSON ou format texte de Prometheus.
+        """
+        if output_format == "table" and stream is None:
+            table = Table(title="Profile", style="white")
+            for column in ("Action", "Calls", "Statements", "Max/Call", "DB ms", "Rows", "Slowest ms"):
+                table.add_column(column, style="white", no_wrap=True)
+            table.add_column("Slowest", style="white", no_wrap=True, overflow="ellipsis", max_width=60)
+            for stats in profiler.results():
+                table.add_row(
+                    stats.action,
+                    str(stats.calls),
+                    str(stats.statements),
+                    str(stats.max_statements),
+                    f"{stats.db_time * 1000:.1f}",
+                    str(stats.rows),
+                    f"{stats.slowest_time * 1000:.1f}",
+                    (stats.slowest_statement or "")[:80],
+                )
+            self.console.print(table)
+            return
+        text = profiler.to_prometheus() if output_format == "prometheus" else profiler.to_json() + "\n"
+        (stream or sys.stderr).write(text)
+
+    def display_slow_queries(self, report, output_format, plans=False):
+        """
+        Affiche le résumé du journal des requêtes lentes : un tableau par empreinte (suivi des plans si demandé)
+        ou un document JSON (plans compris).
+        """
+        if output_format == "json":
+            json.dump(report, self.stream, indent=2)
+            self.stream.write("\n")
+            return
+        table = Table(title="Slow Queries", style="white")
+        for column in ("Fingerprint", "Count", "Total ms", "Mean ms", "Max ms", "Actions"):
+            table.add_column(column, style="white", no_wrap=True)
+        table.add_column("Statement", style="white", no_wrap=True, overflow="ellipsis", max_width=60)
+        for group in report:
+            table.add_row(
+                group["fingerprint"],
+                str(group["count"]),
+                f"{group['total_ms']:.1f}",
+                f"{group['mean_ms']:.1f}",
+                f"{group['max_ms']:.1f}",
+                ", ".join(group["actions"]),
+                group["statement"],
+            )
+        self.data_view.console.print(table)
+        if plans:
+            console = self.data_view.console
+            for group in report:
+                console.print(f"{group['fingerprint']} {group['statement']}", style="bold", markup=False)
+                console.print(group["plan"] or "(no plan captured)", markup=False)
+
+    def print_error(self, message):
+        """
+        Affiche un message d'erreur en rouge.
+        """
+        self.console.print(f"[bold red]{message}[/bold red]")
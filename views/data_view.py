@@ -2,6 +2,38 @@ from rich.console import Console
 from rich.prompt import Prompt
 from rich.table import Table
 
+"""
+Libellés des options du menu des données ; les options proposées à chaque rôle sont données
+par la table des permissions (controllers/permissions.py).
+"""
+MENU_LABELS = {
+    "view_clients": "View Clients",
+    "view_contracts": "View Contracts",
+    "view_events": "View Events",
+    "search": "Search Clients or Events",
+    "create_client": "Create Client",
+    "create_contract": "Create Contract",
+    "create_event": "Create Event",
+    "update_client": "Update Client",
+    "update_contract": "Update Contract",
+    "my_clients": "My Clients",
+    "my_contracts": "My Contracts",
+    "unsigned_contracts": "My Unsigned Contracts",
+    "contracts_with_amount_due": "My Contracts with Amount Due",
+    "update_event": "Update Event",
+    "my_upcoming_events": "My Upcoming Events",
+    "create_collaborator": "Create Collaborator",
+    "update_collaborator": "Update Collaborator",
+    "delete_collaborator": "Delete Collaborator",
+    "delete_client": "Delete Client",
+    "delete_contract": "Delete Contract",
+    "delete_event": "Delete Event",
+    "filter_events_without_support": "Filter Events without Support",
+    "update_any_contract": "Update Any Contract",
+    "update_any_event": "Update Any Event",
+    "dashboard": "Dashboard",
+}
+
 
 class DataView:
     """
@@ -11,9 +43,10 @@ class DataView:
     def __init__(self):
         self.console = Console()
 
-    def display_data_menu(self, role):
+    def display_data_menu(self, options):
         """
-        Affiche le menu des données en fonction du rôle de l'utilisateur.
+        Affiche le menu des données avec les options accessibles à l'utilisateur
+        (voir controllers/permissions.py), dans l'ordre fourni.
         Retourne l'option choisie.
         """
         self.console.rule("[bold green]Epic Events Administration[/bold green]")
@@ -22,91 +55,18 @@ class DataView:
         )
         self.console.rule("[bold white]Data Menu :[/bold white]")
 
-        options = {}
+        choices = {}
         num = 1
-
-        # Options disponibles pour tous
-        self.console.print(f"[bold white]{num}. View Clients[/bold white]")
-        options[str(num)] = "view_clients"
-        num += 1
-
-        self.console.print(f"[bold white]{num}. View Contracts[/bold white]")
-        options[str(num)] = "view_contracts"
-        num += 1
-
-        self.console.print(f"[bold white]{num}. View Events[/bold white]")
-        options[str(num)] = "view_events"
-        num += 1
-
-        # Options spécifiques aux rôles
-        if role == "Commercial":
-            self.console.print(f"[bold white]{num}. Create Client[/bold white]")
-            options[str(num)] = "create_client"
-            num += 1
-
-            self.console.print(f"[bold white]{num}. Create Contract[/bold white]")
-            options[str(num)] = "create_contract"
-            num += 1
-
-            self.console.print(f"[bold white]{num}. Create Event[/bold white]")
-            options[str(num)] = "create_event"
-            num += 1
-
-            self.console.print(f"[bold white]{num}. Update Client[/bold white]")
-            options[str(num)] = "update_client"
-            num += 1
-
-            self.console.print(f"[bold white]{num}. Update Contract[/bold white]")
-            options[str(num)] = "update_contract"
-            num += 1
-
-        if role in ["Commercial", "Support"]:
-            self.console.print(f"[bold white]{num}. Update Event[/bold white]")
-            options[str(num)] = "update_event"
-            num += 1
-
-        if role == "Admin":
-            self.console.print(f"[bold white]{num}. Create Collaborator[/bold white]")
-            options[str(num)] = "create_collaborator"
-            num += 1
-
-            self.console.print(f"[bold white]{num}. Update Collaborator[/bold white]")
-            options[str(num)] = "update_collaborator"
-            num += 1
-
-            self.console.print(f"[bold white]{num}. Delete Collaborator[/bold white]")
-            options[str(num)] = "delete_collaborator"
-            num += 1
-
-            self.console.print(f"[bold white]{num}. Delete Client[/bold white]")
-            options[str(num)] = "delete_client"
-            num += 1
-
-            self.console.print(f"[bold white]{num}. Delete Contract[/bold white]")
-            options[str(num)] = "delete_contract"
-            num += 1
-
-            self.console.print(f"[bold white]{num}. Delete Event[/bold white]")
-            options[str(num)] = "delete_event"
-            num += 1
-
-            self.console.print(f"[bold white]{num}. Filter Events without Support[/bold white]")
-            options[str(num)] = "filter_events_without_support"
-            num += 1
-
-            self.console.print(f"[bold white]{num}. Update Any Contract[/bold white]")
-            options[str(num)] = "update_any_contract"
-            num += 1
-
-            self.console.print(f"[bold white]{num}. Update Any Event[/bold white]")
-            options[str(num)] = "update_any_event"
+        for option in options:
+            self.console.print(f"[bold white]{num}. {MENU_LABELS[option]}[/bold white]")
+            choices[str(num)] = option
             num += 1
 
         self.console.print(f"[bold white]{num}. Return to Main Menu[/bold white]")
-        options[str(num)] = "return_to_main"
+        choices[str(num)] = "return_to_main"
 
         choice = Prompt.ask("Choose an option")
-        return options.get(choice, "invalid")
+        return choices.get(choice, "invalid")
 
     def display_clients(self, clients):
         """
@@ -131,7 +91,7 @@ class DataView:
                 client.company_name,
                 str(client.first_contact_date),
                 str(client.last_contact_date),
-                client.commercial_contact,
+                client.commercial.full_name if client.commercial else client.commercial_contact,
             )
 
         self.console.print(table)
@@ -154,7 +114,7 @@ class DataView:
             table.add_row(
                 str(contract.id),
                 str(contract.client_id),
-                contract.commercial_contact,
+                contract.commercial.full_name if contract.commercial else contract.commercial_contact,
                 str(contract.total_amount),
                 str(contract.amount_due),
                 str(contract.creation_date),
@@ -184,8 +144,136 @@ class DataView:
                 event.location,
                 str(event.event_date_start),
                 str(event.event_date_end),
-                event.client.full_name,
-                event.support_contact,
+                event.client.full_name if event.client else "",
+                event.support.full_name if event.support else event.support_contact,
             )
 
         self.console.print(table)
+
+    def display_audit_log(self, entries):
+        """
+        Affiche les lignes du journal d'audit dans un tableau.
+        """
+        table = Table(title="Audit Log", style="white")
+        table.add_column("Date", style="white", no_wrap=True)
+        table.add_column("Actor", style="white")
+        table.add_column("Action", style="white")
+        table.add_column("Entity", style="white")
+        table.add_column("Entity ID", style="white")
+        table.add_column("Changes", style="white")
+
+        for entry in entries:
+            table.add_row(
+                str(entry.created_at),
+                entry.actor_email or "",
+                entry.action,
+                entry.entity,
+                str(entry.entity_id),
+                ", ".join(f"{name}: {old} -> {new}" for name, (old, new) in (entry.changes or {}).items()),
+            )
+
+        self.console.print(table)
+
+    def display_dashboard(self, totals, commercials, supports):
+        """
+        Affiche le tableau de bord : totaux globaux, totaux par commercial et événements à venir par support.
+        """
+        table = Table(title="Dashboard", style="white")
+        table.add_column("Contracts", style="white")
+        table.add_column("Signed", style="white")
+        table.add_column("Signed Revenue", style="white")
+        table.add_column("Amount Due", style="white")
+        table.add_column("Upcoming Events", style="white")
+        table.add_row(
+            str(totals.contracts),
+            str(totals.signed_contracts),
+            f"{totals.signed_revenue:.2f}",
+            f"{totals.amount_due:.2f}",
+            str(totals.upcoming_events),
+        )
+        self.console.print(table)
+
+        table = Table(title="Contracts per Commercial", style="white")
+        table.add_column("Rank", style="white")
+        table.add_column("Commercial", style="white")
+        table.add_column("Contracts", style="white")
+        table.add_column("Signed", style="white")
+        table.add_column("Signed Revenue", style="white")
+        table.add_column("Share", style="white")
+        table.add_column("Amount Due", style="white")
+        for row in commercials:
+            table.add_row(
+                str(row.rank),
+                row.commercial or "Unassigned",
+                str(row.contracts),
+                str(row.signed_contracts),
+                f"{row.signed_revenue:.2f}",
+                f"{row.revenue_share:.1f} %" if row.revenue_share is not None else "",
+                f"{row.amount_due:.2f}",
+            )
+        self.console.print(table)
+
+        table = Table(title="Upcoming Events per Support", style="white")
+        table.add_column("Rank", style="white")
+        table.add_column("Support", style="white")
+        table.add_column("Events", style="white")
+        table.add_column("Attendees", style="white")
+        table.add_column("Next Event", style="white")
+        for row in supports:
+            table.add_row(
+                str(row.rank),
+                row.support or "No support assigned",
+                str(row.upcoming_events),
+                str(row.attendees),
+                str(row.next_event),
+            )
+        self.console.print(table)
+
+    def prompt_page_navigation(self, page, page_size, jump_label="ID"):
+        """
+        Affiche les options de navigation entre les pages et retourne l'action choisie
+        (next, previous, jump, size ou quit).
+        """
+        self.console.print(f"[bold yellow]{len(page.items)} row(s) shown - page size {page_size}[/bold yellow]")
+
+        options = {}
+        if page.has_next:
+            options["n"] = "next"
+        if page.has_previous:
+            options["p"] = "previous"
+        options["j"] = "jump"
+        options["s"] = "size"
+        options["q"] = "quit"
+
+        labels = {
+            "next": "Next page",
+            "previous": "Previous page",
+            "jump": f"Jump to {jump_label}",
+            "size": "Change page size",
+            "quit": "Back to menu",
+        }
+        entries = [f"[bold white]{key}. {labels[action]}[/bold white]" for key, action in options.items()]
+        self.console.print(" - ".join(entries))
+
+        choice = Prompt.ask("Navigate", choices=list(options), default="q")
+        return options[choice]
+
+    def prompt_jump_target(self, jump_label="ID"):
+        """
+        Demande la valeur (l'identifiant par défaut) à partir de laquelle afficher la page.
+        """
+        return Prompt.ask(f"Enter the {jump_label} to jump to")
+
+    def prompt_page_size(self, current):
+        """
+        Demande la nouvelle taille de page.
+        """
+        return Prompt.ask("Enter the page size", default=str(current))
+
+    def prompt_search(self):
+        """
+        Demande l'entité à rechercher (clients ou événements) et le texte recherché.
+        """
+        entity = Prompt.ask("Search in", choices=["clients", "events"], default="clients")
+        term = Prompt.ask("Enter a name, email, company or location (typos allowed)")
+        return entity, term
@@ -0,0 +1,25 @@
+from rich.console import Console
+
+
+class ExportView:
+    """
+    Gère l'affichage des messages liés aux exports. Les messages sont écrits sur la sortie d'erreur
+    pour ne pas se mêler aux données lorsque l'export est envoyé sur la sortie standard.
+    """
+
+    def __init__(self):
+        self.console = Console(stderr=True)
+
+    def display_report(self, report):
+        """
+        Affiche le nombre de lignes exportées et la durée de l'export.
+        """
+        self.console.print(
+            f"[bold green]{report.entity}: {report.rows} row(s) exported in {report.elapsed:.2f}s[/bold green]"
+        )
+
+    def print_error(self, message):
+        """
+        Affiche un message d'erreur en rouge.
+        """
+        self.console.print(f"[bold red]{message}[/bold red]")
@@ -0,0 +1,41 @@
+from rich.console import Console
+from rich.table import Table
+
+
+class ImportView:
+    """
+    Gère l'affichage du bilan des imports en masse.
+    """
+
+    def __init__(self):
+        self.console = Console()
+
+    def display_report(self, report, max_errors=50):
+        """
+        Affiche le bilan d'un import : lignes lues, chargées, rejetées, débit et détail des erreurs par ligne.
+        """
+        color = "green" if not report.errors else "yellow"
+        self.console.print(
+            f"[bold {color}]{report.entity}: {report.imported}/{report.total} row(s) imported, "
+            f"{len(report.errors)} rejected in {report.elapsed:.2f}s "
+            f"({report.rows_per_second:.0f} rows/s)[/bold {color}]"
+        )
+
+        if not report.errors:
+            return
+
+        table = Table(title="Import errors", style="white")
+        table.add_column("Line", style="white")
+        table.add_column("Error", style="white")
+        for line, message in report.errors[:max_errors]:
+            table.add_row(str(line), message)
+        self.console.print(table)
+
+        if len(report.errors) > max_errors:
+            self.console.print(f"[bold yellow]... and {len(report.errors) - max_errors} more error(s).[/bold yellow]")
+
+    def print_error(self, message):
+        """
+        Affiche un message d'erreur en rouge.
+        """
+        self.console.print(f"[bold red]{message}[/bold red]")